@@ -0,0 +1,154 @@
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, Optional
+
+from pipeline import SCANNERS, compile_source
+
+SOURCE_SUFFIX = '.minipp'
+
+class FileReport:
+    """Outcome of compiling one file in a worker; small so it pickles cheaply."""
+    def __init__(self, path: str, output: Optional[str]):
+        self.path = path
+        self.output = output
+        self.errors: List[str] = []
+        self.instructions = 0
+        self.cached = False
+        self.crash: Optional[str] = None
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and self.crash is None
+
+def collect_sources(patterns: Iterable[str]) -> List[str]:
+    # Files are taken as given, directories are searched recursively, anything else is a glob
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.endswith(SOURCE_SUFFIX))
+        elif os.path.isfile(pattern):
+            found.append(pattern)
+        else:
+            found.extend(sorted(glob.glob(pattern, recursive=True)))
+    seen = set()
+    sources = []
+    for path in found:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            sources.append(path)
+    return sources
+
+def output_paths(sources: List[str], out_dir: str) -> List[str]:
+    # Mirror the inputs' layout below their common directory, so equal basenames don't collide
+    if not sources:
+        return []
+    dirs = [os.path.dirname(os.path.abspath(path)) for path in sources]
+    root = os.path.commonpath(dirs)
+    outputs = []
+    for path in sources:
+        rel = os.path.relpath(os.path.abspath(path), root)
+        outputs.append(os.path.join(out_dir, os.path.splitext(rel)[0] + '.tac'))
+    return outputs
+
+_cache = None
+
+def _worker_cache(cache_dir: Optional[str]):
+    # One cache object per worker process
+    global _cache
+    if cache_dir is None:
+        return None
+    if _cache is None or _cache.directory != cache_dir:
+        from compile_cache import CompilationCache
+        _cache = CompilationCache(cache_dir)
+    return _cache
+
+def compile_file(path: str, output: Optional[str], scanner: str = 'regex',
+                 cache_dir: Optional[str] = None, fused: bool = False, optimize: bool = False) -> FileReport:
+    report = FileReport(path, output)
+    start_time = time.perf_counter()
+    try:
+        with open(path) as f:
+            code = f.read()
+        result = compile_source(code, scanner, _worker_cache(cache_dir), fused=fused, optimize=optimize)
+        report.errors = result.errors
+        report.instructions = len(result.tac)
+        report.cached = result.cached
+        if output is not None:
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+            with open(output, 'w') as f:
+                for instr in result.tac:
+                    f.write(f"{instr}\n")
+    except Exception:
+        report.crash = traceback.format_exc()
+    report.elapsed = time.perf_counter() - start_time
+    return report
+
+def run_batch(sources: List[str], out_dir: Optional[str] = None, jobs: Optional[int] = None,
+              scanner: str = 'regex', cache_dir: Optional[str] = None,
+              fused: bool = False, optimize: bool = False) -> Iterable[FileReport]:
+    # Yields reports in completion order; jobs=1 compiles in this process
+    outputs = output_paths(sources, out_dir) if out_dir else [None] * len(sources)
+    if jobs == 1 or len(sources) <= 1:
+        for path, output in zip(sources, outputs):
+            yield compile_file(path, output, scanner, cache_dir, fused, optimize)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(compile_file, path, output, scanner, cache_dir, fused, optimize)
+                   for path, output in zip(sources, outputs)]
+        for future in as_completed(futures):
+            yield future.result()
+
+def print_report(report: FileReport, out=sys.stdout):
+    if report.crash is not None:
+        out.write(f"[CRASH] {report.path}\n{report.crash}")
+        return
+    status = "ok" if report.ok else f"{len(report.errors)} error(s)"
+    cached = ", cached" if report.cached else ""
+    out.write(f"[{status}] {report.path}: {report.instructions} TAC instructions "
+              f"in {report.elapsed:.4f} seconds{cached}\n")
+    for err in report.errors:
+        out.write(f"    {err}\n")
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Compile many MiniLang++ files in parallel")
+    ap.add_argument('sources', nargs='+', help="source files, directories or glob patterns")
+    ap.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    ap.add_argument('-o', '--output-dir', help="write one .tac file per source here")
+    ap.add_argument('--scanner', choices=sorted(SCANNERS), default='regex', help="lexer implementation")
+    ap.add_argument('--cache-dir', help="reuse results for unchanged sources from this directory")
+    ap.add_argument('--fused', action='store_true', help="check types and generate TAC in a single pass")
+    ap.add_argument('-O', '--optimize', action='store_true', help="optimise the generated TAC")
+    args = ap.parse_args(argv)
+    if args.jobs < 1:
+        ap.error("-j/--jobs needs at least 1")
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sources = collect_sources(args.sources)
+    if not sources:
+        print("No source files found.")
+        return 1
+    start_time = time.perf_counter()
+    failed = 0
+    for report in run_batch(sources, args.output_dir, args.jobs, args.scanner, args.cache_dir, args.fused,
+                            args.optimize):
+        print_report(report)
+        if not report.ok:
+            failed += 1
+    elapsed = time.perf_counter() - start_time
+    print(f"==== {len(sources)} file(s) compiled in {elapsed:.4f} seconds, {failed} with errors ====")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Bytes and construction time per AST node.
+
+Run from the repository root:  python -m benchmarks.bench_ast_memory [copies]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from lexer import Lexer
+from minilang_ast import ASTNode, iter_nodes
+from parser import Parser
+from benchmarks.bench_token_stream import make_source
+
+def count_nodes(root: ASTNode) -> int:
+    return sum(1 for _ in iter_nodes(root))
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    stream = Lexer(make_source(copies)).tokenize_compact()
+
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    Parser(stream).parse()
+    elapsed = time.perf_counter() - start
+    gc.enable()
+
+    tracemalloc.start()
+    ast = Parser(stream).parse()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = count_nodes(ast)
+    print(f"{nodes} AST nodes")
+    print(f"bytes per node:        {size / nodes:.1f}")
+    print(f"construction per node: {elapsed / nodes * 1e9:.0f} ns (parse included)")
+
+if __name__ == "__main__":
+    main()
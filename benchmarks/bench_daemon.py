@@ -0,0 +1,56 @@
+"""Latency of small compiles: a fresh process per snippet vs. requests to a running CompileServer.
+
+Run from the repository root:  python -m benchmarks.bench_daemon [snippets]
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from daemon import CompileServer
+
+def snippet(k: int) -> str:
+    return f"int f(int a) {{ return a * {k}; }} int main() {{ int x = f({k}); return x + 1; }}\n"
+
+def fresh_processes(snippets: int, tmp: str) -> float:
+    start = time.perf_counter()
+    for k in range(snippets):
+        path = os.path.join(tmp, f"s{k}.minipp")
+        with open(path, 'w') as f:
+            f.write(snippet(k))
+        subprocess.run([sys.executable, 'main.py', '-q', path], check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+async def daemon_requests(snippets: int, path: str) -> float:
+    server = CompileServer(1)
+    serving = asyncio.create_task(server.serve_unix(path))
+    while not os.path.exists(path):
+        await asyncio.sleep(0.01)
+    reader, writer = await asyncio.open_unix_connection(path)
+    start = time.perf_counter()
+    # One request at a time, so this is round-trip latency rather than throughput
+    for k in range(snippets):
+        message = {'jsonrpc': '2.0', 'id': k, 'method': 'compile', 'params': {'source': snippet(k)}}
+        writer.write(json.dumps(message).encode() + b'\n')
+        reply = json.loads(await reader.readline())
+        assert 'result' in reply and not reply['result']['errors'], reply
+    elapsed = time.perf_counter() - start
+    writer.write(b'{"jsonrpc": "2.0", "id": null, "method": "shutdown"}\n')
+    writer.close()
+    await serving
+    server.close()
+    return elapsed
+
+def main():
+    snippets = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh = fresh_processes(snippets, tmp)
+        warm = asyncio.run(daemon_requests(snippets, os.path.join(tmp, 'compiler.sock')))
+    print(f"fresh process: {fresh / snippets * 1000:8.2f} ms per snippet")
+    print(f"daemon:        {warm / snippets * 1000:8.2f} ms per snippet ({fresh / warm:.1f}x)")
+
+if __name__ == "__main__":
+    main()
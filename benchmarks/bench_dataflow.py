@@ -0,0 +1,48 @@
+"""CFG construction, liveness and reaching definitions on one ever larger function.
+
+Run from the repository root:  python -m benchmarks.bench_dataflow [statements]
+"""
+import sys
+import time
+
+from cfg import ControlFlowGraph
+from dataflow import Liveness, ReachingDefinitions
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+
+def make_source(statements: int, variables: int = 20) -> str:
+    lines = ['int main(int n) {']
+    lines += [f'  int v{k} = {k};' for k in range(variables)]
+    for s in range(statements):
+        a, b = f'v{s % variables}', f'v{(s * 7 + 3) % variables}'
+        if s % 3 == 0:
+            lines.append(f'  while ({a} < n) {{ {a} = {a} + {b}; }}')
+        elif s % 3 == 1:
+            lines.append(f'  if ({a} > {b}) {{ {b} = {a} - 1; }} else {{ {a} = {b} * 2; }}')
+        else:
+            lines.append(f'  {a} = {a} + {b} * {s};')
+    lines.append('  return v0;')
+    lines.append('}')
+    return '\n'.join(lines)
+
+def timed(build):
+    start = time.perf_counter()
+    result = build()
+    return result, time.perf_counter() - start
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    sizes = [largest // 8, largest // 4, largest // 2, largest]
+    print(f"{'instrs':>8} {'blocks':>7} {'cfg s':>8} {'live s':>8} {'reach s':>8} {'us/instr':>9}")
+    for statements in sizes:
+        tac = TACGenerator().generate(Parser(Lexer(make_source(statements)).tokenize()).parse())
+        cfg, cfg_time = timed(lambda: ControlFlowGraph(tac))
+        _, live_time = timed(lambda: Liveness(cfg))
+        _, reach_time = timed(lambda: ReachingDefinitions(cfg))
+        total = cfg_time + live_time + reach_time
+        print(f"{len(tac):>8} {len(cfg.blocks):>7} {cfg_time:>8.4f} {live_time:>8.4f} {reach_time:>8.4f} "
+              f"{total / len(tac) * 1e6:>9.2f}")
+
+if __name__ == "__main__":
+    main()
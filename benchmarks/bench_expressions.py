@@ -0,0 +1,101 @@
+"""Expression parsing: precedence-stack parser vs the former per-level recursive descent.
+
+Run from the repository root:  python -m benchmarks.bench_expressions [statements]
+"""
+import gc
+import random
+import sys
+import time
+
+from lexer import Lexer
+from minilang_ast import BinaryOp, FunctionCall, Identifier, UnaryOp
+from parser import (Parser, ParserError, BINARY_OPS, COMMA, EOF, ID, LITERAL_KINDS, LPAREN,
+                    MINUS, NOT, RPAREN)
+
+class RecursiveDescentParser(Parser):
+    """The previous expression grammar: one method per precedence level."""
+    def parse_expression(self):
+        return self.parse_level(1)
+
+    def parse_level(self, precedence):
+        if precedence > 6:
+            return self.parse_factor()
+        node = self.parse_level(precedence + 1)
+        op = BINARY_OPS.get(self.kinds[self.pos])
+        while op is not None and op[0] == precedence:
+            self.pos += 1
+            node = BinaryOp(op[1], node, self.parse_level(precedence + 1))
+            op = BINARY_OPS.get(self.kinds[self.pos])
+        return node
+
+    def parse_factor(self):
+        kind = self.kinds[self.pos]
+        if kind == ID:
+            if self.kinds[self.pos + 1] == LPAREN:
+                name = self.stream.identifier(self.pos)
+                self.pos += 2
+                args = []
+                if self.kinds[self.pos] not in (RPAREN, EOF):
+                    while True:
+                        args.append(self.parse_expression())
+                        if not self.match(COMMA):
+                            break
+                self.expect(RPAREN)
+                return FunctionCall(name, args)
+            self.pos += 1
+            return Identifier(self.stream.identifier(self.pos - 1))
+        elif kind in LITERAL_KINDS:
+            return self.parse_literal()
+        elif kind == LPAREN:
+            self.pos += 1
+            expr = self.parse_expression()
+            self.expect(RPAREN)
+            return expr
+        elif kind in (MINUS, NOT):
+            self.pos += 1
+            return UnaryOp('-' if kind == MINUS else '!', self.parse_factor())
+        raise ParserError("Unexpected token in expression")
+
+def random_expr(rng, depth):
+    if depth == 0 or rng.random() < 0.25:
+        return rng.choice(['a', 'b', 'c', '1', '2', '7', 'f(a, 2)'])
+    if rng.random() < 0.1:
+        return '(' + random_expr(rng, depth - 1) + ')'
+    op = rng.choice(['+', '-', '*', '/', '<', '==', '&&', '||'])
+    return random_expr(rng, depth - 1) + ' ' + op + ' ' + random_expr(rng, depth - 1)
+
+def make_source(statements: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    body = '\n'.join(f'    x = {random_expr(rng, 4)};' for _ in range(statements))
+    return 'int main() {\n' + body + '\n    return 0;\n}\n'
+
+def time_parse(parser_class, stream, repeat=5):
+    # Collector paused so both parsers are timed without cyclic-GC passes over the AST
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        parser_class(stream).parse()
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    stream = Lexer(make_source(statements)).tokenize_compact()
+    old = time_parse(RecursiveDescentParser, stream)
+    new = time_parse(Parser, stream)
+    print(f"{len(stream)} tokens, {statements} expression statements")
+    print(f"recursive descent:    {old:.4f} s")
+    print(f"precedence stack:     {new:.4f} s  ({old / new:.2f}x)")
+
+    depth = 50000
+    deep = Lexer('int main() { x = ' + '(' * depth + '1' + ')' * depth + '; }').tokenize_compact()
+    parser = Parser(deep)
+    parser.parse()
+    print(f"{depth} nested parentheses: parsed, {len(parser.errors)} errors")
+
+if __name__ == "__main__":
+    main()
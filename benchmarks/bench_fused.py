@@ -0,0 +1,49 @@
+"""Time separate semantic analysis + TAC generation against the fused single pass.
+
+Run from the repository root:  python -m benchmarks.bench_fused [copies]
+"""
+import gc
+import sys
+import time
+
+from benchmarks.bench_token_stream import make_source
+from fused import FusedCompiler
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from tac import TACGenerator
+
+def two_pass(ast):
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(ast)
+    return analyzer.errors, TACGenerator().generate(ast)
+
+def fused(ast):
+    return FusedCompiler().compile(ast)
+
+def timed(run, ast):
+    gc.disable()
+    start = time.perf_counter()
+    result = run(ast)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed, result
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ast = Parser(Lexer(make_source(copies)).tokenize_compact()).parse()
+    old_times, new_times = [], []
+    # Interleaved, best of several, to keep machine noise out of the ratio
+    for _ in range(15):
+        old_time, (old_errors, old_tac) = timed(two_pass, ast)
+        new_time, (new_errors, new_tac) = timed(fused, ast)
+        old_times.append(old_time)
+        new_times.append(new_time)
+    assert old_errors == new_errors
+    assert [str(i) for i in old_tac] == [str(i) for i in new_tac]
+    old_time, new_time = min(old_times), min(new_times)
+    print(f"{copies} functions: two passes {old_time:.4f}s, fused {new_time:.4f}s "
+          f"({old_time / new_time:.2f}x)")
+
+if __name__ == "__main__":
+    main()
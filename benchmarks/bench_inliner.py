@@ -0,0 +1,41 @@
+"""Inlining payoff: VM steps and time for a hot loop calling small helpers, with and without the Inliner.
+
+Run from the repository root:  python -m benchmarks.bench_inliner [n]
+"""
+import sys
+import time
+
+from inliner import Inliner
+from lexer import Lexer
+from parser import Parser
+from pipeline import optimize_tac
+from tac import TACGenerator
+from tac_vm import TACVM, program_params
+
+CODE = '''int max(int a, int b) { if (a > b) { return a; } return b; }
+int clamp(int x, int lo, int hi) { return hi - max(hi - max(x, lo), 0); }
+int main(int n) {
+    int i = 0; int total = 0;
+    while (i < n) { total = total + clamp(i - n / 2, 0, 100) + max(i, 3); i = i + 1; }
+    return total;
+}'''
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ast = Parser(Lexer(CODE).tokenize()).parse()
+    tac = TACGenerator().generate(ast)
+    inliner = Inliner()
+    inlined = inliner.run(tac, ast)
+    print(inliner.report())
+    print(f"{'tac':<20} {'size':>6} {'result':>12} {'steps':>10} {'time s':>8}")
+    for label, program in (('generated', tac), ('inlined', inlined),
+                           ('optimized', optimize_tac(tac)), ('inlined+optimized', optimize_tac(inlined))):
+        vm = TACVM(program, program_params(ast))
+        steps = vm.count_steps('main', [n])
+        start = time.perf_counter()
+        result = vm.run('main', [n])
+        elapsed = time.perf_counter() - start
+        print(f"{label:<20} {len(program):>6} {result:>12} {steps:>10} {elapsed:>8.4f}")
+
+if __name__ == "__main__":
+    main()
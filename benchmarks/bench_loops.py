@@ -0,0 +1,61 @@
+"""Loop optimisation payoff: VM steps and time for while-heavy programs, optimised with and without LoopOptimizer.
+
+Run from the repository root:  python -m benchmarks.bench_loops [n]
+"""
+import sys
+import time
+
+from lexer import Lexer
+from loops import LoopOptimizer
+from lvn import LocalValueNumbering
+from parser import Parser
+from pipeline import optimize_tac
+from ssa import propagate_constants
+from tac import TACGenerator
+from tac_vm import TACVM, program_params
+
+PROGRAMS = {
+    'invariant': '''int main(int n) {
+        int a = n / 3; int b = n / 7; int i = 0; int total = 0;
+        while (i < n) { int scale = a * b + a - b; total = total + scale / 1000 + i; i = i + 1; }
+        return total;
+    }''',
+    'nested': '''int main(int n) {
+        int i = 0; int total = 0;
+        while (i < n) {
+            int j = 0; int row = i * 64;
+            while (j < 64) { total = total + row + j * 8 + (n * 2 - 1); j = j + 1; }
+            i = i + 1;
+        }
+        return total;
+    }''',
+    'strided': '''int main(int n) {
+        int i = 0; int total = 0;
+        while (i < n) { total = total + i * 12 - i * 4 + i * 12; i = i + 2; }
+        return total;
+    }''',
+}
+
+def without_loops(tac):
+    return LocalValueNumbering().run(propagate_constants(tac))
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{'program':<10} {'passes':<14} {'result':>14} {'steps':>10} {'time s':>8}")
+    for name, code in PROGRAMS.items():
+        ast = Parser(Lexer(code).tokenize()).parse()
+        tac = TACGenerator().generate(ast)
+        arg = n // 64 if name == 'nested' else n
+        optimizer = LoopOptimizer()
+        optimizer.run(tac)
+        for label, program in (('sccp+lvn', without_loops(tac)), ('+loops', optimize_tac(tac))):
+            vm = TACVM(program, program_params(ast))
+            steps = vm.count_steps('main', [arg])
+            start = time.perf_counter()
+            result = vm.run('main', [arg])
+            elapsed = time.perf_counter() - start
+            print(f"{name:<10} {label:<14} {result:>14} {steps:>10} {elapsed:>8.4f}")
+        print(f"    {optimizer.report()}")
+
+if __name__ == "__main__":
+    main()
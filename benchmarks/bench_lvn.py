@@ -0,0 +1,41 @@
+"""TAC instruction counts before and after local value numbering.
+
+Run from the repository root:  python -m benchmarks.bench_lvn [statements]
+"""
+import sys
+import time
+
+from benchmarks.bench_dataflow import make_source as make_control_flow
+from benchmarks.bench_expressions import make_source as make_expressions
+from lexer import Lexer
+from lvn import LocalValueNumbering
+from parser import Parser
+from tac import TACGenerator
+
+def make_arithmetic(statements: int) -> str:
+    # Straight-line code that recomputes the same subexpressions, as written by hand
+    lines = ['int main(int a, int b, int c) {', '  int x = 0;', '  int y = 0;']
+    for s in range(statements):
+        lines.append(f'  x = (a + b) * (a + b) + c * {s % 5};')
+        lines.append(f'  y = (a + b) * c - x / (b + a);')
+        lines.append(f'  c = y + (a + b) * (a + b);')
+    lines.append('  return x + y + c;')
+    lines.append('}')
+    return '\n'.join(lines)
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'program':<14} {'before':>8} {'after':>8} {'ratio':>6} {'time s':>8}")
+    for name, code in (('arithmetic', make_arithmetic(statements)),
+                       ('expressions', make_expressions(statements)),
+                       ('control flow', make_control_flow(statements))):
+        tac = TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+        lvn = LocalValueNumbering()
+        start = time.perf_counter()
+        lvn.run(tac)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<14} {lvn.before:>8} {lvn.after:>8} {lvn.after / lvn.before:>6.2f} {elapsed:>8.4f}")
+        print(f"    {lvn.report()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Time semantic analysis + TAC generation sequentially and on worker pools.
+
+Run from the repository root:  python -m benchmarks.bench_parallel [copies]
+"""
+import os
+import sys
+import time
+
+from benchmarks.bench_token_stream import make_source
+from lexer import Lexer
+from parallel import ParallelBackend
+from parser import Parser
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ast = Parser(Lexer(make_source(copies)).tokenize_compact()).parse()
+    baseline = None
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        _, errors, tac = ParallelBackend(workers).run(ast)
+        elapsed = time.perf_counter() - start
+        text = [str(i) for i in tac]
+        if baseline is None:
+            baseline = (errors, text)
+        assert (errors, text) == baseline, "parallel output differs from sequential"
+        print(f"{workers:3d} worker(s): {elapsed:.3f}s for {copies} functions, {len(tac)} instructions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Python ast backend vs the TAC VM on the VM benchmark programs.
+
+Run from the repository root:  python -m benchmarks.bench_pybackend [n]
+"""
+import sys
+import time
+
+from benchmarks.bench_vm import PROGRAMS
+from lexer import Lexer
+from parser import Parser
+from pipeline import optimize_tac
+from pybackend import PythonBackend
+from tac import TACGenerator
+from tac_vm import TACVM, program_params
+
+def timed(fn, arg):
+    start = time.perf_counter()
+    result = fn(arg)
+    return result, time.perf_counter() - start
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"{'program':<10} {'result':>12} {'vm s':>8} {'python s':>9} {'speedup':>8}")
+    for name, code in PROGRAMS.items():
+        ast = Parser(Lexer(code).tokenize()).parse()
+        arg = n if name != 'calls' else max(1, n.bit_length() + 7)
+        vm = TACVM(optimize_tac(TACGenerator().generate(ast)), program_params(ast))
+        expected, vm_time = timed(lambda a: vm.run('main', [a]), arg)
+        result, py_time = timed(PythonBackend().compile(ast)['main'], arg)
+        assert result == expected, (name, result, expected)
+        print(f"{name:<10} {result:>12} {vm_time:>8.4f} {py_time:>9.4f} {vm_time / py_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Temps before and after linear-scan compaction, and what a register budget costs in spills.
+
+A frame that indexes temps by number needs as many slots as the highest temp
+number; the generator numbers temps across the whole program.
+
+Run from the repository root:  python -m benchmarks.bench_regalloc [copies]
+"""
+import sys
+import time
+
+from benchmarks.bench_expressions import make_source as make_expressions
+from benchmarks.bench_token_stream import make_source
+from lexer import Lexer
+from parser import Parser
+from regalloc import LinearScan
+from tac import TACGenerator
+from tac_buffer import TEMP_RE
+
+def temp_numbers(tac):
+    return {int(name[1:]) for instr in tac for name in (instr.arg1, instr.arg2, instr.result)
+            if isinstance(name, str) and TEMP_RE.fullmatch(name)}
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'program':<12} {'budget':<10} {'temps':>7} {'highest':>8} {'spilled':>8} {'instrs':>8} {'time s':>8}")
+    for name, code in (('functions', make_source(copies)), ('expressions', make_expressions(copies))):
+        tac = TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+        numbers = temp_numbers(tac)
+        print(f"{name:<12} {'-':<10} {len(numbers):>7} {max(numbers):>8} {0:>8} {len(tac):>8} {'-':>8}")
+        for registers in (None, 4, 2):
+            allocator = LinearScan(registers)
+            start = time.perf_counter()
+            out = allocator.run(tac)
+            elapsed = time.perf_counter() - start
+            numbers = temp_numbers(out)
+            label = 'unbounded' if registers is None else str(registers)
+            print(f"{'':<12} {label:<10} {len(numbers):>7} {max(numbers):>8} {allocator.spilled:>8} {len(out):>8} "
+                  f"{elapsed:>8.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Semantic analysis of deeply nested blocks: per-name shadow stacks vs the old scope walk.
+
+Run from the repository root:  python -m benchmarks.bench_symbols [depth]
+"""
+import sys
+import time
+
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from symbol_table import SymbolTableStack
+
+class ScopeWalkStack(SymbolTableStack):
+    # The previous lookup: every open table, each walking its own parent chain
+    def lookup(self, name):
+        for table in reversed(self.stack):
+            sym = table.lookup(name)
+            if sym:
+                return sym
+        return None
+
+def make_source(depth: int) -> str:
+    lines = ['int main() {', '  int total = 0;']
+    for d in range(depth):
+        lines.append(f'  {{ int v{d} = total + {d}; total = total + v{d} * 2;')
+    lines.append('  ' + '}' * depth)
+    lines.append('  return total;')
+    lines.append('}')
+    return '\n'.join(lines)
+
+def analyze(ast, stack_class):
+    analyzer = SemanticAnalyzer()
+    analyzer.symbol_stack = stack_class()
+    start = time.perf_counter()
+    analyzer.analyze(ast)
+    return time.perf_counter() - start, analyzer.errors
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), depth * 20))
+    ast = Parser(Lexer(make_source(depth)).tokenize_compact()).parse()
+    old_time, old_errors = analyze(ast, ScopeWalkStack)
+    new_time, new_errors = analyze(ast, SymbolTableStack)
+    assert old_errors == new_errors
+    print(f"depth {depth}: scope walk {old_time:.4f}s, shadow stacks {new_time:.4f}s "
+          f"({old_time / new_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
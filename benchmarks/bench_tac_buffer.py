@@ -0,0 +1,50 @@
+"""Memory of TACInstruction lists vs TACBuffer, and a use-count scan over each.
+
+Run from the repository root:  python -m benchmarks.bench_tac_buffer [copies]
+"""
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from benchmarks.bench_token_stream import make_source
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+from tac_buffer import TEMP, TACBuffer
+
+def count_temp_uses_strings(tac):
+    uses = Counter()
+    for instr in tac:
+        for operand in (instr.arg1, instr.arg2):
+            if isinstance(operand, str) and operand.startswith('t') and operand[1:].isdigit():
+                uses[operand] += 1
+    return len(uses)
+
+def count_temp_uses_buffer(buffer):
+    uses = Counter()
+    for kinds, values in ((buffer.arg1_kinds, buffer.arg1_values), (buffer.arg2_kinds, buffer.arg2_values)):
+        uses.update(v for k, v in zip(kinds, values) if k == TEMP)
+    return len(uses)
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ast = Parser(Lexer(make_source(copies)).tokenize_compact()).parse()
+    tac, list_bytes = traced(lambda: TACGenerator().generate(ast))
+    buffer, buffer_bytes = traced(lambda: TACBuffer.from_instructions(tac))
+    print(f"{len(tac)} instructions: list {list_bytes / len(tac):.0f} B/instr, "
+          f"buffer {buffer_bytes / len(tac):.0f} B/instr")
+    for name, scan, ir in (("strings", count_temp_uses_strings, tac), ("buffer", count_temp_uses_buffer, buffer)):
+        start = time.perf_counter()
+        scan(ir)
+        print(f"temp use scan over {name}: {time.perf_counter() - start:.4f}s")
+
+if __name__ == "__main__":
+    main()
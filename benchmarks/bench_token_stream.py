@@ -0,0 +1,61 @@
+"""Compare the List[Token] front end with the array-backed TokenStream.
+
+Run from the repository root:  python -m benchmarks.bench_token_stream [copies]
+"""
+import sys
+import time
+import tracemalloc
+
+from lexer import Lexer
+from parser import Parser
+
+TEMPLATE = """int helper_{n}(int a, int b) {{
+    int total_{n} = a * 2 + b;
+    while (total_{n} > 100) {{
+        total_{n} = total_{n} - b / 3;
+    }}
+    if (a >= b && total_{n} != 0) {{
+        return total_{n};
+    }} else {{
+        return helper_{n}(b, a - 1);
+    }}
+}}
+"""
+
+def make_source(copies: int) -> str:
+    return ''.join(TEMPLATE.format(n=n) for n in range(copies))
+
+def measure(build):
+    # Timed and traced separately: tracemalloc slows allocation-heavy code a lot
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    code = make_source(copies)
+
+    tokens, list_lex, list_bytes = measure(lambda: Lexer(code).tokenize())
+    stream, stream_lex, stream_bytes = measure(lambda: Lexer(code).tokenize_compact())
+    count = len(tokens)
+
+    start = time.perf_counter()
+    Parser(tokens).parse()
+    list_parse = time.perf_counter() - start
+    start = time.perf_counter()
+    Parser(stream).parse()
+    stream_parse = time.perf_counter() - start
+
+    print(f"{count} tokens ({len(code)} chars)")
+    print(f"{'path':<12}{'lex s':>10}{'parse s':>10}{'bytes/token':>14}")
+    print(f"{'List[Token]':<12}{list_lex:>10.4f}{list_parse:>10.4f}{list_bytes / count:>14.1f}")
+    print(f"{'TokenStream':<12}{stream_lex:>10.4f}{stream_parse:>10.4f}{stream_bytes / count:>14.1f}")
+    print(f"memory ratio: {list_bytes / stream_bytes:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""TAC VM throughput: instructions executed per second on loop- and call-heavy programs.
+
+Run from the repository root:  python -m benchmarks.bench_vm [n]
+"""
+import sys
+import time
+
+from lexer import Lexer
+from parser import Parser
+from pipeline import optimize_tac
+from tac import TACGenerator
+from tac_vm import TACVM, program_params
+
+PROGRAMS = {
+    'loop': '''int main(int n) {
+        int i = 0; int total = 0;
+        while (i < n) { total = total + i * 2 - 1; i = i + 1; }
+        return total;
+    }''',
+    'branches': '''int main(int n) {
+        int i = 0; int odd = 0; float x = 0.5;
+        while (i < n) {
+            if (i - i / 2 * 2 == 1) { odd = odd + 1; } else { x = x * 1.0001; }
+            i = i + 1;
+        }
+        return odd;
+    }''',
+    'calls': '''int fib(int n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+    int main(int n) { return fib(n); }''',
+}
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"{'program':<10} {'tac':<10} {'result':>10} {'instrs':>10} {'time s':>8} {'M instr/s':>10}")
+    for name, code in PROGRAMS.items():
+        ast = Parser(Lexer(code).tokenize()).parse()
+        tac = TACGenerator().generate(ast)
+        arg = n if name != 'calls' else max(1, n.bit_length() + 7)
+        for label, program in (('generated', tac), ('optimized', optimize_tac(tac))):
+            vm = TACVM(program, program_params(ast))
+            steps = vm.count_steps('main', [arg])
+            start = time.perf_counter()
+            result = vm.run('main', [arg])
+            elapsed = time.perf_counter() - start
+            print(f"{name:<10} {label:<10} {result:>10} {steps:>10} {elapsed:>8.4f} {steps / elapsed / 1e6:>10.2f}")
+
+if __name__ == "__main__":
+    main()
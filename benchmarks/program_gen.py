@@ -0,0 +1,169 @@
+"""Seeded generator of random, well-typed MiniLang++ programs for benchmarks.
+
+Run from the repository root to print one:  python -m benchmarks.program_gen [functions] [seed]
+"""
+import random
+import sys
+from typing import Dict, List, Optional, Tuple
+
+TYPES = ('int', 'float', 'bool')
+
+class ProgramGenerator:
+    """Random programs that pass SemanticAnalyzer, shaped by a few knobs.
+
+    ``functions`` functions plus ``main``, each with about ``statements``
+    statements per block, blocks nested at most ``depth`` deep, expressions
+    at most ``expression_size`` operators deep, and a ``call_density``
+    chance that an expression leaf is a call. Functions only call the ones
+    defined before them and every while loop counts down a few iterations
+    from a small constant, so programs also terminate when run; divisors are
+    nonzero constants. The same seed and knobs always give the same source.
+    """
+    def __init__(self, seed: int = 0, functions: int = 10, statements: int = 6, depth: int = 2,
+                 expression_size: int = 3, call_density: float = 0.1):
+        self.rng = random.Random(seed)
+        self.functions = functions
+        self.statements = statements
+        self.depth = depth
+        self.expression_size = expression_size
+        self.call_density = call_density
+        self.signatures: List[Tuple[str, str, List[str]]] = []
+        self.scopes: List[Dict[str, Tuple[str, bool]]] = []
+        self.names = 0
+
+    def generate(self) -> str:
+        self.signatures = []
+        lines: List[str] = []
+        for k in range(self.functions):
+            params = [self.rng.choice(TYPES) for _ in range(self.rng.randint(0, 3))]
+            lines.extend(self.function(f"f{k}", self.rng.choice(TYPES), params))
+        lines.extend(self.function('main', 'int', []))
+        return '\n'.join(lines) + '\n'
+
+    def function(self, name: str, return_type: str, params: List[str]) -> List[str]:
+        self.names = 0
+        self.scopes = [{}]
+        declared = []
+        for k, typ in enumerate(params):
+            self.scopes[-1][f"p{k}"] = (typ, True)
+            declared.append(f"{typ} p{k}")
+        lines = [f"{return_type} {name}({', '.join(declared)}) {{"]
+        lines.extend(self.block(0, '    '))
+        lines.append(f"    return {self.expr(return_type)};")
+        lines.append('}')
+        # Registered afterwards, so a function never calls itself
+        self.signatures.append((name, return_type, params))
+        return lines
+
+    def block(self, depth: int, indent: str) -> List[str]:
+        lines: List[str] = []
+        for _ in range(self.rng.randint(1, self.statements)):
+            lines.extend(self.statement(depth, indent))
+        return lines
+
+    def nested(self, depth: int, indent: str) -> List[str]:
+        self.scopes.append({})
+        lines = self.block(depth + 1, indent + '    ')
+        self.scopes.pop()
+        return lines
+
+    def new_name(self, typ: str, assignable: bool = True) -> str:
+        self.names += 1
+        name = f"v{self.names}"
+        self.scopes[-1][name] = (typ, assignable)
+        return name
+
+    def variables(self, typ: str, assignable: bool = False) -> List[str]:
+        return [name for scope in self.scopes for name, (t, can_assign) in scope.items()
+                if t == typ and (can_assign or not assignable)]
+
+    def statement(self, depth: int, indent: str) -> List[str]:
+        rng = self.rng
+        r = rng.random()
+        if depth < self.depth and r < 0.15:
+            lines = [f"{indent}if ({self.expr('bool')}) {{"]
+            lines.extend(self.nested(depth, indent))
+            if rng.random() < 0.5:
+                lines.append(f"{indent}}} else {{")
+                lines.extend(self.nested(depth, indent))
+            lines.append(f"{indent}}}")
+            return lines
+        if depth < self.depth and r < 0.25:
+            # The counter can't be assigned in the body, so the loop always ends
+            counter = self.new_name('int', assignable=False)
+            lines = [f"{indent}int {counter} = {rng.randint(1, 3)};",
+                     f"{indent}while ({counter} > 0) {{"]
+            lines.extend(self.nested(depth, indent))
+            lines.append(f"{indent}    {counter} = {counter} - 1;")
+            lines.append(f"{indent}}}")
+            return lines
+        typ = rng.choice(TYPES)
+        if r < 0.6:
+            value = self.expr(typ)
+            return [f"{indent}{typ} {self.new_name(typ)} = {value};"]
+        targets = self.variables(typ, assignable=True)
+        if targets:
+            return [f"{indent}{rng.choice(targets)} = {self.expr(typ)};"]
+        call = self.call(typ, 1)
+        if call is not None:
+            return [f"{indent}{call};"]
+        value = self.expr(typ)
+        return [f"{indent}{typ} {self.new_name(typ)} = {value};"]
+
+    def call(self, typ: str, size: int) -> Optional[str]:
+        callees = [sig for sig in self.signatures if sig[1] == typ]
+        if not callees:
+            return None
+        name, _, params = self.rng.choice(callees)
+        return f"{name}({', '.join(self.expr(param, size - 1) for param in params)})"
+
+    def leaf(self, typ: str, size: int) -> str:
+        rng = self.rng
+        if size >= 0 and rng.random() < self.call_density:
+            call = self.call(typ, size)
+            if call is not None:
+                return call
+        names = self.variables(typ)
+        if names and rng.random() < 0.7:
+            return rng.choice(names)
+        if typ == 'int':
+            return str(rng.randint(0, 99))
+        if typ == 'float':
+            return f"{rng.randint(0, 99)}.{rng.randint(0, 9)}"
+        return rng.choice(('true', 'false'))
+
+    def expr(self, typ: str, size: Optional[int] = None) -> str:
+        rng = self.rng
+        if size is None:
+            size = rng.randint(0, self.expression_size)
+        if size <= 0:
+            return self.leaf(typ, size)
+        r = rng.random()
+        if typ == 'bool':
+            if r < 0.5:
+                operand = rng.choice(('int', 'float'))
+                op = rng.choice(('==', '!=', '<', '<=', '>', '>='))
+                return f"({self.expr(operand, size - 1)} {op} {self.expr(operand, size - 1)})"
+            if r < 0.8:
+                op = rng.choice(('&&', '||'))
+                return f"({self.expr('bool', size - 1)} {op} {self.expr('bool', size - 1)})"
+            if r < 0.9:
+                return f"!({self.expr('bool', size - 1)})"
+            return self.leaf(typ, size)
+        if r < 0.1:
+            return f"(-{self.expr(typ, size - 1)})"
+        if r < 0.2:
+            divisor = str(rng.randint(1, 9)) if typ == 'int' else f"{rng.randint(1, 9)}.5"
+            return f"({self.expr(typ, size - 1)} / {divisor})"
+        if r < 0.9:
+            op = rng.choice(('+', '-', '*'))
+            return f"({self.expr(typ, size - 1)} {op} {self.expr(typ, size - 1)})"
+        return self.leaf(typ, size)
+
+def generate_program(functions: int = 10, seed: int = 0, **knobs) -> str:
+    return ProgramGenerator(seed, functions, **knobs).generate()
+
+if __name__ == "__main__":
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    print(generate_program(functions, seed), end='')
@@ -0,0 +1,130 @@
+"""Per-phase front-end throughput on generated programs, checked against a stored baseline.
+
+Run from the repository root:  python -m benchmarks.run_benchmarks [--sizes 10 50 200] [--update]
+
+Each size is a program of that many functions from ProgramGenerator. Every
+phase is timed on its own input (best of --repeat runs) and reported as
+tokens/s (lexer), AST nodes/s (parser, semantic analysis) or TAC
+instructions/s (TAC generation, -O). Rates are compared with
+benchmarks/baseline.json and the run fails if any drops more than
+--tolerance below it. Throughput depends on the machine: after changing
+machines, or on purpose, rerun with --update to store new numbers.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.program_gen import ProgramGenerator
+from lexer import Lexer
+from minilang_ast import ASTNode, iter_nodes
+from parser import Parser
+from pipeline import optimize_tac
+from semantic import SemanticAnalyzer
+from tac import TACGenerator
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+PHASES = ('lex', 'parse', 'semantic', 'tac', 'optimize')
+UNITS = {'lex': 'tokens', 'parse': 'nodes', 'semantic': 'nodes', 'tac': 'instrs', 'optimize': 'instrs'}
+
+def count_nodes(root: ASTNode) -> int:
+    return sum(1 for _ in iter_nodes(root))
+
+def best_time(fn: Callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure(code: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    tokens = Lexer(code).tokenize_compact()
+    ast = Parser(tokens).parse()
+    nodes = count_nodes(ast)
+    tac = TACGenerator().generate(ast)
+    results = {}
+
+    def record(phase: str, units: int, fn: Callable):
+        seconds = best_time(fn, repeat)
+        results[phase] = {'units': units, 'seconds': seconds, 'rate': units / seconds}
+
+    record('lex', len(tokens), lambda: Lexer(code).tokenize_compact())
+    record('parse', nodes, lambda: Parser(tokens).parse())
+    # Analysis annotates the tree, so each run gets a tree of its own, parsed beforehand
+    trees = iter([Parser(tokens).parse() for _ in range(repeat)])
+    record('semantic', nodes, lambda: SemanticAnalyzer().analyze(next(trees)))
+    record('tac', len(tac), lambda: TACGenerator().generate(ast))
+    record('optimize', len(tac), lambda: optimize_tac(tac))
+    return results
+
+def check(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    failures = []
+    for size, phases in results.items():
+        expected = baseline.get(size)
+        if expected is None:
+            continue
+        for phase, stats in phases.items():
+            floor = expected.get(phase, 0) * (1 - tolerance)
+            if stats['rate'] < floor:
+                failures.append(f"size {size} {phase}: {stats['rate']:,.0f} {UNITS[phase]}/s, "
+                                f"baseline {expected[phase]:,.0f} (-{tolerance:.0%} allowed)")
+    return failures
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200], help="functions per program")
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--depth', type=int, default=2, help="deepest nesting of if/while blocks")
+    ap.add_argument('--expression-size', type=int, default=3, help="deepest nesting of operators")
+    ap.add_argument('--call-density', type=float, default=0.1, help="chance that an expression leaf is a call")
+    ap.add_argument('--repeat', type=int, default=5, help="runs per phase; the fastest counts")
+    ap.add_argument('--tolerance', type=float, default=0.3, help="allowed slowdown as a fraction")
+    ap.add_argument('--baseline', default=BASELINE)
+    ap.add_argument('--update', action='store_true', help="store these rates as the new baseline")
+    args = ap.parse_args(argv)
+
+    program = {'seed': args.seed, 'depth': args.depth, 'expression_size': args.expression_size,
+               'call_density': args.call_density}
+    results: Dict[str, dict] = {}
+    print(f"{'size':>5} {'phase':<9} {'units':>9} {'time s':>8} {'rate/s':>12}")
+    for size in args.sizes:
+        code = ProgramGenerator(args.seed, size, depth=args.depth, expression_size=args.expression_size,
+                                call_density=args.call_density).generate()
+        phases = measure(code, args.repeat)
+        results[str(size)] = phases
+        for phase in PHASES:
+            stats = phases[phase]
+            print(f"{size:>5} {phase:<9} {stats['units']:>9} {stats['seconds']:>8.4f} "
+                  f"{stats['rate']:>12,.0f} {UNITS[phase]}")
+
+    rates = {size: {phase: round(stats['rate']) for phase, stats in phases.items()}
+             for size, phases in results.items()}
+    if args.update:
+        data = {'program': program, 'rates': rates}
+        with open(args.baseline, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline written to {args.baseline}.")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update to create one.")
+        return 0
+    with open(args.baseline) as f:
+        data = json.load(f)
+    if data.get('program') != program:
+        print(f"\nBaseline was recorded for other programs ({data.get('program')}); not comparing.")
+        return 0
+    failures = check(results, data['rates'], args.tolerance)
+    if failures:
+        print("\nRegressions against the baseline:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+from typing import Dict, List, Set
+
+from minilang_ast import *
+
+def calls_in(func: FunctionDef) -> List[FunctionCall]:
+    # Every call in the body, in source order; explicit stack so deep nesting is fine
+    found = []
+    stack: List[ASTNode] = [func.body]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Block):
+            stack.extend(reversed(node.statements))
+        elif isinstance(node, FunctionCall):
+            found.append(node)
+            stack.extend(reversed(node.args))
+        elif isinstance(node, VariableDecl):
+            if node.initializer is not None:
+                stack.append(node.initializer)
+        elif isinstance(node, Assignment):
+            stack.append(node.value)
+        elif isinstance(node, If):
+            if node.else_block is not None:
+                stack.append(node.else_block)
+            stack.append(node.then_block)
+            stack.append(node.condition)
+        elif isinstance(node, While):
+            stack.append(node.body)
+            stack.append(node.condition)
+        elif isinstance(node, Return):
+            if node.value is not None:
+                stack.append(node.value)
+        elif isinstance(node, BinaryOp):
+            stack.append(node.right)
+            stack.append(node.left)
+        elif isinstance(node, UnaryOp):
+            stack.append(node.operand)
+    return found
+
+class CallGraph:
+    """Who calls whom in a Program, with its strongly connected components.
+
+    ``components`` lists the SCCs callees first (reverse topological order),
+    which is the order to process functions in when callers should see their
+    callees already transformed. Calls to functions the program doesn't
+    define are recorded in ``external`` and left out of the graph.
+    """
+    def __init__(self, program: Program):
+        self.functions: List[str] = [func.name for func in program.functions]
+        defined = set(self.functions)
+        self.callees: Dict[str, List[str]] = {}
+        self.call_counts: Dict[str, int] = {name: 0 for name in self.functions}
+        self.external: Set[str] = set()
+        for func in program.functions:
+            callees = self.callees.setdefault(func.name, [])
+            for call in calls_in(func):
+                if call.name not in defined:
+                    self.external.add(call.name)
+                    continue
+                self.call_counts[call.name] += 1
+                if call.name not in callees:
+                    callees.append(call.name)
+        self.components = self.strongly_connected()
+        self.component_of: Dict[str, int] = {}
+        for index, component in enumerate(self.components):
+            for name in component:
+                self.component_of[name] = index
+
+    def strongly_connected(self) -> List[List[str]]:
+        # Tarjan's algorithm without recursion; emits each SCC after all the SCCs it reaches
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        for root in self.functions:
+            if root in index:
+                continue
+            work = [(root, iter(self.callees[root]))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                name, callees = work[-1]
+                for callee in callees:
+                    if callee not in index:
+                        index[callee] = low[callee] = len(index)
+                        stack.append(callee)
+                        on_stack.add(callee)
+                        work.append((callee, iter(self.callees[callee])))
+                        break
+                    if callee in on_stack:
+                        low[name] = min(low[name], index[callee])
+                else:
+                    work.pop()
+                    if work:
+                        caller = work[-1][0]
+                        low[caller] = min(low[caller], low[name])
+                    if low[name] == index[name]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == name:
+                                break
+                        components.append(component)
+        return components
+
+    def is_recursive(self, name: str) -> bool:
+        # In a cycle of calls, including a function calling itself
+        component = self.components[self.component_of[name]]
+        return len(component) > 1 or name in self.callees[name]
+
+    def bottom_up(self) -> List[str]:
+        return [name for component in self.components for name in component]
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    graph = CallGraph(Parser(Lexer(code).tokenize()).parse())
+    for name in graph.bottom_up():
+        recursive = " (recursive)" if graph.is_recursive(name) else ""
+        print(f"{name}{recursive} -> {', '.join(graph.callees[name]) or '-'}")
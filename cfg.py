@@ -0,0 +1,192 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+from tac import TACInstruction
+
+JUMP_OPS = ('goto', 'ifz', 'ifnz')
+# Operations without side effects whose result may be dropped when unused
+PURE_OPS = frozenset(('=', 'phi', '+', '-', '*', '/', '==', '!=', '<', '<=', '>', '>=', '&&', '||', '!'))
+
+def is_name(operand) -> bool:
+    # Same test as parse_constant(operand) is None, without parsing the number
+    if type(operand) is not str:
+        return False
+    first = operand[:1]
+    if first.isdigit() or first == '-' and operand[1:2].isdigit():
+        return False
+    return operand != 'true' and operand != 'false'
+
+def uses(instr: TACInstruction) -> List[str]:
+    # Variables and temps an instruction reads
+    op = instr.op
+    if op == 'phi':
+        return [arg for arg in instr.arg1 if is_name(arg)]
+    if op in ('label', 'goto', 'call'):
+        return []
+    return [arg for arg in (instr.arg1, instr.arg2) if is_name(arg)]
+
+def defines(instr: TACInstruction) -> Optional[str]:
+    if instr.op in ('label', 'goto', 'ifz', 'ifnz', 'param', 'return'):
+        return None
+    return instr.result
+
+def jump_target(instr: TACInstruction) -> Optional[str]:
+    if instr.op == 'goto':
+        return instr.arg1
+    if instr.op in ('ifz', 'ifnz'):
+        return instr.result
+    return None
+
+def split_functions(instructions: List[TACInstruction]) -> List[List[TACInstruction]]:
+    # A function starts at a label nothing jumps to; the generator's own labels are all jump targets
+    targets = {jump_target(instr) for instr in instructions if instr.op in JUMP_OPS}
+    functions: List[List[TACInstruction]] = []
+    for instr in instructions:
+        if instr.op == 'label' and instr.result not in targets or not functions:
+            functions.append([])
+        functions[-1].append(instr)
+    return functions
+
+class BasicBlock:
+    __slots__ = ('index', 'label', 'instructions', 'preds', 'succs')
+
+    def __init__(self, index: int, label: Optional[str]):
+        self.index = index
+        self.label = label
+        self.instructions: List[TACInstruction] = []
+        self.preds: List['BasicBlock'] = []
+        self.succs: List['BasicBlock'] = []
+
+    @property
+    def terminator(self) -> Optional[TACInstruction]:
+        if self.instructions and self.instructions[-1].op in JUMP_OPS + ('return',):
+            return self.instructions[-1]
+        return None
+
+    def __repr__(self):
+        return f"BasicBlock({self.index}, {self.label!r})"
+
+class ControlFlowGraph:
+    """Basic blocks of one function's TAC, in their original order.
+
+    Blocks start at labels and after jumps and returns; the first block is the
+    entry. ``succs`` lists the fall-through successor of a conditional jump
+    first, then its target.
+    """
+    def __init__(self, instructions: List[TACInstruction]):
+        self.blocks: List[BasicBlock] = []
+        self.label_blocks: Dict[str, BasicBlock] = {}
+        block = None
+        for instr in instructions:
+            if block is None or instr.op == 'label' and block.instructions:
+                block = BasicBlock(len(self.blocks), instr.result if instr.op == 'label' else None)
+                self.blocks.append(block)
+            if instr.op == 'label':
+                self.label_blocks[instr.result] = block
+            block.instructions.append(instr)
+            if instr.op in JUMP_OPS or instr.op == 'return':
+                block = None
+        self.link()
+
+    @property
+    def entry(self) -> BasicBlock:
+        return self.blocks[0]
+
+    def link(self):
+        for block in self.blocks:
+            block.preds = []
+            block.succs = []
+        for block in self.blocks:
+            last = block.terminator
+            nxt = self.blocks[block.index + 1] if block.index + 1 < len(self.blocks) else None
+            if last is None or last.op in ('ifz', 'ifnz'):
+                if nxt is not None:
+                    block.succs.append(nxt)
+            if last is not None and last.op in JUMP_OPS:
+                target = self.label_blocks[jump_target(last)]
+                if target not in block.succs:
+                    block.succs.append(target)
+            for succ in block.succs:
+                succ.preds.append(block)
+
+    def reachable(self) -> List[BasicBlock]:
+        # Blocks reachable from the entry, in reverse postorder. Successors are searched last
+        # first, which keeps loop bodies ahead of the code after the loop
+        seen = {self.entry.index}
+        order = []
+        stack = [(self.entry, reversed(self.entry.succs))]
+        while stack:
+            block, succs = stack[-1]
+            for succ in succs:
+                if succ.index not in seen:
+                    seen.add(succ.index)
+                    stack.append((succ, reversed(succ.succs)))
+                    break
+            else:
+                stack.pop()
+                order.append(block)
+        order.reverse()
+        return order
+
+    def remove_unreachable(self):
+        keep = {block.index for block in self.reachable()}
+        self.blocks = [block for block in self.blocks if block.index in keep]
+        self.label_blocks = {label: block for label, block in self.label_blocks.items()
+                             if block.index in keep}
+        for index, block in enumerate(self.blocks):
+            block.index = index
+        self.link()
+
+    def dominators(self) -> List[Optional[BasicBlock]]:
+        # Immediate dominators (Cooper, Harvey & Kennedy); None for the entry and unreachable blocks
+        order = self.reachable()
+        rpo = {block.index: i for i, block in enumerate(order)}
+        idom: List[Optional[BasicBlock]] = [None] * len(self.blocks)
+        entry = self.entry
+        idom[entry.index] = entry
+        changed = True
+        while changed:
+            changed = False
+            for block in order[1:]:
+                new_idom = None
+                for pred in block.preds:
+                    if idom[pred.index] is None:
+                        continue
+                    if new_idom is None:
+                        new_idom = pred
+                        continue
+                    a, b = pred, new_idom
+                    while a is not b:
+                        while rpo[a.index] > rpo[b.index]:
+                            a = idom[a.index]
+                        while rpo[b.index] > rpo[a.index]:
+                            b = idom[b.index]
+                    new_idom = a
+                if idom[block.index] is not new_idom:
+                    idom[block.index] = new_idom
+                    changed = True
+        idom[entry.index] = None
+        return idom
+
+    def dominance_frontiers(self, idom: List[Optional[BasicBlock]]) -> List[Set[int]]:
+        frontiers: List[Set[int]] = [set() for _ in self.blocks]
+        entry = self.entry
+        for block in self.blocks:
+            if block is not entry and idom[block.index] is None:
+                continue
+            preds = [p for p in block.preds if p is entry or idom[p.index] is not None]
+            if len(preds) < 2:
+                continue
+            for pred in preds:
+                runner = pred
+                while runner is not idom[block.index]:
+                    frontiers[runner.index].add(block.index)
+                    if runner is entry:
+                        break
+                    runner = idom[runner.index]
+        return frontiers
+
+    def instructions(self) -> List[TACInstruction]:
+        return [instr for block in self.blocks for instr in block.instructions]
+
+def build_cfgs(instructions: Iterable[TACInstruction]) -> List[ControlFlowGraph]:
+    return [ControlFlowGraph(function) for function in split_functions(list(instructions))]
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Dict, Optional
+
+from pipeline import COMPILER_VERSION, CompilationResult
+
+def cache_key(source: str, options: Optional[Dict[str, str]] = None) -> str:
+    digest = hashlib.sha256()
+    digest.update(COMPILER_VERSION.encode())
+    for name, value in sorted((options or {}).items()):
+        digest.update(f"\0{name}={value}".encode())
+    digest.update(b"\0\0")
+    digest.update(source.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+class CompilationCache:
+    """Content-addressed on-disk cache of CompilationResults.
+
+    Entries are keyed by a SHA-256 of the compiler version, the options and the
+    source text, so an unchanged file is a hit no matter where it lives. Writers
+    publish entries with an atomic rename and readers treat missing or torn files
+    as misses, so several processes can share one directory without locking.
+    Entry mtimes record last use; once the directory grows past max_bytes the
+    least recently used entries are deleted.
+    """
+    SUFFIX = '.pickle'
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, evict_interval: int = 64):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, source: str, options: Optional[Dict[str, str]] = None) -> str:
+        return cache_key(source, options)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[CompilationResult]:
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: CompilationResult) -> bool:
+        try:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            # Pathologically deep ASTs can't be pickled; just don't cache them
+            return False
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(key))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        self._puts += 1
+        if self._puts % self.evict_interval == 0:
+            self.evict()
+        return True
+
+    def evict(self) -> int:
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(self.SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self.SUFFIX):
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
@@ -0,0 +1,319 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from compile_cache import cache_key
+from emitters import format_ast
+from pipeline import SCANNERS, compile_source
+
+# JSON-RPC 2.0 error codes; the last two are this server's (-32800 as in the Language Server Protocol)
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+TIMED_OUT = -32001
+CANCELLED = -32800
+
+# compile options and the types they take
+OPTIONS = {'scanner': str, 'fused': bool, 'optimize': bool, 'registers': int, 'inline_size': int,
+           'tail_calls': bool}
+ARTEFACTS = ('tac', 'symbols', 'ast')
+
+class RequestError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+def compile_request(source: str, options: Dict[str, object], emit: List[str]) -> dict:
+    # Runs in a worker; returns plain data so the reply pickles cheaply
+    result = compile_source(source, **options)
+    reply: Dict[str, object] = {'errors': result.errors, 'token_count': result.token_count}
+    if 'tac' in emit:
+        reply['tac'] = [str(instr) for instr in result.tac]
+    if 'symbols' in emit:
+        reply['symbols'] = result.symbols
+    if 'ast' in emit:
+        reply['ast'] = list(format_ast(result.ast))
+    return reply
+
+def error_response(msg_id, code: int, message: str) -> dict:
+    return {'jsonrpc': '2.0', 'id': msg_id, 'error': {'code': code, 'message': message}}
+
+class CompileServer:
+    """Long-running compiler answering newline-delimited JSON-RPC 2.0 requests.
+
+    Methods: ``compile`` (params ``source`` or ``path``, ``options`` as in
+    compile_source, ``emit`` from tac/symbols/ast, ``timeout`` in seconds),
+    ``cancel`` (params ``id`` of a pending request), ``stats`` and
+    ``shutdown``. Requests on a connection are handled concurrently and
+    replies arrive as they finish. Compiles run on a pool of ``workers``
+    that stays up, so imports and the compiled token regex are paid once (a
+    forked worker inherits them from this process). The replies for the last
+    ``cache_size`` distinct source/option pairs are kept, and identical
+    requests in flight share one compile. Cancelling or timing out answers
+    at once; a compile that a worker has already started runs to completion
+    and its reply is still cached.
+    """
+    def __init__(self, workers: Optional[int] = None, mode: str = 'process', cache_size: int = 256,
+                 timeout: Optional[float] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.executor: Optional[Executor] = None
+        self.results: 'OrderedDict[str, dict]' = OrderedDict()
+        self.inflight: Dict[str, Tuple[Future, asyncio.Future]] = {}
+        self.waiters: Dict[str, int] = {}
+        self.stopped: Optional[asyncio.Event] = None
+        self.requests = 0
+        self.compiles = 0
+        self.hits = 0
+
+    def start(self):
+        if self.executor is None:
+            pool = ProcessPoolExecutor if self.mode == 'process' else ThreadPoolExecutor
+            self.executor = pool(self.workers)
+            self.stopped = asyncio.Event()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def compile(self, params: dict) -> dict:
+        source, options, emit = await self.compile_params(params)
+        key = cache_key(source, {**{name: str(value) for name, value in options.items()}, 'emit': ','.join(emit)})
+        reply = self.results.get(key)
+        if reply is not None:
+            self.results.move_to_end(key)
+            self.hits += 1
+            return reply
+        if key not in self.inflight:
+            self.compiles += 1
+            job = self.executor.submit(compile_request, source, options, emit)
+            future = asyncio.wrap_future(job)
+            future.add_done_callback(lambda done: self.finished(key, done))
+            self.inflight[key] = (job, future)
+        job, future = self.inflight[key]
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+                # Nobody wants it any more; fails if a worker has already started it
+                job.cancel()
+
+    def finished(self, key: str, future: asyncio.Future):
+        del self.inflight[key]
+        if not future.cancelled() and future.exception() is None:
+            self.results[key] = future.result()
+            if len(self.results) > self.cache_size:
+                self.results.popitem(last=False)
+
+    async def compile_params(self, params: dict) -> tuple:
+        if not isinstance(params, dict):
+            raise RequestError(INVALID_PARAMS, "params must be an object")
+        source = params.get('source')
+        if source is None and isinstance(params.get('path'), str):
+            try:
+                source = await asyncio.to_thread(read_source, params['path'])
+            except OSError as e:
+                raise RequestError(INVALID_PARAMS, f"can't read {params['path']}: {e.strerror}")
+        if not isinstance(source, str):
+            raise RequestError(INVALID_PARAMS, "compile needs a 'source' string or a 'path'")
+        options = params.get('options', {})
+        if not isinstance(options, dict):
+            raise RequestError(INVALID_PARAMS, "options must be an object")
+        for name, value in options.items():
+            expected = OPTIONS.get(name)
+            if expected is None:
+                raise RequestError(INVALID_PARAMS, f"unknown option {name!r}")
+            if type(value) is not expected:
+                raise RequestError(INVALID_PARAMS, f"option {name!r} must be {expected.__name__}")
+        if options.get('scanner', 'regex') not in SCANNERS:
+            raise RequestError(INVALID_PARAMS, f"unknown scanner {options['scanner']!r}")
+        if options.get('registers', 2) < 2:
+            raise RequestError(INVALID_PARAMS, "option 'registers' needs at least 2")
+        if options.get('inline_size', 0) < 0:
+            raise RequestError(INVALID_PARAMS, "option 'inline_size' can't be negative")
+        emit = params.get('emit', ['tac'])
+        if not isinstance(emit, list) or any(item not in ARTEFACTS for item in emit):
+            raise RequestError(INVALID_PARAMS, f"emit must be a list drawn from {', '.join(ARTEFACTS)}")
+        return source, options, sorted(set(emit))
+
+    def request_timeout(self, params: dict) -> Optional[float]:
+        timeout = params.get('timeout', self.timeout) if isinstance(params, dict) else self.timeout
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))
+                                    or not timeout > 0):
+            raise RequestError(INVALID_PARAMS, "timeout must be a positive number of seconds")
+        return timeout
+
+    def cancel(self, params: dict, pending: Dict[object, asyncio.Task]) -> bool:
+        task = pending.get(params.get('id')) if isinstance(params, dict) else None
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def stats(self) -> dict:
+        return {'requests': self.requests, 'compiles': self.compiles, 'cache_hits': self.hits,
+                'cached': len(self.results), 'in_flight': len(self.inflight), 'workers': self.workers,
+                'mode': self.mode}
+
+    async def dispatch(self, message: dict, pending: Dict[object, asyncio.Task]) -> dict:
+        msg_id = message.get('id')
+        method = message.get('method')
+        params = message.get('params', {})
+        self.requests += 1
+        if message.get('jsonrpc') != '2.0' or not isinstance(method, str):
+            return error_response(msg_id, INVALID_REQUEST, "not a JSON-RPC 2.0 request")
+        try:
+            if method == 'compile':
+                timeout = self.request_timeout(params)
+                result = await asyncio.wait_for(self.compile(params), timeout)
+            elif method == 'cancel':
+                result = self.cancel(params, pending)
+            elif method == 'stats':
+                result = self.stats()
+            elif method == 'shutdown':
+                self.stopped.set()
+                result = None
+            else:
+                return error_response(msg_id, METHOD_NOT_FOUND, f"unknown method {method!r}")
+        except RequestError as e:
+            return error_response(msg_id, e.code, str(e))
+        except asyncio.TimeoutError:
+            return error_response(msg_id, TIMED_OUT, "compile timed out")
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if task.cancelling():
+                task.uncancel()
+                return error_response(msg_id, CANCELLED, "request cancelled")
+            raise
+        except Exception as e:
+            return error_response(msg_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+        return {'jsonrpc': '2.0', 'id': msg_id, 'result': result}
+
+    async def serve(self, readline: Callable[[], Awaitable[bytes]], write: Callable[[bytes], Awaitable[None]]):
+        # One connection: a task per request, replies written whole under a lock
+        self.start()
+        pending: Dict[object, asyncio.Task] = {}
+        tasks = set()
+        lock = asyncio.Lock()
+
+        async def respond(response: dict):
+            async with lock:
+                await write(json.dumps(response).encode() + b'\n')
+
+        async def handle(message: dict):
+            try:
+                response = await self.dispatch(message, pending)
+                # Notifications (no id) get no reply
+                if 'id' in message:
+                    await respond(response)
+            finally:
+                if pending.get(message.get('id')) is asyncio.current_task():
+                    del pending[message['id']]
+
+        # A shutdown must not wait for a read that may never return
+        stopping = asyncio.ensure_future(self.stopped.wait())
+        while True:
+            reading = asyncio.ensure_future(readline())
+            await asyncio.wait((reading, stopping), return_when=asyncio.FIRST_COMPLETED)
+            if stopping.done():
+                reading.cancel()
+                break
+            line = reading.result()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                await respond(error_response(None, PARSE_ERROR, "invalid JSON"))
+                continue
+            if not isinstance(message, dict) or isinstance(message.get('id'), (list, dict)):
+                await respond(error_response(None, INVALID_REQUEST, "not a JSON-RPC 2.0 request"))
+                continue
+            task = asyncio.create_task(handle(message))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            if message.get('id') is not None:
+                pending[message['id']] = task
+        stopping.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def serve_stdio(self):
+        # Pipes and terminals are read by the event loop, so a pending read can simply be dropped
+        # on shutdown; a regular file can't be, but reading one on a thread never blocks for long
+        reader = asyncio.StreamReader(limit=1 << 26)
+        try:
+            await asyncio.get_running_loop().connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader),
+                                                               sys.stdin.buffer)
+            readline = reader.readline
+        except ValueError:
+            readline = lambda: asyncio.to_thread(sys.stdin.buffer.readline)
+
+        async def write(data: bytes):
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+
+        await self.serve(readline, write)
+
+    async def serve_unix(self, path: str):
+        writers = set()
+
+        async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            async def write(data: bytes):
+                writer.write(data)
+                await writer.drain()
+            writers.add(writer)
+            try:
+                await self.serve(reader.readline, write)
+            finally:
+                writers.discard(writer)
+                writer.close()
+
+        self.start()
+        server = await asyncio.start_unix_server(connection, path, limit=1 << 26)
+        async with server:
+            await self.stopped.wait()
+            # Clients still connected after a shutdown are hung up on
+            for writer in list(writers):
+                writer.close()
+
+def read_source(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="MiniLang++ compile server (newline-delimited JSON-RPC 2.0)")
+    ap.add_argument('--socket', metavar='PATH', help="listen on this Unix socket instead of stdin/stdout")
+    ap.add_argument('-j', '--jobs', type=int, help="compile workers (default: all cores)")
+    ap.add_argument('--mode', choices=['process', 'thread'], default='process', help="worker pool kind")
+    ap.add_argument('--cache-size', type=int, default=256, help="replies kept for repeated requests")
+    ap.add_argument('--timeout', type=float, help="default per-request timeout in seconds")
+    return ap.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    server = CompileServer(args.jobs, args.mode, args.cache_size, args.timeout)
+    try:
+        asyncio.run(server.serve_unix(args.socket) if args.socket else server.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
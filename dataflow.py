@@ -0,0 +1,202 @@
+from heapq import heappop, heappush
+from typing import Dict, List, Set, Tuple
+
+from cfg import BasicBlock, ControlFlowGraph, defines, uses
+from tac import TACInstruction
+
+class Universe:
+    """Numbers the items a dataflow problem talks about; a set of them is an int bitmask."""
+    def __init__(self):
+        self.items: list = []
+        self.index: Dict[object, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item) -> int:
+        bit = self.index.get(item)
+        if bit is None:
+            bit = self.index[item] = len(self.items)
+            self.items.append(item)
+        return bit
+
+    def mask(self, item) -> int:
+        return 1 << self.index[item]
+
+    def members(self, bits: int) -> list:
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self.items[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+class DataflowAnalysis:
+    """Gen/kill problem over a CFG, solved with a worklist; facts are int bitsets.
+
+    Subclasses fill ``gen`` and ``kill`` per block, then call ``solve``.
+    ``ins[b]``/``outs[b]`` are the facts on entry to and exit from block b
+    in program order, whichever way the problem flows. Union problems start
+    from the empty set, intersection problems from the full one.
+    """
+    forward = True
+    union = True
+
+    def __init__(self, cfg: ControlFlowGraph, universe: Universe):
+        self.cfg = cfg
+        self.universe = universe
+        count = len(cfg.blocks)
+        self.gen = [0] * count
+        self.kill = [0] * count
+        self.ins = [0] * count
+        self.outs = [0] * count
+        self.iterations = 0
+
+    def boundary(self) -> int:
+        # Facts at the entry (forward) or at every exit (backward)
+        return 0
+
+    def solve(self) -> 'DataflowAnalysis':
+        # The worklist is a heap of positions in reverse postorder (postorder for backward
+        # problems), so a change is propagated through the rest of the CFG once, not
+        # once per wave of a FIFO queue
+        blocks = self.cfg.blocks
+        full = (1 << len(self.universe)) - 1
+        init = 0 if self.union else full
+        order = self.cfg.reachable()
+        seen = {block.index for block in order}
+        order += [block for block in blocks if block.index not in seen]
+        if self.forward:
+            before, after, inputs, outputs = self.ins, self.outs, 'preds', 'succs'
+        else:
+            order.reverse()
+            before, after, inputs, outputs = self.outs, self.ins, 'succs', 'preds'
+        position = [0] * len(blocks)
+        for k, block in enumerate(order):
+            position[block.index] = k
+            before[block.index] = after[block.index] = init
+        sources = [[source.index for source in getattr(block, inputs)] for block in order]
+        targets = [[position[target.index] for target in getattr(block, outputs)] for block in order]
+        starts = [not sources[k] or self.forward and block is self.cfg.entry for k, block in enumerate(order)]
+        gen, kill, union = self.gen, self.kill, self.union
+        boundary = self.boundary()
+        queued = [True] * len(order)
+        work = list(range(len(order)))
+        while work:
+            k = heappop(work)
+            queued[k] = False
+            self.iterations += 1
+            fact = boundary if starts[k] else init
+            for source in sources[k]:
+                if union:
+                    fact |= after[source]
+                else:
+                    fact &= after[source]
+            i = order[k].index
+            before[i] = fact
+            result = gen[i] | (fact & ~kill[i])
+            if result != after[i]:
+                after[i] = result
+                for target in targets[k]:
+                    if not queued[target]:
+                        queued[target] = True
+                        heappush(work, target)
+        return self
+
+class Liveness(DataflowAnalysis):
+    """Variables and temps whose current value may still be read."""
+    forward = False
+
+    def __init__(self, cfg: ControlFlowGraph):
+        super().__init__(cfg, Universe())
+        names = self.universe
+        for block in cfg.blocks:
+            used = defined = 0
+            for instr in block.instructions:
+                for name in uses(instr):
+                    bit = 1 << names.add(name)
+                    if not defined & bit:
+                        used |= bit
+                name = defines(instr)
+                if name is not None:
+                    defined |= 1 << names.add(name)
+            self.gen[block.index] = used
+            self.kill[block.index] = defined
+        self.solve()
+
+    def live_in(self, block: BasicBlock) -> Set[str]:
+        return set(self.universe.members(self.ins[block.index]))
+
+    def live_out(self, block: BasicBlock) -> Set[str]:
+        return set(self.universe.members(self.outs[block.index]))
+
+    def live_after(self, block: BasicBlock) -> List[int]:
+        # Bitset live just after each instruction of the block
+        index = self.universe.index
+        live = self.outs[block.index]
+        after = [0] * len(block.instructions)
+        for k in range(len(block.instructions) - 1, -1, -1):
+            after[k] = live
+            instr = block.instructions[k]
+            name = defines(instr)
+            if name is not None:
+                live &= ~(1 << index[name])
+            for name in uses(instr):
+                live |= 1 << index[name]
+        return after
+
+class ReachingDefinitions(DataflowAnalysis):
+    """Assignments that may reach a point without being overwritten.
+
+    The universe is the defining instructions themselves, as
+    (block index, position in block) pairs.
+    """
+    def __init__(self, cfg: ControlFlowGraph):
+        super().__init__(cfg, Universe())
+        sites = self.universe
+        self.name_defs: Dict[str, int] = {}
+        block_defs = []
+        for block in cfg.blocks:
+            last: Dict[str, int] = {}
+            for k, instr in enumerate(block.instructions):
+                name = defines(instr)
+                if name is not None:
+                    bit = 1 << sites.add((block.index, k))
+                    self.name_defs[name] = self.name_defs.get(name, 0) | bit
+                    last[name] = bit
+            block_defs.append(last)
+        for block, last in zip(cfg.blocks, block_defs):
+            gen = kill = 0
+            for name, bit in last.items():
+                gen |= bit
+                kill |= self.name_defs[name]
+            self.gen[block.index] = gen
+            self.kill[block.index] = kill
+        self.solve()
+
+    def instruction(self, site: Tuple[int, int]) -> TACInstruction:
+        block, k = site
+        return self.cfg.blocks[block].instructions[k]
+
+    def reaching(self, block: BasicBlock, name: str) -> List[TACInstruction]:
+        # Definitions of name that may reach the start of block
+        bits = self.ins[block.index] & self.name_defs.get(name, 0)
+        return [self.instruction(site) for site in self.universe.members(bits)]
+
+if __name__ == "__main__":
+    from cfg import build_cfgs
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    tac = TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+    for cfg in build_cfgs(tac):
+        liveness = Liveness(cfg)
+        reaching = ReachingDefinitions(cfg)
+        print(f"{cfg.entry.label}: {len(cfg.blocks)} block(s)")
+        for block in cfg.blocks:
+            defs = sorted(f"{reaching.instruction(site).result}@{site[0]}.{site[1]}"
+                          for site in reaching.universe.members(reaching.ins[block.index]))
+            print(f"  B{block.index} live in {sorted(liveness.live_in(block))}, "
+                  f"live out {sorted(liveness.live_out(block))}, reaching {defs}")
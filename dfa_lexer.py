@@ -0,0 +1,185 @@
+from typing import Iterator, List, Tuple
+import re
+
+from lexer import Lexer
+
+# Character classes for the scanner tables. Every ASCII char maps to one of these;
+# other chars are classified once by _classify_unicode and cached.
+(C_LETTER, C_DIGIT, C_UDIGIT, C_DOT, C_ASSIGN, C_BANG, C_LT, C_GT, C_AMP, C_PIPE,
+ C_PLUS, C_MINUS, C_STAR, C_SLASH, C_LPAREN, C_RPAREN, C_LBRACE, C_RBRACE,
+ C_COMMA, C_SEMI, C_SPACE, C_NEWLINE, C_OTHER) = range(23)
+NUM_CLASSES = 23
+
+SINGLE_CHAR_CLASSES = {
+    '.': C_DOT, '=': C_ASSIGN, '!': C_BANG, '<': C_LT, '>': C_GT, '&': C_AMP, '|': C_PIPE,
+    '+': C_PLUS, '-': C_MINUS, '*': C_STAR, '/': C_SLASH, '(': C_LPAREN, ')': C_RPAREN,
+    '{': C_LBRACE, '}': C_RBRACE, ',': C_COMMA, ';': C_SEMI, ' ': C_SPACE, '\t': C_SPACE,
+    '\n': C_NEWLINE,
+}
+
+# Scanner description: state -> (accepted token type or None, {char class: next state}).
+# States listed with a self-loop also get a run regex so whole identifiers, numbers and
+# blanks are skipped in one call instead of one table step per character.
+DFA_SPEC = {
+    'START': (None, {
+        C_LETTER: 'ID', C_DIGIT: 'INT_LIT', C_UDIGIT: 'INT_LIT', C_SPACE: 'SKIP',
+        C_NEWLINE: 'NEWLINE', C_ASSIGN: 'ASSIGN', C_BANG: 'NOT', C_LT: 'LT', C_GT: 'GT',
+        C_AMP: 'AMP', C_PIPE: 'PIPE', C_PLUS: 'PLUS', C_MINUS: 'MINUS', C_STAR: 'MUL',
+        C_SLASH: 'DIV', C_LPAREN: 'LPAREN', C_RPAREN: 'RPAREN', C_LBRACE: 'LBRACE',
+        C_RBRACE: 'RBRACE', C_COMMA: 'COMMA', C_SEMI: 'SEMI', C_DOT: 'MISMATCH',
+        C_OTHER: 'MISMATCH',
+    }),
+    'ID': ('ID', {C_LETTER: 'ID', C_DIGIT: 'ID'}),
+    'INT_LIT': ('INT_LIT', {C_DIGIT: 'INT_LIT', C_UDIGIT: 'INT_LIT', C_DOT: 'INT_DOT'}),
+    'INT_DOT': (None, {C_DIGIT: 'FLOAT_LIT', C_UDIGIT: 'FLOAT_LIT'}),
+    'FLOAT_LIT': ('FLOAT_LIT', {C_DIGIT: 'FLOAT_LIT', C_UDIGIT: 'FLOAT_LIT'}),
+    'SKIP': ('SKIP', {C_SPACE: 'SKIP'}),
+    'NEWLINE': ('NEWLINE', {}),
+    'ASSIGN': ('ASSIGN', {C_ASSIGN: 'EQ'}),
+    'NOT': ('NOT', {C_ASSIGN: 'NEQ'}),
+    'LT': ('LT', {C_ASSIGN: 'LE'}),
+    'GT': ('GT', {C_ASSIGN: 'GE'}),
+    'AMP': ('MISMATCH', {C_AMP: 'AND'}),
+    'PIPE': ('MISMATCH', {C_PIPE: 'OR'}),
+    'EQ': ('EQ', {}), 'NEQ': ('NEQ', {}), 'LE': ('LE', {}), 'GE': ('GE', {}),
+    'AND': ('AND', {}), 'OR': ('OR', {}),
+    'PLUS': ('PLUS', {}), 'MINUS': ('MINUS', {}), 'MUL': ('MUL', {}), 'DIV': ('DIV', {}),
+    'LPAREN': ('LPAREN', {}), 'RPAREN': ('RPAREN', {}), 'LBRACE': ('LBRACE', {}),
+    'RBRACE': ('RBRACE', {}), 'COMMA': ('COMMA', {}), 'SEMI': ('SEMI', {}),
+    'MISMATCH': ('MISMATCH', {}),
+}
+
+RUN_PATTERNS = {'ID': r'[A-Za-z0-9_]*', 'INT_LIT': r'\d*', 'FLOAT_LIT': r'\d*', 'SKIP': r'[ \t]*'}
+
+KEYWORDS = {
+    'int': 'INT', 'float': 'FLOAT', 'bool': 'BOOL', 'if': 'IF', 'else': 'ELSE',
+    'while': 'WHILE', 'return': 'RETURN', 'true': 'TRUE', 'false': 'FALSE',
+}
+
+def _build_char_classes() -> List[int]:
+    table = []
+    for code in range(128):
+        ch = chr(code)
+        if ch.isalpha() or ch == '_':
+            table.append(C_LETTER)
+        elif ch.isdigit():
+            table.append(C_DIGIT)
+        else:
+            table.append(SINGLE_CHAR_CLASSES.get(ch, C_OTHER))
+    return table
+
+def _build_tables():
+    names = list(DFA_SPEC)
+    index = {name: i for i, name in enumerate(names)}
+    transitions = []
+    accepts = []
+    runs = []
+    for name in names:
+        accept, edges = DFA_SPEC[name]
+        row = [-1] * NUM_CLASSES
+        for cls, target in edges.items():
+            row[cls] = index[target]
+        transitions.append(row)
+        accepts.append(accept)
+        pattern = RUN_PATTERNS.get(name)
+        runs.append(re.compile(pattern).match if pattern else None)
+    return transitions, accepts, runs
+
+CHAR_CLASSES = _build_char_classes()
+TRANSITIONS, ACCEPTS, RUNS = _build_tables()
+START_ROW = TRANSITIONS[0]
+
+def _classify_unicode(ch: str) -> int:
+    # Matches what the regex lexer does with non-ASCII input: \d accepts any decimal digit
+    return C_UDIGIT if ch.isdecimal() else C_OTHER
+
+class DFALexer(Lexer):
+    """Table-driven scanner producing the same tokens and errors as Lexer.
+
+    Identifiers are recognised once by the ID state and then classified as
+    keywords with a dict lookup, instead of trying nine keyword patterns first.
+    """
+    def _scan(self, final: bool) -> Iterator[Tuple[str, str, int, int, int]]:
+        code = self._buffer
+        offset = self._offset
+        line_num = self._line_num
+        line_start = self._line_start
+        code_len = len(code)
+        limit = code_len if final else code_len - 2
+        char_classes = CHAR_CLASSES
+        unicode_classes = {}
+        transitions = TRANSITIONS
+        accepts = ACCEPTS
+        runs = RUNS
+        keywords = KEYWORDS
+        pos = 0
+        while pos < code_len:
+            ch = code[pos]
+            o = ord(ch)
+            if o < 128:
+                cls = char_classes[o]
+            else:
+                cls = unicode_classes.get(ch)
+                if cls is None:
+                    cls = unicode_classes[ch] = _classify_unicode(ch)
+            state = START_ROW[cls]
+            end = pos + 1
+            accept_state = state
+            accept_end = end
+            # Maximal munch: follow transitions, remembering the last accepting state
+            while True:
+                run = runs[state]
+                if run is not None:
+                    end = run(code, end).end()
+                if accepts[state] is not None:
+                    accept_state = state
+                    accept_end = end
+                if end >= code_len:
+                    break
+                ch = code[end]
+                o = ord(ch)
+                if o < 128:
+                    cls = char_classes[o]
+                else:
+                    cls = unicode_classes.get(ch)
+                    if cls is None:
+                        cls = unicode_classes[ch] = _classify_unicode(ch)
+                state = transitions[state][cls]
+                if state < 0:
+                    break
+                end += 1
+            if not final and (end > limit or accept_end > limit):
+                break
+            typ = accepts[accept_state]
+            if typ == 'NEWLINE':
+                line_start = accept_end
+                line_num += 1
+            elif typ == 'SKIP':
+                pass
+            elif typ == 'MISMATCH':
+                col = pos - line_start + 1
+                self.errors.append(f"Invalid token {code[pos:accept_end]!r} at line {line_num}, column {col}")
+                self.error_offsets.append(offset + pos)
+            else:
+                val = code[pos:accept_end]
+                if typ == 'ID':
+                    keyword = keywords.get(val)
+                    # A keyword needs a word boundary; non-ASCII letters don't end an ID but do block it
+                    if keyword is not None and not (accept_end < code_len and _is_word_char(code[accept_end])):
+                        typ = keyword
+                yield typ, val, line_num, pos - line_start + 1, offset + pos
+            pos = accept_end
+        self._buffer = code[pos:]
+        self._offset = offset + pos
+        self._line_num = line_num
+        self._line_start = line_start - pos
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+if __name__ == "__main__":
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    lexer = DFALexer(code)
+    lexer.tokenize()
+    lexer.print_tokens()
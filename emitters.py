@@ -0,0 +1,120 @@
+import sys
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from lexer import TOKEN_NAMES, Token, TokenStream
+from minilang_ast import (ASTNode, Assignment, BinaryOp, Block, FunctionCall, FunctionDef, Identifier, If,
+                          Literal, Program, Return, UnaryOp, VariableDecl, While)
+from tac import TACInstruction
+
+def format_tokens(tokens: Iterable[Token]) -> Iterator[str]:
+    # Same text as Token.__repr__; a TokenStream is read straight from its arrays
+    if isinstance(tokens, TokenStream):
+        source, starts, ends = tokens.source, tokens.starts, tokens.ends
+        for i, kind in enumerate(tokens.kinds):
+            yield (f"Token({TOKEN_NAMES[kind]}, {source[starts[i]:ends[i]]!r}, "
+                   f"line={tokens.lines[i]}, col={tokens.columns[i]})")
+    else:
+        yield from map(repr, tokens)
+
+def format_ast(root: ASTNode, indent: int = 0) -> Iterator[str]:
+    # The lines pretty_print writes, from an explicit stack so deep trees can't hit the recursion limit.
+    # Stack entries are (indent, node or a literal line); children are pushed in reverse
+    stack: List[tuple] = [(indent, root)]
+    while stack:
+        indent, item = stack.pop()
+        pad = ' ' * indent
+        if isinstance(item, str):
+            yield pad + item
+            continue
+        inner, deeper = indent + 2, indent + 4
+        children: List[tuple] = []
+        if isinstance(item, Program):
+            yield pad + 'Program'
+            children = [(inner, func) for func in item.functions]
+        elif isinstance(item, FunctionDef):
+            yield pad + f'FunctionDef {item.return_type} {item.name}'
+            children = [(inner, 'Params:')] + [(deeper, param) for param in item.params] + [(inner, item.body)]
+        elif isinstance(item, VariableDecl):
+            yield pad + f'VariableDecl {item.var_type} {item.name}'
+            if item.initializer is not None:
+                children = [(inner, 'Initializer:'), (deeper, item.initializer)]
+        elif isinstance(item, Block):
+            yield pad + 'Block'
+            children = [(inner, stmt) for stmt in item.statements]
+        elif isinstance(item, If):
+            yield pad + 'If'
+            children = [(inner, 'Condition:'), (deeper, item.condition), (inner, 'Then:'), (deeper, item.then_block)]
+            if item.else_block is not None:
+                children += [(inner, 'Else:'), (deeper, item.else_block)]
+        elif isinstance(item, While):
+            yield pad + 'While'
+            children = [(inner, 'Condition:'), (deeper, item.condition), (inner, 'Body:'), (deeper, item.body)]
+        elif isinstance(item, Return):
+            yield pad + 'Return'
+            if item.value is not None:
+                children = [(inner, item.value)]
+        elif isinstance(item, Assignment):
+            yield pad + 'Assignment'
+            children = [(inner, 'Target:'), (deeper, item.target), (inner, 'Value:'), (deeper, item.value)]
+        elif isinstance(item, BinaryOp):
+            yield pad + f'BinaryOp {item.op}'
+            children = [(inner, item.left), (inner, item.right)]
+        elif isinstance(item, UnaryOp):
+            yield pad + f'UnaryOp {item.op}'
+            children = [(inner, item.operand)]
+        elif isinstance(item, Literal):
+            yield pad + f'Literal {item.value} ({item.typ})'
+        elif isinstance(item, Identifier):
+            yield pad + f'Identifier {item.name}'
+        elif isinstance(item, FunctionCall):
+            yield pad + f'FunctionCall {item.name}'
+            children = [(inner, arg) for arg in item.args]
+        else:
+            yield pad + type(item).__name__
+        stack.extend(reversed(children))
+
+class Emitter:
+    """Collects output lines and writes them to a stream in one call.
+
+    ``print`` per token, node or instruction makes console I/O the slowest
+    phase on large inputs; here each section is formatted into a list and
+    ``flush`` joins it into a single ``write`` (stdout by default, or any
+    open file).
+    """
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.parts: List[str] = []
+
+    def line(self, text: str = ''):
+        self.parts.append(text)
+
+    def lines(self, lines: Iterable[str]):
+        self.parts.extend(lines)
+
+    def tokens(self, tokens: Iterable[Token]):
+        self.parts.extend(format_tokens(tokens))
+
+    def ast(self, root: ASTNode):
+        self.parts.extend(format_ast(root))
+
+    def tac(self, instructions: Iterable[TACInstruction]):
+        self.parts.extend(map(str, instructions))
+
+    def flush(self):
+        if self.parts:
+            self.parts.append('')
+            self.stream.write('\n'.join(self.parts))
+            self.parts = []
+        self.stream.flush()
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    tokens = Lexer(code).tokenize_compact()
+    emitter = Emitter()
+    emitter.tokens(tokens)
+    emitter.line()
+    emitter.ast(Parser(tokens).parse())
+    emitter.flush()
@@ -0,0 +1,245 @@
+from typing import List, Optional, Tuple
+
+from minilang_ast import *
+from semantic import SemanticAnalyzer
+from symbol_table import Symbol, SymbolTable
+from tac import TACGenerator, TACInstruction
+
+OPERATOR_KINDS = {
+    '+': 'arith', '-': 'arith', '*': 'arith', '/': 'arith',
+    '==': 'compare', '!=': 'compare', '<': 'compare', '<=': 'compare', '>': 'compare', '>=': 'compare',
+    '&&': 'logic', '||': 'logic',
+}
+
+class FusedCompiler(SemanticAnalyzer, TACGenerator):
+    """Name resolution, type checking and TAC emission in one walk of the AST.
+
+    Produces the same errors as SemanticAnalyzer and the same TAC as
+    TACGenerator. Nodes are dispatched through dicts keyed on their exact
+    type instead of isinstance chains. Where the analyzer gives up on a
+    subtree (the value assigned to an undeclared variable, the arguments of an
+    undeclared function or surplus arguments) the TAC generator still lowers
+    it, so that subtree is walked with error reporting switched off.
+    """
+    def __init__(self, per_function: bool = False, tail_calls: bool = False):
+        SemanticAnalyzer.__init__(self)
+        TACGenerator.__init__(self, per_function, tail_calls)
+        self.checking = True
+        self.emit = self.instructions.append
+        self.stmt_handlers = {
+            VariableDecl: self.fuse_vardecl, Assignment: self.fuse_assignment, If: self.fuse_if,
+            While: self.fuse_while, Return: self.fuse_return, Block: self.fuse_block,
+            FunctionCall: self.fuse_funccall,
+        }
+        self.expr_handlers = {
+            Literal: self.fuse_literal, Identifier: self.fuse_identifier, BinaryOp: self.fuse_binary,
+            UnaryOp: self.fuse_unary, FunctionCall: self.fuse_funccall,
+        }
+
+    def compile(self, program: Program) -> Tuple[List[str], List[TACInstruction]]:
+        self.declare_functions(program.functions)
+        for func in program.functions:
+            self.fuse_function(func)
+        self.symbol_stack.pop()
+        return self.errors, self.instructions
+
+    def error(self, message: str):
+        if self.checking:
+            self.errors.append(message)
+
+    def fuse_function(self, func: FunctionDef):
+        if self.per_function:
+            self.temp_count = 0
+            self.label_count = 0
+            self.label_prefix = f"{func.name}."
+        self.emit(TACInstruction('label', result=func.name))
+        self.gen_entry(func)
+        self.symbol_stack.push(SymbolTable(f'function {func.name}', self.symbol_stack.top()))
+        self.frame_size = 0
+        for param in func.params:
+            self.declare(Symbol(param.name, param.var_type, 'parameter'))
+        self.current_function_return_type = func.return_type
+        self.fuse_block(func.body)
+        self.symbol_stack.pop()
+
+    def fuse_block(self, block: Block):
+        stack = self.symbol_stack
+        stack.push(SymbolTable('block', stack.top()))
+        handlers = self.stmt_handlers
+        for stmt in block.statements:
+            handler = handlers.get(type(stmt))
+            if handler is None:
+                self.error(f"Unknown statement type: {type(stmt)}")
+            else:
+                handler(stmt)
+        stack.pop()
+
+    def fuse_vardecl(self, decl: VariableDecl):
+        self.declare(Symbol(decl.name, decl.var_type, 'variable'))
+        if decl.initializer:
+            init_type, temp = self.fuse_expr(decl.initializer)
+            if init_type and init_type != decl.var_type:
+                self.error(f"Type mismatch in initialization of {decl.name}: {decl.var_type} = {init_type}")
+            self.emit(TACInstruction('=', temp, None, decl.name))
+
+    def fuse_assignment(self, assign: Assignment):
+        target = assign.target
+        sym = self.symbol_stack.lookup(target.name)
+        target.symbol = sym
+        if not sym:
+            self.error(f"Undeclared variable: {target.name}")
+            value_type, temp = self.fuse_unchecked(assign.value)
+        else:
+            value_type, temp = self.fuse_expr(assign.value)
+            if value_type and value_type != sym.type:
+                self.error(f"Type mismatch in assignment to {target.name}: {sym.type} = {value_type}")
+        self.emit(TACInstruction('=', temp, None, target.name))
+
+    def fuse_if(self, ifstmt: If):
+        cond_type, cond_temp = self.fuse_expr(ifstmt.condition)
+        if cond_type and cond_type != 'bool':
+            self.error(f"Condition in if must be bool, got {cond_type}")
+        else_label = self.new_label()
+        end_label = self.new_label() if ifstmt.else_block else None
+        self.emit(TACInstruction('ifz', cond_temp, None, else_label))
+        self.fuse_block(ifstmt.then_block)
+        if ifstmt.else_block:
+            self.emit(TACInstruction('goto', end_label))
+            self.emit(TACInstruction('label', result=else_label))
+            self.fuse_block(ifstmt.else_block)
+            self.emit(TACInstruction('label', result=end_label))
+        else:
+            self.emit(TACInstruction('label', result=else_label))
+
+    def fuse_while(self, whilestmt: While):
+        start_label = self.new_label()
+        end_label = self.new_label()
+        self.emit(TACInstruction('label', result=start_label))
+        cond_type, cond_temp = self.fuse_expr(whilestmt.condition)
+        if cond_type and cond_type != 'bool':
+            self.error(f"Condition in while must be bool, got {cond_type}")
+        self.emit(TACInstruction('ifz', cond_temp, None, end_label))
+        self.fuse_block(whilestmt.body)
+        self.emit(TACInstruction('goto', start_label))
+        self.emit(TACInstruction('label', result=end_label))
+
+    def fuse_return(self, ret: Return):
+        if ret.value:
+            value_type, temp = self.fuse_expr(ret.value)
+            if value_type and value_type != self.current_function_return_type:
+                self.error(f"Return type mismatch: expected {self.current_function_return_type}, got {value_type}")
+            if self.is_tail_call(ret):
+                self.gen_tail_jump()
+            else:
+                self.emit(TACInstruction('return', temp))
+        else:
+            if self.current_function_return_type != 'void':
+                self.error(f"Return statement missing value for function returning {self.current_function_return_type}")
+            self.emit(TACInstruction('return'))
+
+    def fuse_funccall(self, call: FunctionCall) -> Tuple[Optional[str], str]:
+        sym = self.symbol_stack.lookup(call.name)
+        if not sym or sym.kind != 'function':
+            call.symbol = None
+            self.error(f"Undeclared function: {call.name}")
+            arg_temps = [self.fuse_unchecked(arg)[1] for arg in call.args]
+            result_type = None
+        else:
+            call.symbol = sym
+            param_types = sym.info
+            if len(param_types) != len(call.args):
+                self.error(f"Function {call.name} expects {len(param_types)} args, got {len(call.args)}")
+            arg_temps = []
+            for index, arg in enumerate(call.args):
+                if index >= len(param_types):
+                    arg_temps.append(self.fuse_unchecked(arg)[1])
+                    continue
+                arg_type, temp = self.fuse_expr(arg)
+                expected_type = param_types[index][0]
+                if arg_type and arg_type != expected_type:
+                    self.error(f"Function {call.name} argument type mismatch: expected {expected_type}, got {arg_type}")
+                arg_temps.append(temp)
+            result_type = sym.type
+        for temp in arg_temps:
+            self.emit(TACInstruction('param', temp))
+        result_temp = self.new_temp()
+        self.emit(TACInstruction('call', call.name, len(arg_temps), result_temp))
+        return result_type, result_temp
+
+    def fuse_expr(self, expr: Expression) -> Tuple[Optional[str], str]:
+        cls = type(expr)
+        # Leaves are handled inline: they are most of the nodes
+        if cls is Identifier:
+            sym = self.symbol_stack.lookup(expr.name)
+            expr.symbol = sym
+            if sym is None:
+                self.error(f"Undeclared identifier: {expr.name}")
+                return None, expr.name
+            return sym.type, expr.name
+        if cls is Literal:
+            return expr.typ, str(expr.value).lower() if expr.typ == 'bool' else str(expr.value)
+        return self.expr_handlers[cls](expr)
+
+    def fuse_unchecked(self, expr: Expression) -> Tuple[Optional[str], str]:
+        # Lower a subtree the analyzer would skip, without reporting its errors
+        checking = self.checking
+        self.checking = False
+        try:
+            return self.fuse_expr(expr)
+        finally:
+            self.checking = checking
+
+    def fuse_literal(self, expr: Literal) -> Tuple[Optional[str], str]:
+        return expr.typ, str(expr.value).lower() if expr.typ == 'bool' else str(expr.value)
+
+    def fuse_identifier(self, expr: Identifier) -> Tuple[Optional[str], str]:
+        sym = self.symbol_stack.lookup(expr.name)
+        expr.symbol = sym
+        if not sym:
+            self.error(f"Undeclared identifier: {expr.name}")
+            return None, expr.name
+        return sym.type, expr.name
+
+    def fuse_binary(self, expr: BinaryOp) -> Tuple[Optional[str], str]:
+        left, left_temp = self.fuse_expr(expr.left)
+        right, right_temp = self.fuse_expr(expr.right)
+        op = expr.op
+        temp = self.gen_binary(op, left_temp, right_temp)
+        kind = OPERATOR_KINDS.get(op)
+        if kind == 'arith':
+            if left != right or left not in ('int', 'float'):
+                self.error(f"Type error in binary op {op}: {left} {op} {right}")
+                return None, temp
+            return left, temp
+        elif kind == 'compare':
+            if left != right:
+                self.error(f"Type error in comparison: {left} {op} {right}")
+            return 'bool', temp
+        elif kind == 'logic':
+            if left != 'bool' or right != 'bool':
+                self.error(f"Logical op {op} requires bool operands, got {left}, {right}")
+            return 'bool', temp
+        return None, temp
+
+    def fuse_unary(self, expr: UnaryOp) -> Tuple[Optional[str], str]:
+        operand, operand_temp = self.fuse_expr(expr.operand)
+        temp = self.new_temp()
+        self.emit(TACInstruction(expr.op, operand_temp, None, temp))
+        if expr.op == '-' and operand in ('int', 'float'):
+            return operand, temp
+        elif expr.op == '!' and operand == 'bool':
+            return 'bool', temp
+        self.error(f"Unary op {expr.op} type error: got {operand}")
+        return None, temp
+
+if __name__ == "__main__":
+    from parser import Parser
+    from lexer import Lexer
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    ast = Parser(Lexer(code).tokenize()).parse()
+    errors, tac = FusedCompiler().compile(ast)
+    for err in errors:
+        print(err)
+    for instr in tac:
+        print(instr)
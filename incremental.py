@@ -0,0 +1,254 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Set, Tuple
+
+from lexer import Lexer
+from minilang_ast import FunctionDef, Program
+from parser import Parser
+from semantic import SemanticAnalyzer
+from symbol_table import Symbol, SymbolTable, SymbolTableStack
+from tac import TACGenerator, TACInstruction
+
+# Characters that can never be part of a token together with a neighbour
+BOUNDARY_CHARS = frozenset(' \t\n;{}(),')
+
+class FunctionUnit:
+    """One top-level parse attempt and the source text it owns.
+
+    Units tile the source: each runs from its first token to the next unit's
+    first token (the first unit starts at offset 0), so every character,
+    including whitespace and stray text, belongs to exactly one unit.
+    """
+    __slots__ = ('start', 'end', 'line', 'func', 'lexical_errors', 'syntax_errors',
+                 'semantic_errors', 'names', 'tac')
+
+    def __init__(self, start: int, line: int, func: Optional[FunctionDef]):
+        self.start = start
+        self.end = start
+        self.line = line
+        self.func = func
+        self.lexical_errors: List[str] = []
+        self.syntax_errors: List[str] = []
+        self.semantic_errors: List[str] = []
+        self.names: Set[str] = set()
+        self.tac: List[TACInstruction] = []
+
+    @property
+    def clean(self) -> bool:
+        return self.func is not None and not self.syntax_errors
+
+class _RecordingStack(SymbolTableStack):
+    # Remembers every name a function body looks up, i.e. what its analysis depends on
+    def __init__(self):
+        super().__init__()
+        self.names: Set[str] = set()
+    def lookup(self, name: str) -> Optional[Symbol]:
+        self.names.add(name)
+        return super().lookup(name)
+
+class CompilationSession:
+    """Keeps a file compiled across edits, redoing only the affected functions.
+
+    An edit relexes and reparses the top-level functions it touches (widened
+    until the parser is back in step with the untouched text), rechecks those
+    functions plus any function that looks up a name whose global signature
+    changed, and regenerates TAC for the reparsed functions only. Results match
+    compiling the edited source from scratch, with TAC in per-function
+    numbering (TACGenerator(per_function=True)).
+    """
+    def __init__(self, source: str):
+        self.source = source
+        self.units: List[FunctionUnit] = []
+        self.global_table = SymbolTable('global')
+        # Shared by every function's analysis, with only the global table left open between them
+        self.symbol_stack = _RecordingStack()
+        # Function name -> units defining it, in source order (more than one is a redeclaration)
+        self.definitions: Dict[str, List[FunctionUnit]] = {}
+        # Name -> units whose analysis looked it up
+        self.dependents: Dict[str, Set[FunctionUnit]] = {}
+        self.rebuild()
+
+    def rebuild(self):
+        self.units = []
+        self.global_table = SymbolTable('global')
+        self.symbol_stack = _RecordingStack()
+        self.symbol_stack.push(self.global_table)
+        self.definitions = {}
+        self.dependents = {}
+        new_units = self._parse_region(0, len(self.source), 1)
+        self._replace_units(0, 0, new_units)
+        for unit in new_units:
+            self._analyze(unit)
+            self._lower(unit)
+
+    def apply_edit(self, start: int, end: int, text: str) -> Tuple[int, int]:
+        # Replace source[start:end] with text; returns (functions reparsed, functions rechecked)
+        old_source = self.source
+        self.source = old_source[:start] + text + old_source[end:]
+        delta = len(self.source) - len(old_source)
+        line_delta = text.count('\n') - old_source.count('\n', start, end)
+        units = self.units
+        if not units:
+            self.rebuild()
+            return len(self.units), len(self.units)
+        # Units whose span touches the edit, inclusive of shared boundaries
+        i = min(bisect_left(units, start, key=lambda u: u.end), len(units) - 1)
+        j = max(bisect_right(units, end, key=lambda u: u.start) - 1, i)
+        # A failed unit's recovery looks ahead into whatever follows it
+        while i > 0 and not units[i - 1].clean:
+            i -= 1
+        while i > 0 and not self._is_boundary(units[i].start):
+            i -= 1
+        for unit in units[j + 1:]:
+            unit.start += delta
+            unit.end += delta
+            unit.line += line_delta
+        units[j].end += delta
+        # Error messages after the edit embed line numbers; recompute them if lines moved
+        if line_delta:
+            for k in range(len(units) - 1, j, -1):
+                if units[k].lexical_errors or units[k].syntax_errors:
+                    j = k
+                    break
+        while True:
+            while j + 1 < len(units) and not self._is_boundary(units[j].end):
+                j += 1
+            region_end = units[j].end
+            new_units = self._parse_region(units[i].start, region_end, units[i].line)
+            # The parser must finish the region exactly where the old units resume
+            if region_end == len(self.source) or (new_units and new_units[-1].clean):
+                break
+            j += 1
+        changed = self._replace_units(i, j + 1, new_units)
+        rechecked = set(new_units)
+        for name in changed:
+            rechecked.update(self.dependents.get(name, ()))
+        for unit in rechecked:
+            self._analyze(unit)
+        for unit in new_units:
+            self._lower(unit)
+        return len(new_units), len(rechecked)
+
+    @property
+    def program(self) -> Program:
+        return Program([u.func for u in self.units if u.func is not None])
+
+    @property
+    def lexical_errors(self) -> List[str]:
+        return [e for u in self.units for e in u.lexical_errors]
+
+    @property
+    def syntax_errors(self) -> List[str]:
+        return [e for u in self.units for e in u.syntax_errors]
+
+    @property
+    def global_errors(self) -> List[str]:
+        return [f"Function redeclaration: {u.func.name}" for u in self.units
+                if u.func is not None and self.definitions[u.func.name][0] is not u]
+
+    @property
+    def semantic_errors(self) -> List[str]:
+        return self.global_errors + [e for u in self.units for e in u.semantic_errors]
+
+    @property
+    def errors(self) -> List[str]:
+        return self.lexical_errors + self.syntax_errors + self.semantic_errors
+
+    @property
+    def tac(self) -> List[TACInstruction]:
+        return [instr for u in self.units for instr in u.tac]
+
+    def _is_boundary(self, offset: int) -> bool:
+        source = self.source
+        return (offset <= 0 or offset >= len(source)
+                or source[offset - 1] in BOUNDARY_CHARS or source[offset] in BOUNDARY_CHARS)
+
+    def _parse_region(self, start: int, end: int, line: int) -> List[FunctionUnit]:
+        column = start - (self.source.rfind('\n', 0, start) + 1) + 1
+        lexer = Lexer(self.source[start:end], line, column)
+        stream = lexer.tokenize_compact()
+        parser = Parser(stream)
+        parser.parse()
+        units = []
+        for k, (first, _, func, _) in enumerate(parser.spans):
+            if k == 0:
+                units.append(FunctionUnit(start, line, func))
+            else:
+                units.append(FunctionUnit(start + stream.starts[first], stream.lines[first], func))
+        if not units:
+            units.append(FunctionUnit(start, line, None))
+        for k, unit in enumerate(units):
+            unit.end = units[k + 1].start if k + 1 < len(units) else end
+        for k, (_, _, _, first_error) in enumerate(parser.spans):
+            last_error = parser.spans[k + 1][3] if k + 1 < len(parser.spans) else len(parser.errors)
+            units[k].syntax_errors = parser.errors[first_error:last_error]
+        starts = [u.start for u in units]
+        for err, offset in zip(lexer.errors, lexer.error_offsets):
+            units[bisect_right(starts, start + offset) - 1].lexical_errors.append(err)
+        return units
+
+    def _replace_units(self, i: int, j: int, new_units: List[FunctionUnit]) -> Set[str]:
+        # Swap units[i:j] for new_units; returns the names whose global signature changed
+        old_units = self.units[i:j]
+        self.units[i:j] = new_units
+        touched = set()
+        for unit in old_units:
+            self._forget(unit)
+            if unit.func is not None:
+                self.definitions[unit.func.name].remove(unit)
+                touched.add(unit.func.name)
+        for unit in new_units:
+            if unit.func is not None:
+                defs = self.definitions.setdefault(unit.func.name, [])
+                defs.insert(bisect_right(defs, unit.start, key=lambda u: u.start), unit)
+                touched.add(unit.func.name)
+        changed = set()
+        table = self.global_table.symbols
+        # The global table stays open on symbol_stack, so its bindings change with it
+        bindings = self.symbol_stack.bindings
+        for name in touched:
+            defs = self.definitions.get(name)
+            old = table.get(name)
+            if not defs:
+                self.definitions.pop(name, None)
+                if old is not None:
+                    del table[name]
+                    del bindings[name]
+                    changed.add(name)
+                continue
+            func = defs[0].func
+            params = [(p.var_type, p.name) for p in func.params]
+            if old is None or old.type != func.return_type or old.info != params:
+                sym = table[name] = Symbol(name, func.return_type, 'function', params)
+                bindings[name] = [sym]
+                changed.add(name)
+        return changed
+
+    def _forget(self, unit: FunctionUnit):
+        for name in unit.names:
+            users = self.dependents.get(name)
+            if users is not None:
+                users.discard(unit)
+        unit.names = set()
+
+    def _analyze(self, unit: FunctionUnit):
+        self._forget(unit)
+        unit.semantic_errors = []
+        if unit.func is None:
+            return
+        analyzer = SemanticAnalyzer()
+        analyzer.symbol_stack = stack = self.symbol_stack
+        analyzer.global_table = self.global_table
+        stack.names = set()
+        analyzer.analyze_function(unit.func)
+        unit.semantic_errors = analyzer.errors
+        unit.names = stack.names
+        for name in unit.names:
+            self.dependents.setdefault(name, set()).add(unit)
+
+    def _lower(self, unit: FunctionUnit):
+        if unit.func is None:
+            unit.tac = []
+            return
+        tacgen = TACGenerator(per_function=True)
+        tacgen.gen_function(unit.func)
+        unit.tac = tacgen.instructions
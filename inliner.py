@@ -0,0 +1,150 @@
+from typing import Dict, List, Optional
+
+from callgraph import CallGraph
+from cfg import ControlFlowGraph, is_name, jump_target, split_functions
+from minilang_ast import Program
+from tac import TACInstruction
+from tac_buffer import TEMP_RE
+
+def body_size(body: List[TACInstruction]) -> int:
+    return sum(1 for instr in body if instr.op != 'label')
+
+class Inliner:
+    """Replaces calls to small, non-recursive functions with a renamed copy of their TAC.
+
+    Functions are processed callees first, so a callee's body already has its
+    own calls inlined. A call site is inlined when the callee has at most
+    ``max_callee_size`` instructions and the caller is still under
+    ``max_caller_size``. Inside the copy, the callee's temps get fresh numbers
+    in the caller, its variables and parameters become ``name.N`` and its
+    labels ``label.N``, N being unique per inlined site. Each ``return x``
+    becomes a copy into the call's result and a jump past the copy.
+    """
+    def __init__(self, max_callee_size: int = 24, max_caller_size: int = 2000):
+        self.max_callee_size = max_callee_size
+        self.max_caller_size = max_caller_size
+        self.sites = 0
+        self.inlined = 0
+        self.recursive = 0
+        self.too_large = 0
+
+    def run(self, instructions: List[TACInstruction], program: Program) -> List[TACInstruction]:
+        graph = CallGraph(program)
+        params = {func.name: [param.name for param in func.params] for func in program.functions}
+        bodies: Dict[str, List[TACInstruction]] = {}
+        order: List[str] = []
+        for body in split_functions(list(instructions)):
+            name = body[0].result
+            order.append(name)
+            bodies[name] = body
+        for name in graph.bottom_up():
+            if name in bodies:
+                bodies[name] = self.inline_calls(name, bodies, graph, params)
+        return [instr for name in order for instr in bodies[name]]
+
+    def inlinable(self, callee: str, bodies: Dict[str, List[TACInstruction]], graph: CallGraph) -> Optional[list]:
+        # The callee's reachable code, or None when it can't or shouldn't be inlined
+        if callee not in bodies or callee not in graph.component_of:
+            return None
+        if graph.is_recursive(callee):
+            self.recursive += 1
+            return None
+        cfg = ControlFlowGraph(bodies[callee])
+        cfg.remove_unreachable()
+        for block in cfg.blocks:
+            if not block.succs and (block.terminator is None or block.terminator.op != 'return'):
+                # Falls off the end without a value; keep the real call
+                return None
+        body = cfg.instructions()[1:]
+        if body_size(body) > self.max_callee_size:
+            self.too_large += 1
+            return None
+        return body
+
+    def inline_calls(self, name: str, bodies: Dict[str, List[TACInstruction]], graph: CallGraph,
+                     params: Dict[str, List[str]]) -> List[TACInstruction]:
+        body = bodies[name]
+        next_temp = 1 + max((int(operand[1:]) for instr in body for operand in (instr.arg1, instr.arg2, instr.result)
+                             if isinstance(operand, str) and TEMP_RE.fullmatch(operand)), default=0)
+        out: List[TACInstruction] = []
+        size = body_size(body)
+        for instr in body:
+            if instr.op != 'call' or instr.arg1 == name:
+                out.append(instr)
+                continue
+            self.sites += 1
+            count = instr.arg2
+            pushed = out[len(out) - count:] if count else []
+            callee_params = params.get(instr.arg1, [])
+            if (size > self.max_caller_size or len(callee_params) != count
+                    or any(arg.op != 'param' for arg in pushed)):
+                out.append(instr)
+                continue
+            callee_body = self.inlinable(instr.arg1, bodies, graph)
+            if callee_body is None:
+                out.append(instr)
+                continue
+            if count:
+                del out[len(out) - count:]
+            self.inlined += 1
+            suffix = f".{self.inlined}"
+            temps: Dict[str, str] = {}
+
+            def rename(operand):
+                if not is_name(operand):
+                    return operand
+                if TEMP_RE.fullmatch(operand):
+                    if operand not in temps:
+                        nonlocal next_temp
+                        temps[operand] = f"t{next_temp}"
+                        next_temp += 1
+                    return temps[operand]
+                return operand + suffix
+
+            copy = [TACInstruction('=', arg.arg1, None, param + suffix)
+                    for param, arg in zip(callee_params, pushed)]
+            end_label = f"{name}.inline{suffix}"
+            # Removing unreachable code can leave labels nothing jumps to, which would split the caller
+            targets = {jump_target(callee_instr) for callee_instr in callee_body}
+            for callee_instr in callee_body:
+                op = callee_instr.op
+                if op == 'label':
+                    if callee_instr.result in targets:
+                        copy.append(TACInstruction('label', result=callee_instr.result + suffix))
+                elif op == 'goto':
+                    copy.append(TACInstruction('goto', callee_instr.arg1 + suffix))
+                elif op in ('ifz', 'ifnz'):
+                    copy.append(TACInstruction(op, rename(callee_instr.arg1), None, callee_instr.result + suffix))
+                elif op == 'call':
+                    copy.append(TACInstruction('call', callee_instr.arg1, callee_instr.arg2,
+                                               rename(callee_instr.result)))
+                elif op == 'return':
+                    if callee_instr.arg1 is not None:
+                        copy.append(TACInstruction('=', rename(callee_instr.arg1), None, instr.result))
+                    copy.append(TACInstruction('goto', end_label))
+                else:
+                    copy.append(TACInstruction(op, rename(callee_instr.arg1), rename(callee_instr.arg2),
+                                               rename(callee_instr.result)))
+            if copy[-1].op == 'goto' and copy[-1].arg1 == end_label:
+                copy.pop()
+            if any(i.op == 'goto' and i.arg1 == end_label for i in copy):
+                copy.append(TACInstruction('label', result=end_label))
+            out.extend(copy)
+            size += body_size(copy) - count - 1
+        return out
+
+    def report(self) -> str:
+        return (f"{self.inlined} of {self.sites} call site(s) inlined "
+                f"({self.recursive} recursive, {self.too_large} too large)")
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    program = Parser(Lexer(code).tokenize()).parse()
+    inliner = Inliner()
+    for instr in inliner.run(TACGenerator().generate(program), program):
+        print(instr)
+    print(f"\n{inliner.report()}")
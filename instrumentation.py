@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from minilang_ast import Program, iter_nodes
+from tac import TACInstruction
+from tac_buffer import TEMP_RE
+
+# observer(event, name, value): ('start', span name, None), ('end', span name, duration in ns)
+# or ('count', counter name, new total)
+Observer = Callable[[str, str, object], None]
+
+class Span:
+    __slots__ = ('name', 'depth', 'start_ns', 'end_ns')
+
+    def __init__(self, name: str, depth: int, start_ns: int):
+        self.name = name
+        self.depth = depth
+        self.start_ns = start_ns
+        self.end_ns: Optional[int] = None
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns if self.end_ns is not None else perf_counter_ns()) - self.start_ns
+
+    def __repr__(self):
+        return f"Span({self.name!r}, {self.duration_ns} ns)"
+
+class Metrics:
+    """Timing spans and counters for one compilation, with observers and export.
+
+    Spans come from ``with metrics.span(name):`` and nest; each records its
+    depth and perf_counter_ns start and end. Counters are plain named ints.
+    Observers are called synchronously as spans start and end and counters
+    change, so they should be cheap. ``to_json``/``to_csv`` give the whole
+    record for scraping; ``seconds(name)`` totals the spans with that name.
+    """
+    def __init__(self, per_function: bool = False):
+        self.per_function = per_function
+        self.spans: List[Span] = []
+        self.counters: Dict[str, int] = {}
+        self.observers: List[Observer] = []
+        self.depth = 0
+
+    def observe(self, observer: Observer):
+        self.observers.append(observer)
+
+    def notify(self, event: str, name: str, value):
+        for observer in self.observers:
+            observer(event, name, value)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        span = Span(name, self.depth, perf_counter_ns())
+        self.spans.append(span)
+        self.depth += 1
+        if self.observers:
+            self.notify('start', name, None)
+        try:
+            yield span
+        finally:
+            span.end_ns = perf_counter_ns()
+            self.depth -= 1
+            if self.observers:
+                self.notify('end', name, span.end_ns - span.start_ns)
+
+    def count(self, name: str, amount: int = 1):
+        total = self.counters[name] = self.counters.get(name, 0) + amount
+        if self.observers:
+            self.notify('count', name, total)
+
+    def seconds(self, name: str) -> float:
+        return sum(span.duration_ns for span in self.spans if span.name == name) / 1e9
+
+    def count_tokens(self, tokens: Sequence):
+        self.count('tokens', len(tokens))
+
+    def count_ast(self, program: Program):
+        # Nodes by class, plus the scopes and symbols semantic analysis will create for them:
+        # the global scope, one per function and one per block; one symbol per function,
+        # parameter and declaration
+        by_class: Dict[str, int] = {}
+        for node in iter_nodes(program):
+            name = type(node).__name__
+            by_class[name] = by_class.get(name, 0) + 1
+        self.count('ast.nodes', sum(by_class.values()))
+        for name in sorted(by_class):
+            self.count(f"ast.{name}", by_class[name])
+        functions = by_class.get('FunctionDef', 0)
+        self.count('scopes', 1 + functions + by_class.get('Block', 0))
+        self.count('symbols', functions + by_class.get('VariableDecl', 0))
+
+    def count_tac(self, tac: List[TACInstruction], prefix: str = 'tac'):
+        temps = set()
+        labels = 0
+        for instr in tac:
+            if instr.op == 'label':
+                labels += 1
+            elif isinstance(instr.result, str) and TEMP_RE.fullmatch(instr.result):
+                temps.add(instr.result)
+        self.count(f"{prefix}.instructions", len(tac))
+        self.count(f"{prefix}.temps", len(temps))
+        self.count(f"{prefix}.labels", labels)
+
+    def count_errors(self, lexical: Sequence, syntax: Sequence, semantic: Sequence):
+        self.count('errors.lexical', len(lexical))
+        self.count('errors.syntax', len(syntax))
+        self.count('errors.semantic', len(semantic))
+
+    def to_dict(self) -> dict:
+        return {
+            'spans': [{'name': span.name, 'depth': span.depth, 'start_ns': span.start_ns,
+                       'duration_ns': span.duration_ns} for span in self.spans],
+            'counters': dict(self.counters),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_csv(self) -> str:
+        # One row per span (value in ns) and per counter
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(['kind', 'name', 'depth', 'value'])
+        for span in self.spans:
+            writer.writerow(['span', span.name, span.depth, span.duration_ns])
+        for name, value in self.counters.items():
+            writer.writerow(['counter', name, '', value])
+        return out.getvalue()
+
+    def write(self, path: str):
+        # CSV for a .csv path, JSON otherwise
+        with open(path, 'w', newline='') as f:
+            f.write(self.to_csv() if path.endswith('.csv') else self.to_json() + '\n')
+
+    def report(self) -> str:
+        lines = [f"{'  ' * span.depth}{span.name}: {span.duration_ns / 1e6:.3f} ms" for span in self.spans]
+        lines.extend(f"{name} = {value}" for name, value in self.counters.items())
+        return '\n'.join(lines)
+
+if __name__ == "__main__":
+    from pipeline import compile_source
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    metrics = Metrics(per_function=True)
+    compile_source(code, optimize=True, metrics=metrics)
+    print(metrics.report())
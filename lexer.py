@@ -1,5 +1,6 @@
 import re
-from typing import List, Tuple, Optional
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 # Token specification for MiniLang++
 TOKEN_SPECIFICATION = [
@@ -51,6 +52,13 @@ TOKEN_SPECIFICATION = [
 TOK_REGEX = '|'.join('(?P<%s>%s)' % pair for pair in TOKEN_SPECIFICATION)
 get_token = re.compile(TOK_REGEX).match
 
+# Integer token kinds, numbered in TOKEN_SPECIFICATION order
+TOKEN_NAMES = [name for name, _ in TOKEN_SPECIFICATION]
+TOKEN_KINDS = {name: kind for kind, name in enumerate(TOKEN_NAMES)}
+
+# Longest lookahead any token needs past its own end ('12' must see '.5' to know it is not '12.5')
+LOOKAHEAD = 2
+
 class Token:
     def __init__(self, type_: str, value: str, line: int, column: int):
         self.type = type_
@@ -60,27 +68,144 @@ class Token:
     def __repr__(self):
         return f"Token({self.type}, {self.value!r}, line={self.line}, col={self.column})"
 
+class TokenStream:
+    """Column-oriented token storage: parallel arrays indexed by token number.
+
+    Token text is sliced from ``source`` on demand and identifier spellings
+    are interned, so a stream costs a few bytes per token instead of a
+    ``Token`` object plus its substring.
+    """
+    def __init__(self, source: str = ''):
+        self.source = source
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.identifiers: Dict[str, str] = {}
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token]) -> 'TokenStream':
+        # Without the original source, offsets index the concatenated token values
+        stream = cls()
+        values = []
+        offset = 0
+        for tok in tokens:
+            end = offset + len(tok.value)
+            stream.append(TOKEN_KINDS[tok.type], offset, end, tok.line, tok.column)
+            if tok.type == 'ID':
+                stream.identifiers.setdefault(tok.value, tok.value)
+            values.append(tok.value)
+            offset = end
+        stream.source = ''.join(values)
+        return stream
+
+    def append(self, kind: int, start: int, end: int, line: int, column: int):
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def text(self, i: int) -> str:
+        return self.source[self.starts[i]:self.ends[i]]
+
+    def identifier(self, i: int) -> str:
+        name = self.text(i)
+        return self.identifiers.setdefault(name, name)
+
+    def token(self, i: int) -> Token:
+        return Token(TOKEN_NAMES[self.kinds[i]], self.text(i), self.lines[i], self.columns[i])
+
+    def __iter__(self) -> Iterator[Token]:
+        for i in range(len(self.kinds)):
+            yield self.token(i)
+
 class Lexer:
-    def __init__(self, code: str):
+    def __init__(self, code: str = '', line: int = 1, column: int = 1):
+        # line/column: position of the first character, when lexing a slice of a larger file
         self.code = code
         self.tokens: List[Token] = []
         self.errors: List[str] = []
+        self.error_offsets: List[int] = []
+        # Incremental (feed/finish) state: unscanned text and the position of its first char
+        self._buffer = ''
+        self._offset = 0
+        self._line_num = line
+        self._line_start = 1 - column
 
     def tokenize(self) -> List[Token]:
-        line_num = 1
-        line_start = 0
+        self._buffer = self.code
+        for typ, val, line, col, _ in self._scan(final=True):
+            self.tokens.append(Token(typ, val, line, col))
+        return self.tokens
+
+    def tokenize_compact(self) -> TokenStream:
+        stream = TokenStream(self.code)
+        kind_of = TOKEN_KINDS
+        identifiers = stream.identifiers
+        add_kind, add_start, add_end = stream.kinds.append, stream.starts.append, stream.ends.append
+        add_line, add_column = stream.lines.append, stream.columns.append
+        self._buffer = self.code
+        for typ, val, line, col, start in self._scan(final=True):
+            add_kind(kind_of[typ])
+            add_start(start)
+            add_end(start + len(val))
+            add_line(line)
+            add_column(col)
+            if typ == 'ID':
+                identifiers.setdefault(val, val)
+        return stream
+
+    def feed(self, chunk: str) -> List[Token]:
+        # Tokens that could still grow with the next chunk stay buffered. The chunk is scanned
+        # here rather than lazily, so the lexer's state is saved before the next feed
+        self._buffer += chunk
+        return self._tokens(final=False)
+
+    def finish(self) -> List[Token]:
+        return self._tokens(final=True)
+
+    def tokenize_stream(self, stream: TextIO, chunk_size: int = 65536) -> Iterator[Token]:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield from self.feed(chunk)
+        yield from self.finish()
+
+    def _tokens(self, final: bool) -> List[Token]:
+        return [Token(typ, val, line, col) for typ, val, line, col, _ in self._scan(final)]
+
+    def _scan(self, final: bool) -> Iterator[Tuple[str, str, int, int, int]]:
+        # Yields (type, value, line, column, absolute offset) for each real token
+        code = self._buffer
+        offset = self._offset
+        line_num = self._line_num
+        line_start = self._line_start
         pos = 0
-        code_len = len(self.code)
+        code_len = len(code)
+        # Without the final chunk, a match needs LOOKAHEAD chars after it to be certain
+        limit = code_len if final else code_len - LOOKAHEAD
         while pos < code_len:
-            mo = get_token(self.code, pos)
+            mo = get_token(code, pos)
             if mo is None:
+                if not final and pos >= limit:
+                    break
                 col = pos - line_start + 1
-                self.errors.append(f"Invalid token {self.code[pos]!r} at line {line_num}, column {col}")
+                self.errors.append(f"Invalid token {code[pos]!r} at line {line_num}, column {col}")
+                self.error_offsets.append(offset + pos)
                 pos += 1
                 continue
+            if not final and mo.end() > limit:
+                break
             if mo.end() == pos:
                 # Defensive: avoid infinite loop if regex matches empty string
-                self.errors.append(f"Lexer stuck at position {pos}, char {self.code[pos]!r}")
+                self.errors.append(f"Lexer stuck at position {pos}, char {code[pos]!r}")
+                self.error_offsets.append(offset + pos)
                 pos += 1
                 continue
             typ = mo.lastgroup
@@ -93,11 +218,15 @@ class Lexer:
             elif typ == 'MISMATCH':
                 col = mo.start() - line_start + 1
                 self.errors.append(f"Invalid token {val!r} at line {line_num}, column {col}")
+                self.error_offsets.append(offset + pos)
             else:
                 col = mo.start() - line_start + 1
-                self.tokens.append(Token(typ, val, line_num, col))
+                yield typ, val, line_num, col, offset + pos
             pos = mo.end()
-        return self.tokens
+        self._buffer = code[pos:]
+        self._offset = offset + pos
+        self._line_num = line_num
+        self._line_start = line_start - pos
 
     def print_tokens(self):
         for token in self.tokens:
@@ -0,0 +1,269 @@
+from typing import Dict, List, Optional, Set
+
+from cfg import BasicBlock, ControlFlowGraph, defines, jump_target, split_functions, uses
+from dataflow import Liveness
+from lvn import removable
+from tac import TACInstruction, format_constant, parse_constant
+
+def is_int(operand) -> bool:
+    return isinstance(operand, str) and type(parse_constant(operand)) is int
+
+class Loop:
+    # A natural loop: the header plus every block that reaches a back edge without passing it
+    __slots__ = ('header', 'blocks', 'latches')
+
+    def __init__(self, header: BasicBlock):
+        self.header = header
+        self.blocks: Set[BasicBlock] = {header}
+        self.latches: List[BasicBlock] = []
+
+    def __repr__(self):
+        return f"Loop({self.header.label!r}, {sorted(block.index for block in self.blocks)})"
+
+class DominatorTree:
+    # Dominance checks in constant time, from entry/exit numbers of a walk over the dominator tree
+    def __init__(self, cfg: ControlFlowGraph, idom: List[Optional[BasicBlock]]):
+        children: List[List[BasicBlock]] = [[] for _ in cfg.blocks]
+        for block in cfg.blocks:
+            parent = idom[block.index]
+            if parent is not None:
+                children[parent.index].append(block)
+        self.enter = [0] * len(cfg.blocks)
+        self.exit = [0] * len(cfg.blocks)
+        clock = 0
+        stack = [(cfg.entry, False)]
+        while stack:
+            block, done = stack.pop()
+            clock += 1
+            if done:
+                self.exit[block.index] = clock
+                continue
+            self.enter[block.index] = clock
+            stack.append((block, True))
+            stack.extend((child, False) for child in children[block.index])
+
+    def dominates(self, a: BasicBlock, b: BasicBlock) -> bool:
+        return self.enter[a.index] <= self.enter[b.index] and self.exit[b.index] <= self.exit[a.index]
+
+def find_loops(cfg: ControlFlowGraph, tree: DominatorTree) -> List[Loop]:
+    # Back edges are edges into a dominator; loops sharing a header are merged. Innermost first
+    loops: Dict[int, Loop] = {}
+    for block in cfg.blocks:
+        for succ in block.succs:
+            if not tree.dominates(succ, block):
+                continue
+            loop = loops.get(succ.index)
+            if loop is None:
+                loop = loops[succ.index] = Loop(succ)
+            loop.latches.append(block)
+            stack = [block]
+            while stack:
+                member = stack.pop()
+                if member not in loop.blocks:
+                    loop.blocks.add(member)
+                    stack.extend(member.preds)
+    return sorted(loops.values(), key=lambda loop: len(loop.blocks))
+
+class LoopOptimizer:
+    """Loop-invariant code motion and strength reduction on each function's natural loops.
+
+    Loops are handled innermost first. A pure, non-trapping instruction whose
+    operands don't change in the loop moves to a preheader, a new block
+    labelled ``<header>.pre`` if jumped to, that every entry from outside the loop goes
+    through, provided its result is assigned nowhere else in the loop, isn't
+    live on entry to the header, and is either dead on the exits or computed
+    on every path to them. Code hoisted out of an inner loop is a candidate
+    for the enclosing one.
+
+    With ``strength_reduction``, a variable ``i`` whose only update in the
+    loop adds an int constant ``c`` gets a companion ``i.srN`` holding
+    ``i * k`` for each int constant k it's multiplied by: set in the
+    preheader, bumped by ``c * k`` right after each update of ``i``, and
+    copied where the product was computed. The type checker only lets an int
+    be added to an int, so the companion's sums are exact.
+    """
+    def __init__(self, strength_reduction: bool = True):
+        self.strength_reduction = strength_reduction
+        self.loops = 0
+        self.hoisted = 0
+        self.reduced = 0
+
+    def run(self, instructions: List[TACInstruction]) -> List[TACInstruction]:
+        out = []
+        copies = [TACInstruction(i.op, i.arg1, i.arg2, i.result) for i in instructions]
+        for function in split_functions(copies):
+            cfg = ControlFlowGraph(function)
+            cfg.remove_unreachable()
+            out.extend(self.optimize(cfg))
+        return out
+
+    def optimize(self, cfg: ControlFlowGraph) -> List[TACInstruction]:
+        tree = DominatorTree(cfg, cfg.dominators())
+        loops = [loop for loop in find_loops(cfg, tree) if loop.header is not cfg.entry and loop.header.label]
+        if not loops:
+            return cfg.instructions()
+        self.loops += len(loops)
+        liveness = Liveness(cfg)
+        # Only names assigned on every path from the entry get a companion, so the
+        # preheader never multiplies an uninitialised variable
+        live_entry = set(liveness.universe.members(liveness.ins[cfg.entry.index]))
+        preheaders: Dict[int, List[TACInstruction]] = {}
+        for loop in loops:
+            pre = self.hoist(loop, preheaders, liveness, tree)
+            if self.strength_reduction:
+                pre.extend(self.reduce(loop, preheaders, live_entry))
+            if pre:
+                preheaders[loop.header.index] = pre
+        return self.layout(cfg, loops, preheaders)
+
+    def body(self, loop: Loop, preheaders: Dict[int, List[TACInstruction]]) -> list:
+        # (instruction, block, the list holding it) in layout order, inner preheaders included;
+        # hoisted code counts as being in its loop's header
+        found = []
+        for block in sorted(loop.blocks, key=lambda block: block.index):
+            for container in (preheaders.get(block.index), block.instructions):
+                if container:
+                    found.extend((instr, block, container) for instr in container)
+        return found
+
+    def hoist(self, loop: Loop, preheaders: Dict[int, List[TACInstruction]], liveness: Liveness,
+              tree: DominatorTree) -> List[TACInstruction]:
+        body = self.body(loop, preheaders)
+        def_count: Dict[str, int] = {}
+        for instr, _, _ in body:
+            name = defines(instr)
+            if name is not None:
+                def_count[name] = def_count.get(name, 0) + 1
+        index = liveness.universe.index
+        live_header = liveness.ins[loop.header.index]
+        exits = [(block, succ) for block in loop.blocks for succ in block.succs if succ not in loop.blocks]
+        moved: List[TACInstruction] = []
+        moved_ids: Set[int] = set()
+        invariant: Set[str] = set()
+        changed = True
+        while changed:
+            changed = False
+            for instr, block, _ in body:
+                name = defines(instr)
+                if (name is None or id(instr) in moved_ids or def_count[name] != 1 or instr.op == 'phi'
+                        or not removable(instr) or name not in index):
+                    continue
+                if any(arg in def_count and arg not in invariant for arg in uses(instr)):
+                    continue
+                bit = 1 << index[name]
+                if live_header & bit or any(liveness.ins[succ.index] & bit and not tree.dominates(block, exiting)
+                                            for exiting, succ in exits):
+                    continue
+                moved.append(instr)
+                moved_ids.add(id(instr))
+                invariant.add(name)
+                changed = True
+        if moved:
+            for container in {id(c): c for _, _, c in body}.values():
+                container[:] = [instr for instr in container if id(instr) not in moved_ids]
+            self.hoisted += len(moved)
+        return moved
+
+    def reduce(self, loop: Loop, preheaders: Dict[int, List[TACInstruction]],
+               live_entry: Set[str]) -> List[TACInstruction]:
+        body = self.body(loop, preheaders)
+        defs: Dict[str, list] = {}
+        for entry in body:
+            name = defines(entry[0])
+            if name is not None:
+                defs.setdefault(name, []).append(entry)
+        steps: Dict[str, int] = {}
+        for name, entries in defs.items():
+            if len(entries) == 1 and name not in live_entry:
+                step = self.step(name, defs[name][0], defs)
+                if step is not None:
+                    steps[name] = step
+        pre: List[TACInstruction] = []
+        companions: Dict[tuple, str] = {}
+        for instr, _, _ in body:
+            if instr.op != '*':
+                continue
+            if instr.arg1 in steps and is_int(instr.arg2):
+                name, factor = instr.arg1, instr.arg2
+            elif instr.arg2 in steps and is_int(instr.arg1):
+                name, factor = instr.arg2, instr.arg1
+            else:
+                continue
+            companion = companions.get((name, factor))
+            if companion is None:
+                self.reduced += 1
+                companion = companions[(name, factor)] = f"{name}.sr{self.reduced}"
+                pre.append(TACInstruction('*', name, factor, companion))
+                update, _, container = defs[name][0]
+                bump = format_constant(steps[name] * parse_constant(factor))
+                position = next(k for k, other in enumerate(container) if other is update)
+                container.insert(position + 1, TACInstruction('+', companion, bump, companion))
+            instr.op, instr.arg1, instr.arg2 = '=', companion, None
+        return pre
+
+    def step(self, name: str, entry: tuple, defs: Dict[str, list]) -> Optional[int]:
+        # What the only assignment to name in the loop adds to it: name = name +/- c,
+        # or name = t right after t = name +/- c in the same block
+        instr, _, container = entry
+        if instr.op == '=':
+            source = defs.get(instr.arg1)
+            if source is None or len(source) != 1 or source[0][2] is not container:
+                return None
+            position = next(k for k, other in enumerate(container) if other is instr)
+            if position == 0 or container[position - 1] is not source[0][0]:
+                return None
+            instr = source[0][0]
+        if instr.op == '+' and instr.arg1 == name and is_int(instr.arg2):
+            return parse_constant(instr.arg2)
+        if instr.op == '+' and instr.arg2 == name and is_int(instr.arg1):
+            return parse_constant(instr.arg1)
+        if instr.op == '-' and instr.arg1 == name and is_int(instr.arg2):
+            return -parse_constant(instr.arg2)
+        return None
+
+    def layout(self, cfg: ControlFlowGraph, loops: List[Loop],
+               preheaders: Dict[int, List[TACInstruction]]) -> List[TACInstruction]:
+        # Each preheader goes right before its header; jumps from outside the loop are sent to it.
+        # It's only labelled when jumped to, since an unreferenced label would start a new function
+        out: List[TACInstruction] = []
+        by_header = {loop.header.index: loop for loop in loops}
+        jumped: Set[str] = set()
+        for loop in loops:
+            if loop.header.index not in preheaders:
+                continue
+            label = loop.header.label
+            for block in cfg.blocks:
+                last = block.terminator
+                if block not in loop.blocks and last is not None and jump_target(last) == label:
+                    if last.op == 'goto':
+                        last.arg1 = f"{label}.pre"
+                    else:
+                        last.result = f"{label}.pre"
+                    jumped.add(label)
+        for k, block in enumerate(cfg.blocks):
+            pre = preheaders.get(block.index)
+            if pre is not None:
+                prev = cfg.blocks[k - 1]
+                last = prev.terminator
+                if prev in by_header[block.index].blocks and (last is None or last.op in ('ifz', 'ifnz')):
+                    out.append(TACInstruction('goto', block.label))
+                if block.label in jumped:
+                    out.append(TACInstruction('label', result=f"{block.label}.pre"))
+                out.extend(pre)
+            out.extend(block.instructions)
+        return out
+
+    def report(self) -> str:
+        return (f"{self.loops} loop(s), {self.hoisted} instruction(s) hoisted, "
+                f"{self.reduced} multiplication(s) strength-reduced")
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    optimizer = LoopOptimizer()
+    for instr in optimizer.run(TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())):
+        print(instr)
+    print(f"\n{optimizer.report()}")
@@ -0,0 +1,208 @@
+from itertools import count
+from typing import Dict, List, Optional
+
+from cfg import PURE_OPS, ControlFlowGraph, build_cfgs, defines, is_name, uses
+from dataflow import Liveness
+from tac import TACInstruction, fold_binary, fold_unary, format_constant, parse_constant
+
+COMMUTATIVE_OPS = frozenset(('+', '*', '==', '!=', '&&', '||'))
+
+def removable(instr: TACInstruction) -> bool:
+    # Pure, and can't trap: a division stays unless its divisor is a nonzero constant
+    if instr.op not in PURE_OPS:
+        return False
+    if instr.op == '/':
+        divisor = parse_constant(instr.arg2) if isinstance(instr.arg2, str) else None
+        return divisor is not None and divisor != 0
+    return True
+
+class LocalValueNumbering:
+    """Per-block value numbering over TAC, with the clean-ups it needs around it.
+
+    Each function goes through three steps. First, a temp that is written and
+    then immediately copied into a variable (``t1 = a + b; x = t1``) is
+    coalesced into the variable. Then, within each block, operands are
+    replaced by the oldest name or constant holding their value, constant
+    operations are folded, and a repeated pure computation becomes a copy of
+    the earlier result. Finally, pure definitions that are no longer live are
+    dropped. The counters record what each step did, over every call to run.
+    """
+    def __init__(self):
+        self.before = 0
+        self.after = 0
+        self.coalesced = 0
+        self.copies = 0
+        self.folded = 0
+        self.eliminated = 0
+        self.dead = 0
+
+    def run(self, instructions: List[TACInstruction]) -> List[TACInstruction]:
+        out = []
+        # Rewrites happen in place, so work on copies
+        for cfg in build_cfgs(TACInstruction(i.op, i.arg1, i.arg2, i.result) for i in instructions):
+            self.coalesce(cfg)
+            for block in cfg.blocks:
+                block.instructions = self.number_block(block.instructions)
+            self.remove_dead(cfg)
+            out.extend(cfg.instructions())
+        self.before += len(instructions)
+        self.after += len(out)
+        return out
+
+    def coalesce(self, cfg: ControlFlowGraph):
+        use_count: Dict[str, int] = {}
+        def_count: Dict[str, int] = {}
+        for block in cfg.blocks:
+            for instr in block.instructions:
+                for name in uses(instr):
+                    use_count[name] = use_count.get(name, 0) + 1
+                name = defines(instr)
+                if name is not None:
+                    def_count[name] = def_count.get(name, 0) + 1
+        for block in cfg.blocks:
+            instrs = block.instructions
+            kept = []
+            k = 0
+            while k < len(instrs):
+                instr = instrs[k]
+                name = defines(instr)
+                nxt = instrs[k + 1] if k + 1 < len(instrs) else None
+                if (name is not None and nxt is not None and nxt.op == '=' and nxt.arg1 == name
+                        and use_count.get(name) == 1 and def_count.get(name) == 1):
+                    instr.result = nxt.result
+                    kept.append(instr)
+                    self.coalesced += 1
+                    k += 2
+                    continue
+                kept.append(instr)
+                k += 1
+            block.instructions = kept
+
+    def number_block(self, instructions: List[TACInstruction]) -> List[TACInstruction]:
+        numbers: Dict[str, int] = {}
+        holders: Dict[int, List[str]] = {}
+        constants: Dict[int, str] = {}
+        expressions: Dict[tuple, int] = {}
+        fresh = count().__next__
+
+        def number(operand: str) -> int:
+            vn = numbers.get(operand)
+            if vn is None:
+                vn = numbers[operand] = fresh()
+                if is_name(operand):
+                    holders[vn] = [operand]
+                else:
+                    constants[vn] = operand
+            return vn
+
+        def canonical(operand):
+            # The constant, or the oldest name still holding the operand's value
+            if not isinstance(operand, str):
+                return operand
+            vn = number(operand)
+            best = constants.get(vn)
+            if best is None:
+                best = holders[vn][0]
+            if best != operand:
+                self.copies += 1
+            return best
+
+        def define(name: str, vn: int):
+            old = numbers.get(name)
+            if old is not None and old in holders:
+                holders[old].remove(name)
+            numbers[name] = vn
+            holders.setdefault(vn, []).append(name)
+
+        out = []
+        for instr in instructions:
+            op = instr.op
+            if op in ('label', 'goto'):
+                out.append(instr)
+                continue
+            if op in ('param', 'return', 'ifz', 'ifnz'):
+                instr.arg1 = canonical(instr.arg1)
+                out.append(instr)
+                continue
+            if op == 'call':
+                define(instr.result, fresh())
+                out.append(instr)
+                continue
+            if op == '=':
+                source = canonical(instr.arg1)
+            else:
+                source = self.simplify(instr, canonical)
+            if source is not None:
+                vn = number(source)
+                if numbers.get(instr.result) == vn:
+                    # The target already holds this value
+                    self.eliminated += 1
+                    continue
+                out.append(TACInstruction('=', source, None, instr.result))
+                define(instr.result, vn)
+                continue
+            key = (op, numbers[instr.arg1], None if instr.arg2 is None else numbers[instr.arg2])
+            if op in COMMUTATIVE_OPS and key[1] > key[2]:
+                key = (op, key[2], key[1])
+            vn = expressions.get(key)
+            if vn is not None and (vn in constants or holders.get(vn)):
+                source = constants.get(vn) or holders[vn][0]
+                self.eliminated += 1
+                if numbers.get(instr.result) != vn:
+                    out.append(TACInstruction('=', source, None, instr.result))
+                    define(instr.result, vn)
+                continue
+            vn = expressions[key] = fresh()
+            out.append(instr)
+            define(instr.result, vn)
+        return out
+
+    def simplify(self, instr: TACInstruction, canonical) -> Optional[str]:
+        # Rewrite the operands; returns the constant result if the operation folds
+        instr.arg1 = canonical(instr.arg1)
+        if instr.arg2 is None:
+            value = parse_constant(instr.arg1)
+            folded = None if value is None else fold_unary(instr.op, value)
+        else:
+            instr.arg2 = canonical(instr.arg2)
+            left, right = parse_constant(instr.arg1), parse_constant(instr.arg2)
+            folded = None if left is None or right is None else fold_binary(instr.op, left, right)
+        if folded is None:
+            return None
+        self.folded += 1
+        return format_constant(folded)
+
+    def remove_dead(self, cfg: ControlFlowGraph):
+        changed = True
+        while changed:
+            changed = False
+            liveness = Liveness(cfg)
+            index = liveness.universe.index
+            for block in cfg.blocks:
+                after = liveness.live_after(block)
+                kept = []
+                for instr, live in zip(block.instructions, after):
+                    name = defines(instr)
+                    if name is not None and removable(instr) and not live >> index[name] & 1:
+                        self.dead += 1
+                        changed = True
+                        continue
+                    kept.append(instr)
+                block.instructions = kept
+
+    def report(self) -> str:
+        return (f"{self.before} -> {self.after} instructions: {self.eliminated} common subexpression(s), "
+                f"{self.copies} copy propagation(s), {self.folded} fold(s), {self.coalesced} coalesced temp(s), "
+                f"{self.dead} dead instruction(s)")
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    tac = TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+    lvn = LocalValueNumbering()
+    for instr in lvn.run(tac):
+        print(instr)
+    print(f"\n{lvn.report()}")
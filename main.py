@@ -1,27 +1,169 @@
-from lexer import Lexer
 from parser import Parser
 from semantic import SemanticAnalyzer
 from tac import TACGenerator
+from pipeline import SCANNERS, compile_source
+from compile_cache import CompilationCache
+from tac_vm import TACVM, VMError, program_params
+from pybackend import PythonBackend
+from instrumentation import Metrics
+from emitters import Emitter
+import argparse
 import traceback
 import sys
-import time
 
-def main():
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="MiniLang++ compiler front-end")
+    ap.add_argument('source', nargs='?', default="sample_input.minipp", help="MiniLang++ source file")
+    ap.add_argument('--scanner', choices=sorted(SCANNERS), default='regex', help="lexer implementation")
+    ap.add_argument('--cache-dir', help="reuse results for unchanged sources from this directory")
+    ap.add_argument('-j', '--jobs', type=int, help="analyse and lower functions on this many workers")
+    ap.add_argument('-O', '--optimize', action='store_true', help="optimise the generated TAC")
+    ap.add_argument('--registers', type=int, help="fit each function's temps into this many, spilling the rest")
+    ap.add_argument('--inline-size', type=int, metavar='N',
+                    help="inline calls to non-recursive functions of at most N TAC instructions")
+    ap.add_argument('--tail-calls', action='store_true',
+                    help="turn self-recursive tail calls into jumps back to the function's start")
+    ap.add_argument('--run', action='store_true', help="execute main() after compiling")
+    ap.add_argument('--backend', choices=['vm', 'python'], default='vm',
+                    help="run on the TAC VM or as Python code built from the AST")
+    ap.add_argument('--fused', action='store_true', help="check types and generate TAC in a single pass")
+    ap.add_argument('--parallel-mode', choices=['process', 'thread'], default='process', help="worker pool kind for --jobs")
+    ap.add_argument('--metrics', metavar='FILE',
+                    help="write phase timings and counters to FILE (CSV if it ends in .csv, else JSON)")
+    ap.add_argument('-q', '--quiet', action='store_true',
+                    help="print only diagnostics (on stderr) and the --emit output")
+    ap.add_argument('--emit', choices=['tokens', 'ast', 'symbols', 'tac'],
+                    help="what --quiet writes (default: tac); implies --quiet")
+    ap.add_argument('-o', '--output', metavar='FILE', help="write the --emit output to FILE; implies --quiet")
+    args = ap.parse_args(argv)
+    if args.emit or args.output:
+        args.quiet = True
+    args.emit = args.emit or 'tac'
+    if args.registers is not None and args.registers < 2:
+        ap.error("--registers needs at least 2")
+    if args.inline_size is not None and args.inline_size < 0:
+        ap.error("--inline-size can't be negative")
+    return args
+
+def compile_with_args(code: str, args, metrics: Metrics):
+    cache = CompilationCache(args.cache_dir) if args.cache_dir else None
+    with metrics.span('compile'):
+        return compile_source(code, args.scanner, cache, args.jobs, args.parallel_mode, args.fused, args.optimize,
+                              args.registers, args.inline_size, args.tail_calls, metrics)
+
+def main_pipeline(code: str, args, metrics: Metrics):
+    result = compile_with_args(code, args, metrics)
+    elapsed = metrics.seconds('compile')
+    if args.cache_dir:
+        status = "hit" if result.cached else "miss"
+        print(f"[Cache] {status} in {elapsed:.4f} seconds ({args.cache_dir}).")
+    elif args.jobs:
+        print(f"[Pipeline] Compiled with {args.jobs} {args.parallel_mode} worker(s) in {elapsed:.4f} seconds.")
+    elif args.fused:
+        print(f"[Pipeline] Compiled in a single fused pass in {elapsed:.4f} seconds.")
+    else:
+        print(f"[Pipeline] Compiled in {elapsed:.4f} seconds.")
+    out = Emitter()
+    out.lines(["", "--- Syntax Analysis: AST ---"])
+    out.ast(result.ast)
+    out.lines(["", "--- Semantic Analysis: Global Symbols ---"])
+    out.lines(result.symbols)
+    if result.errors:
+        out.lines(["", "Errors:"])
+        out.lines(result.errors)
+    out.lines(["", "--- Intermediate Code Generation: Three Address Code (TAC) ---"])
+    out.tac(result.tac)
+    out.flush()
+    if result.inline_report is not None:
+        print(f"[Inline] {result.inline_report}.")
+    if result.unoptimized_size is not None:
+        print(f"[Optimize] {result.unoptimized_size} -> {len(result.tac)} TAC instructions.")
+    if args.run and not result.errors:
+        run_program(result, args.backend)
+
+def main_quiet(args) -> int:
+    # Diagnostics go to stderr; stdout (or -o) carries only the --emit output
+    try:
+        with open(args.source) as f:
+            code = f.read()
+        metrics = Metrics(per_function=args.metrics is not None)
+        result = compile_with_args(code, args, metrics)
+        for err in result.errors:
+            print(err, file=sys.stderr)
+        stream = open(args.output, 'w', buffering=1 << 20) if args.output else sys.stdout
+        try:
+            out = Emitter(stream)
+            if args.emit == 'tokens':
+                out.tokens(SCANNERS[args.scanner](code).tokenize_compact())
+            elif args.emit == 'ast':
+                out.ast(result.ast)
+            elif args.emit == 'symbols':
+                out.lines(result.symbols)
+            else:
+                out.tac(result.tac)
+            out.flush()
+        finally:
+            if args.output:
+                stream.close()
+        write_metrics(metrics, args.metrics, quiet=True)
+        if args.run and not result.errors:
+            run_program(result, args.backend)
+        return 1 if result.errors else 0
+    except Exception:
+        traceback.print_exc(file=sys.stderr)
+        return 1
+
+def write_metrics(metrics: Metrics, path, quiet: bool = False):
+    if path:
+        metrics.write(path)
+        if not quiet:
+            print(f"[Metrics] {len(metrics.spans)} span(s) and {len(metrics.counters)} counter(s) written to {path}.")
+
+def run_program(result, backend: str):
+    if backend == 'python':
+        print("\n--- Execution: Python backend ---")
+        run_main = PythonBackend().compile(result.ast).get('main')
+    else:
+        print("\n--- Execution: TAC VM ---")
+        run_main = TACVM(result.tac, program_params(result.ast)).run
+    if run_main is None:
+        print("[Run] No main() function.")
+        return
+    try:
+        print(f"[Run] main() returned {run_main()!r}.")
+    except (VMError, ArithmeticError, RecursionError, NameError, TypeError) as e:
+        # NameError (UnboundLocalError included) and TypeError come from Python backend code
+        # reading or combining an unset variable
+        print(f"[Run] Runtime error: {e}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.quiet:
+        return main_quiet(args)
+    print(">>> Running compiler pipeline")
     try:
         # Read source code
-        with open("sample_input.minipp") as f:
+        with open(args.source) as f:
             code = f.read()
         print("==== MiniLang++ Compiler Front-End ====")
+        metrics = Metrics(per_function=args.metrics is not None)
+        if (args.cache_dir or args.jobs or args.fused or args.optimize or args.registers is not None
+                or args.inline_size is not None or args.tail_calls or args.run):
+            main_pipeline(code, args, metrics)
+            print("\n==== Compilation pipeline completed successfully ====")
+            write_metrics(metrics, args.metrics)
+            return
 
         # Lexical Analysis
         print("\n--- Lexical Analysis: Tokens ---")
-        lexer = Lexer(code)
-        start_time = time.time()
-        tokens = lexer.tokenize()
-        elapsed = time.time() - start_time
+        lexer = SCANNERS[args.scanner](code)
+        with metrics.span('lex'):
+            tokens = lexer.tokenize()
+        elapsed = metrics.seconds('lex')
         print(f"[Lexer] Tokenization complete. {len(tokens)} tokens generated in {elapsed:.4f} seconds.")
-        for token in tokens:
-            print(token)
+        out = Emitter()
+        out.tokens(tokens)
+        out.flush()
         if lexer.errors:
             print("\nLexical Errors:")
             for err in lexer.errors:
@@ -31,14 +173,12 @@ def main():
         # Syntax Analysis
         print("--- Syntax Analysis: AST ---")
         parser = Parser(tokens)
-        start_time = time.time()
-        ast = parser.parse()
-        elapsed = time.time() - start_time
+        with metrics.span('parse'):
+            ast = parser.parse()
+        elapsed = metrics.seconds('parse')
         print(f"[Parser] AST construction complete in {elapsed:.4f} seconds.")
-        if hasattr(ast, 'pretty_print'):
-            ast.pretty_print()
-        else:
-            print("[Parser] AST has no pretty_print method.")
+        out.ast(ast)
+        out.flush()
         if parser.errors:
             print("\nSyntax Errors:")
             for err in parser.errors:
@@ -48,9 +188,9 @@ def main():
         # Semantic Analysis
         print("--- Semantic Analysis: Symbol Tables & Errors ---")
         analyzer = SemanticAnalyzer()
-        start_time = time.time()
-        analyzer.analyze(ast)
-        elapsed = time.time() - start_time
+        with metrics.span('semantic'):
+            analyzer.analyze(ast)
+        elapsed = metrics.seconds('semantic')
         print(f"[Semantic] Analysis complete in {elapsed:.4f} seconds.")
         print(analyzer.symbol_stack)
         if analyzer.errors:
@@ -64,20 +204,25 @@ def main():
         # Intermediate Code Generation
         print("--- Intermediate Code Generation: Three Address Code (TAC) ---")
         tacgen = TACGenerator()
-        start_time = time.time()
-        tac = tacgen.generate(ast)
-        elapsed = time.time() - start_time
+        with metrics.span('tac'):
+            tac = tacgen.generate(ast)
+        elapsed = metrics.seconds('tac')
         print(f"[TAC] Generation complete in {elapsed:.4f} seconds. {len(tac)} instructions generated.")
-        for instr in tac:
-            print(instr)
+        out.tac(tac)
+        out.flush()
         print("[TAC] Phase complete.\n")
 
         print("==== Compilation pipeline completed successfully ====")
+        if args.metrics:
+            metrics.count_tokens(tokens)
+            metrics.count_ast(ast)
+            metrics.count_tac(tac)
+            metrics.count_errors(lexer.errors, parser.errors, analyzer.errors)
+        write_metrics(metrics, args.metrics)
     except Exception as e:
         print("\n[ERROR] An exception occurred during compilation:")
         traceback.print_exc(file=sys.stdout)
         print("\n[FAIL] Compilation pipeline terminated with errors.")
 
 if __name__ == "__main__":
-    print(">>> Running compiler pipeline")
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
@@ -1,11 +1,18 @@
-from typing import List, Optional, Any
+from typing import Any, Iterator, List, Optional
 
 class ASTNode:
-    """Base class for all AST nodes."""
+    """Base class for all AST nodes.
+
+    Every node class declares __slots__: no per-instance __dict__, which keeps
+    large trees compact and attribute access fast.
+    """
+    __slots__ = ()
+
     def pretty_print(self, indent=0):
         print(' ' * indent + self.__class__.__name__)
 
 class Program(ASTNode):
+    __slots__ = ('functions',)
     def __init__(self, functions: List['FunctionDef']):
         self.functions = functions
     def pretty_print(self, indent=0):
@@ -14,6 +21,7 @@ class Program(ASTNode):
             func.pretty_print(indent + 2)
 
 class FunctionDef(ASTNode):
+    __slots__ = ('return_type', 'name', 'params', 'body')
     def __init__(self, return_type: str, name: str, params: List['VariableDecl'], body: 'Block'):
         self.return_type = return_type
         self.name = name
@@ -27,6 +35,7 @@ class FunctionDef(ASTNode):
         self.body.pretty_print(indent + 2)
 
 class VariableDecl(ASTNode):
+    __slots__ = ('var_type', 'name', 'initializer')
     def __init__(self, var_type: str, name: str, initializer: Optional['Expression'] = None):
         self.var_type = var_type
         self.name = name
@@ -38,6 +47,7 @@ class VariableDecl(ASTNode):
             self.initializer.pretty_print(indent + 4)
 
 class Block(ASTNode):
+    __slots__ = ('statements',)
     def __init__(self, statements: List[ASTNode]):
         self.statements = statements
     def pretty_print(self, indent=0):
@@ -46,6 +56,7 @@ class Block(ASTNode):
             stmt.pretty_print(indent + 2)
 
 class If(ASTNode):
+    __slots__ = ('condition', 'then_block', 'else_block')
     def __init__(self, condition: 'Expression', then_block: Block, else_block: Optional[Block] = None):
         self.condition = condition
         self.then_block = then_block
@@ -61,6 +72,7 @@ class If(ASTNode):
             self.else_block.pretty_print(indent + 4)
 
 class While(ASTNode):
+    __slots__ = ('condition', 'body')
     def __init__(self, condition: 'Expression', body: Block):
         self.condition = condition
         self.body = body
@@ -72,6 +84,7 @@ class While(ASTNode):
         self.body.pretty_print(indent + 4)
 
 class Return(ASTNode):
+    __slots__ = ('value',)
     def __init__(self, value: Optional['Expression'] = None):
         self.value = value
     def pretty_print(self, indent=0):
@@ -80,6 +93,7 @@ class Return(ASTNode):
             self.value.pretty_print(indent + 2)
 
 class Assignment(ASTNode):
+    __slots__ = ('target', 'value')
     def __init__(self, target: 'Identifier', value: 'Expression'):
         self.target = target
         self.value = value
@@ -91,9 +105,10 @@ class Assignment(ASTNode):
         self.value.pretty_print(indent + 4)
 
 class Expression(ASTNode):
-    pass
+    __slots__ = ()
 
 class BinaryOp(Expression):
+    __slots__ = ('op', 'left', 'right')
     def __init__(self, op: str, left: Expression, right: Expression):
         self.op = op
         self.left = left
@@ -104,6 +119,7 @@ class BinaryOp(Expression):
         self.right.pretty_print(indent + 2)
 
 class UnaryOp(Expression):
+    __slots__ = ('op', 'operand')
     def __init__(self, op: str, operand: Expression):
         self.op = op
         self.operand = operand
@@ -112,6 +128,7 @@ class UnaryOp(Expression):
         self.operand.pretty_print(indent + 2)
 
 class Literal(Expression):
+    __slots__ = ('value', 'typ')
     def __init__(self, value: Any, typ: str):
         self.value = value
         self.typ = typ
@@ -119,16 +136,34 @@ class Literal(Expression):
         print(' ' * indent + f'Literal {self.value} ({self.typ})')
 
 class Identifier(Expression):
+    __slots__ = ('name', 'symbol')
     def __init__(self, name: str):
         self.name = name
+        self.symbol = None  # Resolved by semantic analysis
     def pretty_print(self, indent=0):
         print(' ' * indent + f'Identifier {self.name}')
 
 class FunctionCall(Expression):
+    __slots__ = ('name', 'args', 'symbol')
     def __init__(self, name: str, args: List[Expression]):
         self.name = name
         self.args = args
+        self.symbol = None  # Resolved by semantic analysis
     def pretty_print(self, indent=0):
         print(' ' * indent + f'FunctionCall {self.name}')
         for arg in self.args:
-            arg.pretty_print(indent + 2) 
\ No newline at end of file
+            arg.pretty_print(indent + 2)
+
+def iter_nodes(root: ASTNode) -> Iterator[ASTNode]:
+    # root and every node below it, without recursion. Fields are found through __slots__;
+    # 'symbol' points into the symbol table rather than the tree
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        for slot in type(node).__slots__:
+            value = getattr(node, slot, None) if slot != 'symbol' else None
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, ASTNode))
@@ -0,0 +1,107 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from minilang_ast import FunctionDef, Program
+from semantic import SemanticAnalyzer
+from symbol_table import SymbolTable
+from tac import TACGenerator, TACInstruction
+
+# Chunks per worker: enough to balance uneven function sizes without paying per-function overhead
+CHUNKS_PER_WORKER = 4
+
+# Set in each worker process by _init_worker
+_global_table: Optional[SymbolTable] = None
+_functions: List[FunctionDef] = []
+_tail_calls = False
+
+def _init_worker(global_table: SymbolTable, functions: List[FunctionDef], tail_calls: bool = False):
+    # Under the fork start method these are inherited rather than pickled
+    global _global_table, _functions, _tail_calls
+    _global_table = global_table
+    _functions = functions
+    _tail_calls = tail_calls
+
+def compile_functions(functions: List[FunctionDef], global_table: SymbolTable,
+                      tail_calls: bool = False) -> Tuple[List[str], List[TACInstruction]]:
+    # Analyse and lower a run of functions; only reads the global table
+    analyzer = SemanticAnalyzer()
+    analyzer.global_table = global_table
+    analyzer.symbol_stack.push(global_table)
+    tacgen = TACGenerator(per_function=True, tail_calls=tail_calls)
+    for func in functions:
+        analyzer.analyze_function(func)
+        tacgen.gen_function(func)
+    return analyzer.errors, tacgen.instructions
+
+def _compile_range(start: int, stop: int) -> Tuple[List[str], List[tuple]]:
+    # Plain tuples pickle several times faster than TACInstruction objects
+    errors, tac = compile_functions(_functions[start:stop], _global_table, _tail_calls)
+    return errors, [(i.op, i.arg1, i.arg2, i.result) for i in tac]
+
+def split_ranges(count: int, workers: int) -> List[Tuple[int, int]]:
+    chunks = max(1, workers * CHUNKS_PER_WORKER)
+    size = max(1, -(-count // chunks))
+    return [(k, min(k + size, count)) for k in range(0, count, size)]
+
+class ParallelBackend:
+    """Semantic analysis and TAC generation spread over a pool, one chunk of functions per task.
+
+    Function signatures are declared once up front; workers then only read that
+    global table, and each function gets its own temp/label numbering
+    (TACGenerator(per_function=True)), so errors and TAC come out in source order
+    and identical to a sequential per-function run no matter how tasks are
+    scheduled. Process workers receive the program once, at startup (for free
+    with the fork start method), and are then sent only index ranges; thread
+    mode avoids all copying but only pays off on a free-threaded build. Symbol
+    annotations made by the analysis only reach the caller's AST in thread mode.
+    """
+    def __init__(self, workers: Optional[int] = None, mode: str = 'process', tail_calls: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.tail_calls = tail_calls
+
+    def _executor(self, global_table: SymbolTable, functions: List[FunctionDef]) -> Executor:
+        if self.mode == 'process':
+            return ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                       initargs=(global_table, functions, self.tail_calls))
+        return ThreadPoolExecutor(self.workers)
+
+    def run(self, program: Program) -> Tuple[SymbolTable, List[str], List[TACInstruction]]:
+        analyzer = SemanticAnalyzer()
+        global_table = analyzer.declare_functions(program.functions)
+        errors = analyzer.errors
+        tac: List[TACInstruction] = []
+        functions = program.functions
+        ranges = split_ranges(len(functions), self.workers)
+        if self.workers == 1 or len(ranges) <= 1:
+            chunk_errors, tac = compile_functions(functions, global_table, self.tail_calls)
+            errors.extend(chunk_errors)
+            return global_table, errors, tac
+        starts = [start for start, _ in ranges]
+        stops = [stop for _, stop in ranges]
+        with self._executor(global_table, functions) as pool:
+            if self.mode == 'process':
+                # map() yields in submission order, which is source order
+                for chunk_errors, rows in pool.map(_compile_range, starts, stops):
+                    errors.extend(chunk_errors)
+                    tac.extend(TACInstruction(*row) for row in rows)
+            else:
+                for chunk_errors, chunk_tac in pool.map(
+                        lambda start, stop: compile_functions(functions[start:stop], global_table, self.tail_calls),
+                        starts, stops):
+                    errors.extend(chunk_errors)
+                    tac.extend(chunk_tac)
+        return global_table, errors, tac
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    ast = Parser(Lexer(code).tokenize_compact()).parse()
+    _, errors, tac = ParallelBackend(2).run(ast)
+    for err in errors:
+        print(err)
+    for instr in tac:
+        print(instr)
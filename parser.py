@@ -1,287 +1,328 @@
-from lexer import Lexer, Token
+from lexer import Lexer, Token, TokenStream, TOKEN_KINDS, TOKEN_NAMES
 from minilang_ast import *
-from typing import List, Optional
+from typing import List, Optional, Union
 
 class ParserError(Exception):
     pass
 
+# Token kinds the parser dispatches on (see lexer.TOKEN_KINDS)
+INT, FLOAT, BOOL = TOKEN_KINDS['INT'], TOKEN_KINDS['FLOAT'], TOKEN_KINDS['BOOL']
+IF, ELSE, WHILE, RETURN = TOKEN_KINDS['IF'], TOKEN_KINDS['ELSE'], TOKEN_KINDS['WHILE'], TOKEN_KINDS['RETURN']
+TRUE, FALSE = TOKEN_KINDS['TRUE'], TOKEN_KINDS['FALSE']
+EQ, NEQ, LE, GE = TOKEN_KINDS['EQ'], TOKEN_KINDS['NEQ'], TOKEN_KINDS['LE'], TOKEN_KINDS['GE']
+AND, OR, ASSIGN, LT, GT = TOKEN_KINDS['AND'], TOKEN_KINDS['OR'], TOKEN_KINDS['ASSIGN'], TOKEN_KINDS['LT'], TOKEN_KINDS['GT']
+PLUS, MINUS, MUL, DIV, NOT = TOKEN_KINDS['PLUS'], TOKEN_KINDS['MINUS'], TOKEN_KINDS['MUL'], TOKEN_KINDS['DIV'], TOKEN_KINDS['NOT']
+LPAREN, RPAREN, LBRACE, RBRACE = TOKEN_KINDS['LPAREN'], TOKEN_KINDS['RPAREN'], TOKEN_KINDS['LBRACE'], TOKEN_KINDS['RBRACE']
+COMMA, SEMI, ID = TOKEN_KINDS['COMMA'], TOKEN_KINDS['SEMI'], TOKEN_KINDS['ID']
+FLOAT_LIT, INT_LIT = TOKEN_KINDS['FLOAT_LIT'], TOKEN_KINDS['INT_LIT']
+EOF = len(TOKEN_NAMES)
+KIND_NAMES = TOKEN_NAMES + ['EOF']
+
+TYPE_KINDS = (INT, FLOAT, BOOL)
+TYPE_NAMES = {INT: 'int', FLOAT: 'float', BOOL: 'bool'}
+
+LITERAL_KINDS = (INT_LIT, FLOAT_LIT, TRUE, FALSE)
+
+# Expression operators: kind -> (precedence, spelling, arity). Higher precedence binds
+# tighter, binary operators are left-associative and prefix operators bind tightest.
+BINARY_OPS = {
+    OR: (1, '||', 2), AND: (2, '&&', 2),
+    EQ: (3, '==', 2), NEQ: (3, '!=', 2),
+    LT: (4, '<', 2), LE: (4, '<=', 2), GT: (4, '>', 2), GE: (4, '>=', 2),
+    PLUS: (5, '+', 2), MINUS: (5, '-', 2),
+    MUL: (6, '*', 2), DIV: (6, '/', 2),
+}
+UNARY_OPS = {MINUS: (7, '-', 1), NOT: (7, '!', 1)}
+# Operator-stack markers for an open '(' and an open call's argument list
+PAREN_MARK = (0, '(', 0)
+CALL_MARK = (0, 'call', 0)
+
 class Parser:
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: Union[List[Token], TokenStream]):
         self.tokens = tokens
+        if not isinstance(tokens, TokenStream):
+            tokens = TokenStream.from_tokens(tokens)
+        self.stream = tokens
+        # Kind column plus an EOF sentinel, so peeking never needs a bounds check
+        self.kinds = list(tokens.kinds)
+        self.kinds.append(EOF)
         self.pos = 0
         self.errors = []
+        # One (first token, end token, FunctionDef or None, first error index) per top-level attempt
+        self.spans = []
+        self.statement_table = {
+            INT: self.parse_vardecl, FLOAT: self.parse_vardecl, BOOL: self.parse_vardecl,
+            ID: self.parse_id_statement, IF: self.parse_if, WHILE: self.parse_while,
+            RETURN: self.parse_return, LBRACE: self.parse_block,
+        }
 
     def current(self) -> Optional[Token]:
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
+        if self.pos < len(self.stream):
+            return self.stream.token(self.pos)
         return None
 
-    def match(self, *token_types):
-        token = self.current()
-        if token and token.type in token_types:
+    def match(self, kind: int) -> bool:
+        if self.kinds[self.pos] == kind:
             self.pos += 1
-            return token
-        return None
+            return True
+        return False
 
-    def expect(self, *token_types):
-        token = self.match(*token_types)
-        if not token:
-            expected = ' or '.join(token_types)
-            actual = self.current().type if self.current() else 'EOF'
-            self.errors.append(f"Expected {expected} but found {actual} at line {self.current().line if self.current() else '?'}")
-            raise ParserError(f"Expected {expected} but found {actual}")
-        return token
+    def expect(self, kind: int) -> int:
+        # Returns the index of the consumed token
+        pos = self.pos
+        if self.kinds[pos] != kind:
+            self.fail_expected((kind,))
+        self.pos = pos + 1
+        return pos
+
+    def expect_type(self) -> str:
+        type_name = TYPE_NAMES.get(self.kinds[self.pos])
+        if type_name is None:
+            self.fail_expected(TYPE_KINDS)
+        self.pos += 1
+        return type_name
+
+    def fail_expected(self, kinds):
+        expected = ' or '.join(KIND_NAMES[k] for k in kinds)
+        actual = KIND_NAMES[self.kinds[self.pos]]
+        line = self.stream.lines[self.pos] if self.pos < len(self.stream) else '?'
+        self.errors.append(f"Expected {expected} but found {actual} at line {line}")
+        raise ParserError(f"Expected {expected} but found {actual}")
 
     def parse(self) -> Program:
         functions = []
-        while self.current():
+        while self.kinds[self.pos] != EOF:
+            first = self.pos
+            first_error = len(self.errors)
+            func = None
             try:
-                functions.append(self.parse_function())
+                func = self.parse_function()
+                functions.append(func)
             except ParserError as e:
                 self.synchronize()
+            self.spans.append((first, self.pos, func, first_error))
         return Program(functions)
 
     def synchronize(self):
         # Skip tokens until a likely function start or EOF
-        while self.current() and self.current().type not in ('INT', 'FLOAT', 'BOOL'):
+        kinds = self.kinds
+        while kinds[self.pos] != EOF and kinds[self.pos] not in TYPE_NAMES:
             self.pos += 1
 
     def parse_function(self) -> FunctionDef:
         # return_type ID (params) { body }
-        return_type = self.expect('INT', 'FLOAT', 'BOOL').type.lower()
-        name = self.expect('ID').value
-        self.expect('LPAREN')
+        return_type = self.expect_type()
+        name = self.stream.identifier(self.expect(ID))
+        self.expect(LPAREN)
         params = self.parse_params()
-        self.expect('RPAREN')
+        self.expect(RPAREN)
         body = self.parse_block()
         return FunctionDef(return_type, name, params, body)
 
     def parse_params(self) -> List[VariableDecl]:
         params = []
-        if self.current() and self.current().type in ('INT', 'FLOAT', 'BOOL'):
+        if self.kinds[self.pos] in TYPE_NAMES:
             while True:
-                var_type = self.expect('INT', 'FLOAT', 'BOOL').type.lower()
-                name = self.expect('ID').value
+                var_type = self.expect_type()
+                name = self.stream.identifier(self.expect(ID))
                 params.append(VariableDecl(var_type, name))
-                if not self.match('COMMA'):
+                if not self.match(COMMA):
                     break
         return params
 
     def parse_block(self) -> Block:
-        self.expect('LBRACE')
+        self.expect(LBRACE)
         statements = []
-        while self.current() and self.current().type != 'RBRACE':
+        kinds = self.kinds
+        while kinds[self.pos] != RBRACE and kinds[self.pos] != EOF:
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
-        self.expect('RBRACE')
+        self.expect(RBRACE)
         return Block(statements)
 
     def parse_statement(self) -> Optional[ASTNode]:
-        token = self.current()
-        if not token:
-            return None
-        if token.type in ('INT', 'FLOAT', 'BOOL'):
-            return self.parse_vardecl()
-        elif token.type == 'ID':
-            # Could be assignment or function call
-            if self.lookahead(1) and self.lookahead(1).type == 'LPAREN':
-                expr = self.parse_expression()
-                self.expect('SEMI')
-                return expr
-            else:
-                return self.parse_assignment()
-        elif token.type == 'IF':
-            return self.parse_if()
-        elif token.type == 'WHILE':
-            return self.parse_while()
-        elif token.type == 'RETURN':
-            return self.parse_return()
-        elif token.type == 'LBRACE':
-            return self.parse_block()
-        else:
-            self.errors.append(f"Unexpected token {token.type} at line {token.line}")
-            self.pos += 1
+        kind = self.kinds[self.pos]
+        parse = self.statement_table.get(kind)
+        if parse is not None:
+            return parse()
+        if kind == EOF:
             return None
+        self.errors.append(f"Unexpected token {KIND_NAMES[kind]} at line {self.stream.lines[self.pos]}")
+        self.pos += 1
+        return None
+
+    def parse_id_statement(self) -> ASTNode:
+        # Could be assignment or function call
+        if self.kinds[self.pos + 1] == LPAREN:
+            expr = self.parse_expression()
+            self.expect(SEMI)
+            return expr
+        return self.parse_assignment()
 
     def parse_vardecl(self) -> VariableDecl:
-        var_type = self.expect('INT', 'FLOAT', 'BOOL').type.lower()
-        name = self.expect('ID').value
+        var_type = self.expect_type()
+        name = self.stream.identifier(self.expect(ID))
         initializer = None
-        if self.match('ASSIGN'):
+        if self.match(ASSIGN):
             initializer = self.parse_expression()
-        self.expect('SEMI')
+        self.expect(SEMI)
         return VariableDecl(var_type, name, initializer)
 
     def parse_assignment(self) -> Assignment:
-        target = Identifier(self.expect('ID').value)
-        self.expect('ASSIGN')
+        target = Identifier(self.stream.identifier(self.expect(ID)))
+        self.expect(ASSIGN)
         value = self.parse_expression()
-        self.expect('SEMI')
+        self.expect(SEMI)
         return Assignment(target, value)
 
     def parse_if(self) -> If:
-        self.expect('IF')
-        self.expect('LPAREN')
+        self.expect(IF)
+        self.expect(LPAREN)
         cond = self.parse_expression()
-        self.expect('RPAREN')
+        self.expect(RPAREN)
         then_block = self.parse_block()
         else_block = None
-        if self.match('ELSE'):
+        if self.match(ELSE):
             else_block = self.parse_block()
         return If(cond, then_block, else_block)
 
     def parse_while(self) -> While:
-        self.expect('WHILE')
-        self.expect('LPAREN')
+        self.expect(WHILE)
+        self.expect(LPAREN)
         cond = self.parse_expression()
-        self.expect('RPAREN')
+        self.expect(RPAREN)
         body = self.parse_block()
         return While(cond, body)
 
     def parse_return(self) -> Return:
-        self.expect('RETURN')
-        if self.current() and self.current().type != 'SEMI':
+        self.expect(RETURN)
+        if self.kinds[self.pos] not in (SEMI, EOF):
             value = self.parse_expression()
         else:
             value = None
-        self.expect('SEMI')
+        self.expect(SEMI)
         return Return(value)
 
     def parse_expression(self) -> Expression:
-        return self.parse_logical_or()
-
-    def parse_logical_or(self):
-        node = self.parse_logical_and()
-        while self.match('OR'):
-            right = self.parse_logical_and()
-            node = BinaryOp('||', node, right)
-        return node
-
-    def parse_logical_and(self):
-        node = self.parse_equality()
-        while self.match('AND'):
-            right = self.parse_equality()
-            node = BinaryOp('&&', node, right)
-        return node
-
-    def parse_equality(self):
-        node = self.parse_relational()
+        # Operator-precedence parse with explicit stacks: nesting depth costs list
+        # entries, not Python frames, and an operand is reached without descending
+        # through one call per precedence level.
+        kinds = self.kinds
+        stream = self.stream
+        source, starts, ends = stream.source, stream.starts, stream.ends
+        identifiers = stream.identifiers
+        binary_ops = BINARY_OPS
+        pos = self.pos
+        values = []
+        ops = []
+        calls = []
         while True:
-            if self.match('EQ'):
-                right = self.parse_relational()
-                node = BinaryOp('==', node, right)
-            elif self.match('NEQ'):
-                right = self.parse_relational()
-                node = BinaryOp('!=', node, right)
+            # Operand position
+            kind = kinds[pos]
+            if kind == ID:
+                name = source[starts[pos]:ends[pos]]
+                name = identifiers.setdefault(name, name)
+                if kinds[pos + 1] == LPAREN:
+                    pos += 2
+                    if kinds[pos] == RPAREN:
+                        pos += 1
+                        values.append(FunctionCall(name, []))
+                    elif kinds[pos] == EOF:
+                        self.pos = pos
+                        self.fail_expected((RPAREN,))
+                    else:
+                        ops.append(CALL_MARK)
+                        calls.append((name, len(values)))
+                        continue
+                else:
+                    values.append(Identifier(name))
+                    pos += 1
+            elif kind == INT_LIT:
+                values.append(Literal(int(source[starts[pos]:ends[pos]]), 'int'))
+                pos += 1
+            elif kind in LITERAL_KINDS:
+                self.pos = pos
+                values.append(self.parse_literal())
+                pos += 1
+            elif kind == LPAREN:
+                ops.append(PAREN_MARK)
+                pos += 1
+                continue
+            elif kind in UNARY_OPS:
+                ops.append(UNARY_OPS[kind])
+                pos += 1
+                continue
+            elif kind == EOF:
+                self.pos = pos
+                raise ParserError("Unexpected EOF in expression")
             else:
-                break
-        return node
-
-    def parse_relational(self):
-        node = self.parse_additive()
-        while True:
-            if self.match('LT'):
-                right = self.parse_additive()
-                node = BinaryOp('<', node, right)
-            elif self.match('LE'):
-                right = self.parse_additive()
-                node = BinaryOp('<=', node, right)
-            elif self.match('GT'):
-                right = self.parse_additive()
-                node = BinaryOp('>', node, right)
-            elif self.match('GE'):
-                right = self.parse_additive()
-                node = BinaryOp('>=', node, right)
-            else:
-                break
-        return node
-
-    def parse_additive(self):
-        node = self.parse_term()
-        while True:
-            if self.match('PLUS'):
-                right = self.parse_term()
-                node = BinaryOp('+', node, right)
-            elif self.match('MINUS'):
-                right = self.parse_term()
-                node = BinaryOp('-', node, right)
-            else:
-                break
-        return node
-
-    def parse_term(self):
-        node = self.parse_factor()
-        while True:
-            if self.match('MUL'):
-                right = self.parse_factor()
-                node = BinaryOp('*', node, right)
-            elif self.match('DIV'):
-                right = self.parse_factor()
-                node = BinaryOp('/', node, right)
-            else:
-                break
-        return node
-
-    def parse_factor(self):
-        token = self.current()
-        if token is None:
-            raise ParserError("Unexpected EOF in expression")
-        if token.type == 'LPAREN':
-            self.match('LPAREN')
-            expr = self.parse_expression()
-            self.expect('RPAREN')
-            return expr
-        elif token.type == 'MINUS':
-            self.match('MINUS')
-            operand = self.parse_factor()
-            return UnaryOp('-', operand)
-        elif token.type == 'NOT':
-            self.match('NOT')
-            operand = self.parse_factor()
-            return UnaryOp('!', operand)
-        elif token.type == 'ID':
-            if self.lookahead(1) and self.lookahead(1).type == 'LPAREN':
-                return self.parse_function_call()
-            else:
-                return Identifier(self.match('ID').value)
-        elif token.type in ('INT_LIT', 'FLOAT_LIT', 'TRUE', 'FALSE'):
-            return self.parse_literal()
-        else:
-            raise ParserError(f"Unexpected token {token.type} in expression at line {token.line}")
-
-    def parse_function_call(self) -> FunctionCall:
-        name = self.expect('ID').value
-        self.expect('LPAREN')
-        args = []
-        if self.current() and self.current().type != 'RPAREN':
+                self.pos = pos
+                raise ParserError(f"Unexpected token {KIND_NAMES[kind]} in expression at line {stream.lines[pos]}")
+            # Operator position: closing parens and call arguments keep us here
             while True:
-                args.append(self.parse_expression())
-                if not self.match('COMMA'):
+                kind = kinds[pos]
+                op = binary_ops.get(kind)
+                if op is not None:
+                    precedence = op[0]
+                    while ops and ops[-1][0] >= precedence:
+                        top = ops.pop()
+                        if top[2] == 2:
+                            right = values.pop()
+                            values[-1] = BinaryOp(top[1], values[-1], right)
+                        else:
+                            values[-1] = UnaryOp(top[1], values[-1])
+                    ops.append(op)
+                    pos += 1
+                    break
+                # The innermost sub-expression ends here; markers have precedence 0
+                while ops and ops[-1][0] > 0:
+                    top = ops.pop()
+                    if top[2] == 2:
+                        right = values.pop()
+                        values[-1] = BinaryOp(top[1], values[-1], right)
+                    else:
+                        values[-1] = UnaryOp(top[1], values[-1])
+                self.pos = pos
+                if not ops:
+                    return values[-1]
+                if ops[-1] is PAREN_MARK:
+                    if kind != RPAREN:
+                        self.fail_expected((RPAREN,))
+                    ops.pop()
+                    pos += 1
+                elif kind == COMMA:
+                    pos += 1
                     break
-        self.expect('RPAREN')
-        return FunctionCall(name, args)
+                else:
+                    if kind != RPAREN:
+                        self.fail_expected((RPAREN,))
+                    ops.pop()
+                    name, base = calls.pop()
+                    args = values[base:]
+                    del values[base:]
+                    values.append(FunctionCall(name, args))
+                    pos += 1
 
     def parse_literal(self) -> Literal:
-        token = self.current()
-        if token.type == 'INT_LIT':
-            self.match('INT_LIT')
-            return Literal(int(token.value), 'int')
-        elif token.type == 'FLOAT_LIT':
-            self.match('FLOAT_LIT')
-            return Literal(float(token.value), 'float')
-        elif token.type == 'TRUE':
-            self.match('TRUE')
+        pos = self.pos
+        kind = self.kinds[pos]
+        self.pos += 1
+        if kind == INT_LIT:
+            return Literal(int(self.stream.text(pos)), 'int')
+        elif kind == FLOAT_LIT:
+            return Literal(float(self.stream.text(pos)), 'float')
+        elif kind == TRUE:
             return Literal(True, 'bool')
-        elif token.type == 'FALSE':
-            self.match('FALSE')
+        elif kind == FALSE:
             return Literal(False, 'bool')
         else:
-            raise ParserError(f"Invalid literal {token.value} at line {token.line}")
+            self.pos = pos
+            raise ParserError(f"Invalid literal {self.stream.text(pos)} at line {self.stream.lines[pos]}")
 
     def lookahead(self, n):
-        if self.pos + n < len(self.tokens):
-            return self.tokens[self.pos + n]
+        if self.pos + n < len(self.stream):
+            return self.stream.token(self.pos + n)
         return None
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+from lexer import Lexer
+from dfa_lexer import DFALexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from tac import TACGenerator, TACInstruction
+from minilang_ast import Program
+from parallel import ParallelBackend
+from fused import FusedCompiler
+from ssa import propagate_constants
+from lvn import LocalValueNumbering
+from loops import LoopOptimizer
+from regalloc import LinearScan
+from inliner import Inliner
+from instrumentation import Metrics
+from typing import Dict, List, Optional
+
+# Bump whenever a phase changes its output, so cached results from older compilers are ignored
+COMPILER_VERSION = '1.8'
+
+SCANNERS = {'regex': Lexer, 'dfa': DFALexer}
+
+class CompilationResult:
+    """Everything the front end produces for one source file."""
+    def __init__(self, ast: Program, symbols: List[str], lexical_errors: List[str],
+                 syntax_errors: List[str], semantic_errors: List[str],
+                 tac: List[TACInstruction], token_count: int):
+        self.ast = ast
+        self.symbols = symbols
+        self.lexical_errors = lexical_errors
+        self.syntax_errors = syntax_errors
+        self.semantic_errors = semantic_errors
+        self.tac = tac
+        self.token_count = token_count
+        self.unoptimized_size: Optional[int] = None
+        self.inline_report: Optional[str] = None
+        self.cached = False
+
+    @property
+    def errors(self) -> List[str]:
+        return self.lexical_errors + self.syntax_errors + self.semantic_errors
+
+def optimize_tac(tac: List[TACInstruction], registers: Optional[int] = None) -> List[TACInstruction]:
+    tac = LoopOptimizer().run(propagate_constants(tac))
+    return LinearScan(registers).run(LocalValueNumbering().run(tac))
+
+def compile_source(code: str, scanner: str = 'regex', cache=None, workers: Optional[int] = None,
+                   mode: str = 'process', fused: bool = False, optimize: bool = False,
+                   registers: Optional[int] = None, inline_size: Optional[int] = None,
+                   tail_calls: bool = False, metrics: Optional[Metrics] = None) -> CompilationResult:
+    # workers: analyse and lower functions on a pool (see ParallelBackend); TAC then uses
+    # per-function temp/label numbering. fused: analyse and lower in one pass (same output).
+    # optimize: run optimize_tac on the result. registers: fit each function's temps into
+    # this many, spilling the rest (see LinearScan). inline_size: first inline calls to
+    # non-recursive functions of at most this many instructions (see Inliner). tail_calls:
+    # turn self-recursive tail calls into jumps (see TACGenerator). metrics: record phase
+    # spans and counters there (see Metrics)
+    options = {'scanner': scanner}
+    if workers is not None:
+        options['tac'] = 'per-function'
+    if optimize:
+        options['optimize'] = '1'
+    if registers is not None:
+        options['registers'] = str(registers)
+    if inline_size is not None:
+        options['inline_size'] = str(inline_size)
+    if tail_calls:
+        options['tail_calls'] = '1'
+    recording = metrics is not None
+    if metrics is None:
+        metrics = Metrics()
+    key = None
+    if cache is not None:
+        with metrics.span('cache'):
+            key = cache.key(code, options)
+            result = cache.get(key)
+        if result is not None:
+            if recording:
+                metrics.count('cache.hits')
+            result.cached = True
+            return result
+    with metrics.span('lex'):
+        lexer = SCANNERS[scanner](code)
+        tokens = lexer.tokenize_compact()
+    with metrics.span('parse'):
+        parser = Parser(tokens)
+        ast = parser.parse()
+    if workers is not None:
+        with metrics.span('backend'):
+            global_table, semantic_errors, tac = ParallelBackend(workers, mode, tail_calls).run(ast)
+    elif fused:
+        with metrics.span('fused'):
+            compiler = FusedCompiler(tail_calls=tail_calls)
+            semantic_errors, tac = compiler.compile(ast)
+            global_table = compiler.global_table
+    else:
+        analyzer = SemanticAnalyzer()
+        with metrics.span('semantic'):
+            if metrics.per_function:
+                analyzer.declare_functions(ast.functions)
+                for func in ast.functions:
+                    with metrics.span(f"semantic:{func.name}"):
+                        analyzer.analyze_function(func)
+                analyzer.symbol_stack.pop()
+            else:
+                analyzer.analyze(ast)
+        global_table, semantic_errors = analyzer.global_table, analyzer.errors
+        tacgen = TACGenerator(tail_calls=tail_calls)
+        with metrics.span('tac'):
+            if metrics.per_function:
+                for func in ast.functions:
+                    with metrics.span(f"tac:{func.name}"):
+                        tacgen.gen_function(func)
+                tac = tacgen.instructions
+            else:
+                tac = tacgen.generate(ast)
+    if recording:
+        metrics.count_tokens(tokens)
+        metrics.count_ast(ast)
+        metrics.count_tac(tac)
+    unoptimized_size = None
+    inline_report = None
+    if inline_size is not None:
+        unoptimized_size = len(tac)
+        inliner = Inliner(inline_size)
+        with metrics.span('inline'):
+            tac = inliner.run(tac, ast)
+        inline_report = inliner.report()
+    if optimize:
+        unoptimized_size = unoptimized_size or len(tac)
+        with metrics.span('optimize'):
+            tac = optimize_tac(tac, registers)
+    elif registers is not None:
+        with metrics.span('regalloc'):
+            tac = LinearScan(registers).run(tac)
+    if recording:
+        if unoptimized_size is not None or registers is not None:
+            metrics.count_tac(tac, 'optimized')
+        metrics.count_errors(lexer.errors, parser.errors, semantic_errors)
+    symbols = [str(sym) for sym in global_table.symbols.values()]
+    result = CompilationResult(ast, symbols, lexer.errors, parser.errors, semantic_errors, tac, len(tokens))
+    result.unoptimized_size = unoptimized_size
+    result.inline_report = inline_report
+    if cache is not None:
+        cache.put(key, result)
+    return result
@@ -0,0 +1,163 @@
+import ast
+from typing import Callable, Dict, List
+
+from minilang_ast import *
+from semantic import SemanticAnalyzer
+
+def divide(a, b):
+    # MiniLang++ int division truncates toward zero, like the TAC constant folder and VM
+    q = a // b
+    if q < 0 and q * b != a:
+        q += 1
+    return q
+
+ARITH_OPS = {'+': ast.Add, '-': ast.Sub, '*': ast.Mult, '/': ast.Div}
+COMPARE_OPS = {'==': ast.Eq, '!=': ast.NotEq, '<': ast.Lt, '<=': ast.LtE, '>': ast.Gt, '>=': ast.GtE}
+# Bools with & and | give bools, and evaluate both operands as the TAC does
+LOGIC_OPS = {'&&': ast.BitAnd, '||': ast.BitOr}
+
+class BackendError(Exception):
+    pass
+
+class PythonBackend:
+    """Translates a checked MiniLang++ Program into a Python ast.Module.
+
+    Functions become ``f_<name>`` and variables ``v_<name>``, so MiniLang++
+    names can't clash with Python keywords, builtins or the runtime helpers.
+    A declaration that shadows an outer one gets a numbered name of its own,
+    ``v<N>_<name>``. Int division goes through ``_div``; everything else is
+    plain Python arithmetic on ints, floats and bools. Calls are Python
+    calls, so recursion is bounded by Python's recursion limit. Names are
+    never looked up here: identifiers and calls go through the symbols
+    semantic analysis attached to them, variables by frame slot.
+    """
+    def __init__(self):
+        self.names: Dict[str, int] = {}
+        self.slots: List[str] = []
+        self.unset: List[str] = []
+
+    def translate(self, program: Program) -> ast.Module:
+        if any(node.symbol is None for node in iter_nodes(program) if isinstance(node, (Identifier, FunctionCall))):
+            # Trees analysed on worker processes come back without their annotations
+            SemanticAnalyzer().analyze(program)
+        body = [self.translate_function(func) for func in program.functions]
+        module = ast.Module(body=body, type_ignores=[])
+        return ast.fix_missing_locations(module)
+
+    def compile(self, program: Program, filename: str = '<minilang>') -> Dict[str, Callable]:
+        namespace = {'_div': divide}
+        exec(compile(self.translate(program), filename, 'exec'), namespace)
+        return {func.name: namespace[f"f_{func.name}"] for func in program.functions}
+
+    def declare(self, name: str) -> str:
+        # Declarations come in the analyzer's order, so the Nth one here has frame slot N
+        count = self.names.get(name, 0)
+        self.names[name] = count + 1
+        # v<N>_ can't start the plain mangling of any identifier, unlike a v_<name>_<N> suffix
+        py_name = f"v_{name}" if count == 0 else f"v{count}_{name}"
+        self.slots.append(py_name)
+        return py_name
+
+    def variable(self, ident: Identifier) -> str:
+        if ident.symbol is None:
+            raise BackendError(f"Undeclared identifier: {ident.name}")
+        return self.slots[ident.symbol.slot]
+
+    def translate_function(self, func: FunctionDef) -> ast.FunctionDef:
+        self.names = {}
+        self.slots = []
+        self.unset = []
+        args = [ast.arg(arg=self.declare(param.name)) for param in func.params]
+        body = self.translate_block(func.body)
+        if self.unset:
+            # Declarations without an initializer start out None on entry, like a VM frame slot,
+            # and keep their value from one loop iteration to the next
+            targets = [ast.Name(id=name, ctx=ast.Store()) for name in self.unset]
+            body.insert(0, ast.Assign(targets=targets, value=ast.Constant(value=None)))
+        return ast.FunctionDef(name=f"f_{func.name}",
+                               args=ast.arguments(posonlyargs=[], args=args, kwonlyargs=[], kw_defaults=[],
+                                                  defaults=[]),
+                               body=body, decorator_list=[], returns=None)
+
+    def translate_block(self, block: Block) -> List[ast.stmt]:
+        body = []
+        for stmt in block.statements:
+            body.extend(self.translate_stmt(stmt))
+        return body or [ast.Pass()]
+
+    def translate_stmt(self, stmt: ASTNode) -> List[ast.stmt]:
+        if isinstance(stmt, VariableDecl):
+            # Declared before its initializer is read, as the semantic analyzer does
+            target = self.declare(stmt.name)
+            if stmt.initializer is None:
+                self.unset.append(target)
+                return []
+            value = self.translate_expr(stmt.initializer)[0]
+            return [ast.Assign(targets=[ast.Name(id=target, ctx=ast.Store())], value=value)]
+        if isinstance(stmt, Assignment):
+            value = self.translate_expr(stmt.value)[0]
+            target = self.variable(stmt.target)
+            return [ast.Assign(targets=[ast.Name(id=target, ctx=ast.Store())], value=value)]
+        if isinstance(stmt, If):
+            test = self.translate_expr(stmt.condition)[0]
+            body = self.translate_block(stmt.then_block)
+            orelse = self.translate_block(stmt.else_block) if stmt.else_block else []
+            return [ast.If(test=test, body=body, orelse=orelse)]
+        if isinstance(stmt, While):
+            test = self.translate_expr(stmt.condition)[0]
+            return [ast.While(test=test, body=self.translate_block(stmt.body), orelse=[])]
+        if isinstance(stmt, Return):
+            value = self.translate_expr(stmt.value)[0] if stmt.value else None
+            return [ast.Return(value=value)]
+        if isinstance(stmt, FunctionCall):
+            return [ast.Expr(value=self.translate_expr(stmt)[0])]
+        if isinstance(stmt, Block):
+            # Python has no block scope; the nested block's names are already distinct
+            body = self.translate_block(stmt)
+            return [] if isinstance(body[0], ast.Pass) else body
+        raise BackendError(f"Unknown statement type: {type(stmt)}")
+
+    def translate_expr(self, expr: Expression) -> tuple:
+        # (Python expression, MiniLang++ type)
+        if isinstance(expr, Literal):
+            return ast.Constant(value=expr.value), expr.typ
+        if isinstance(expr, Identifier):
+            return ast.Name(id=self.variable(expr), ctx=ast.Load()), expr.symbol.type
+        if isinstance(expr, BinaryOp):
+            left, typ = self.translate_expr(expr.left)
+            right = self.translate_expr(expr.right)[0]
+            op = expr.op
+            if op == '/' and typ == 'int':
+                return ast.Call(func=ast.Name(id='_div', ctx=ast.Load()), args=[left, right], keywords=[]), typ
+            if op in ARITH_OPS:
+                return ast.BinOp(left=left, op=ARITH_OPS[op](), right=right), typ
+            if op in COMPARE_OPS:
+                return ast.Compare(left=left, ops=[COMPARE_OPS[op]()], comparators=[right]), 'bool'
+            if op in LOGIC_OPS:
+                return ast.BinOp(left=left, op=LOGIC_OPS[op](), right=right), 'bool'
+            raise BackendError(f"Unknown operator: {op}")
+        if isinstance(expr, UnaryOp):
+            operand, typ = self.translate_expr(expr.operand)
+            if expr.op == '-':
+                return ast.UnaryOp(op=ast.USub(), operand=operand), typ
+            return ast.UnaryOp(op=ast.Not(), operand=operand), 'bool'
+        if isinstance(expr, FunctionCall):
+            if expr.symbol is None:
+                raise BackendError(f"Undeclared function: {expr.name}")
+            args = [self.translate_expr(arg)[0] for arg in expr.args]
+            call = ast.Call(func=ast.Name(id=f"f_{expr.name}", ctx=ast.Load()), args=args, keywords=[])
+            return call, expr.symbol.type
+        raise BackendError(f"Unknown expression type: {type(expr)}")
+
+def python_source(program: Program) -> str:
+    return ast.unparse(PythonBackend().translate(program))
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    program = Parser(Lexer(code).tokenize()).parse()
+    print(python_source(program))
+    functions = PythonBackend().compile(program)
+    print(f"\nmain() returned {functions['main']()!r}")
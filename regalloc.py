@@ -0,0 +1,169 @@
+from heapq import heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+from cfg import ControlFlowGraph, defines, split_functions, uses
+from dataflow import Liveness
+from tac import TACInstruction
+from tac_buffer import TEMP_RE
+
+class Interval:
+    # Live range of one temp in a function's linear order. Point 2i is where
+    # instruction i reads its operands, 2i+1 where it writes its result
+    __slots__ = ('name', 'start', 'end', 'register')
+
+    def __init__(self, name: str, point: int):
+        self.name = name
+        self.start = point
+        self.end = point
+        self.register: Optional[int] = None
+
+    def __repr__(self):
+        return f"Interval({self.name!r}, {self.start}, {self.end}, {self.register})"
+
+class LinearScan:
+    """Renames each function's temps onto a small reusable set, t1..tN.
+
+    Without a budget N is the most temps live at once. With a budget of
+    ``registers`` temps, the intervals that don't fit live in frame slots
+    (``%s1``, ``%s2``, ...): every write is followed by ``%sK = spill tR`` and
+    every read preceded by ``tR = reload %sK``, through two registers kept
+    back for that. Variables are left alone.
+    """
+    def __init__(self, registers: Optional[int] = None):
+        if registers is not None and registers < 2:
+            raise ValueError("A register budget needs at least 2 registers")
+        self.registers = registers
+        self.temps = 0
+        self.used = 0
+        self.spilled = 0
+        self.spill_instructions = 0
+
+    def run(self, instructions: List[TACInstruction]) -> List[TACInstruction]:
+        out = []
+        copies = [TACInstruction(i.op, i.arg1, i.arg2, i.result) for i in instructions]
+        for function in split_functions(copies):
+            out.extend(self.allocate(ControlFlowGraph(function)))
+        return out
+
+    def intervals(self, cfg: ControlFlowGraph) -> List[Interval]:
+        liveness = Liveness(cfg)
+        universe = liveness.universe
+        temp_mask = 0
+        for name, bit in universe.index.items():
+            if TEMP_RE.fullmatch(name):
+                temp_mask |= 1 << bit
+        ranges: Dict[str, Interval] = {}
+
+        def extend(name: str, point: int):
+            interval = ranges.get(name)
+            if interval is None:
+                ranges[name] = Interval(name, point)
+            elif point < interval.start:
+                interval.start = point
+            elif point > interval.end:
+                interval.end = point
+
+        position = 0
+        for block in cfg.blocks:
+            first = position
+            for instr in block.instructions:
+                for name in uses(instr):
+                    if TEMP_RE.fullmatch(name):
+                        extend(name, 2 * position)
+                name = defines(instr)
+                if name is not None and TEMP_RE.fullmatch(name):
+                    extend(name, 2 * position + 1)
+                position += 1
+            # A temp live across the block boundary covers the whole block
+            for name in universe.members(liveness.ins[block.index] & temp_mask):
+                extend(name, 2 * first)
+            for name in universe.members(liveness.outs[block.index] & temp_mask):
+                extend(name, 2 * position - 1)
+        return sorted(ranges.values(), key=lambda interval: interval.start)
+
+    def scan(self, intervals: List[Interval], registers: Optional[int]) -> Tuple[int, List[Interval]]:
+        # Classic linear scan; when out of registers, spill whichever interval ends last
+        free: List[int] = []
+        active: List[Tuple[int, int, Interval]] = []
+        spilled = []
+        count = 0
+        for k, interval in enumerate(intervals):
+            interval.register = None
+            while active and active[0][0] < interval.start:
+                heappush(free, heappop(active)[2].register)
+            if free:
+                interval.register = heappop(free)
+            elif registers is None or count < registers:
+                interval.register = count
+                count += 1
+            else:
+                victim = max(active, key=lambda entry: entry[0], default=None)
+                if victim is None or victim[0] <= interval.end:
+                    spilled.append(interval)
+                    continue
+                interval.register = victim[2].register
+                victim[2].register = None
+                spilled.append(victim[2])
+                active.remove(victim)
+                active.sort(key=lambda entry: entry[:2])
+            heappush(active, (interval.end, k, interval))
+        return count, spilled
+
+    def allocate(self, cfg: ControlFlowGraph) -> List[TACInstruction]:
+        intervals = self.intervals(cfg)
+        self.temps += len(intervals)
+        used, spilled = self.scan(intervals, self.registers)
+        scratch: List[str] = []
+        if spilled:
+            # Rerun with two registers reserved for reloads and spills
+            budget = self.registers - 2
+            used, spilled = self.scan(intervals, budget)
+            scratch = [f"t{budget + 1}", f"t{budget + 2}"]
+            used = self.registers
+        self.used = max(self.used, used)
+        self.spilled += len(spilled)
+        names = {interval.name: f"t{interval.register + 1}" for interval in intervals
+                 if interval.register is not None}
+        slots = {interval.name: f"%s{k + 1}" for k, interval in enumerate(spilled)}
+        out = []
+        for block in cfg.blocks:
+            for instr in block.instructions:
+                if instr.op not in ('label', 'goto', 'call'):
+                    reloaded: Dict[str, str] = {}
+                    for field in ('arg1', 'arg2'):
+                        operand = getattr(instr, field)
+                        if operand in names:
+                            setattr(instr, field, names[operand])
+                        elif operand in slots:
+                            if operand not in reloaded:
+                                reloaded[operand] = scratch[len(reloaded)]
+                                out.append(TACInstruction('reload', slots[operand], None, reloaded[operand]))
+                                self.spill_instructions += 1
+                            setattr(instr, field, reloaded[operand])
+                out.append(instr)
+                name = defines(instr)
+                if name in names:
+                    instr.result = names[name]
+                elif name in slots:
+                    instr.result = scratch[0]
+                    out.append(TACInstruction('spill', scratch[0], None, slots[name]))
+                    self.spill_instructions += 1
+        return out
+
+    def report(self) -> str:
+        budget = "no budget" if self.registers is None else f"budget {self.registers}"
+        return (f"{self.temps} temp(s) mapped onto at most {self.used} ({budget}), "
+                f"{self.spilled} spilled, {self.spill_instructions} spill/reload instruction(s)")
+
+if __name__ == "__main__":
+    import sys
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    tac = TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+    allocator = LinearScan(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    for instr in allocator.run(tac):
+        print(instr)
+    print(f"\n{allocator.report()}")
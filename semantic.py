@@ -6,32 +6,44 @@ class SemanticAnalyzer:
     def __init__(self):
         self.errors: List[str] = []
         self.symbol_stack = SymbolTableStack()
+        self.global_table: Optional[SymbolTable] = None
+        self.frame_size = 0
 
     def analyze(self, program: Program):
-        # Global scope
-        global_table = SymbolTable('global')
-        self.symbol_stack.push(global_table)
-        # Register all function signatures first
-        for func in program.functions:
-            if global_table.lookup(func.name):
-                self.errors.append(f"Function redeclaration: {func.name}")
-            else:
-                param_types = [(p.var_type, p.name) for p in func.params]
-                global_table.add(Symbol(func.name, func.return_type, 'function', param_types))
+        self.declare_functions(program.functions)
         # Analyze each function body
         for func in program.functions:
             self.analyze_function(func)
         self.symbol_stack.pop()
 
+    def declare_functions(self, functions: List[FunctionDef]) -> SymbolTable:
+        # Global scope, left on the stack for the function bodies
+        global_table = SymbolTable('global')
+        self.global_table = global_table
+        self.symbol_stack.push(global_table)
+        # Register all function signatures first
+        for func in functions:
+            param_types = [(p.var_type, p.name) for p in func.params]
+            sym = Symbol(func.name, func.return_type, 'function', param_types, len(global_table.symbols))
+            if not self.symbol_stack.declare(sym):
+                self.errors.append(f"Function redeclaration: {func.name}")
+        return global_table
+
+    def declare(self, sym: Symbol):
+        # Params and variables get consecutive frame slots within their function
+        sym.slot = self.frame_size
+        if self.symbol_stack.declare(sym):
+            self.frame_size += 1
+        else:
+            self.errors.append(f"Redeclaration of {sym.name} in scope {self.symbol_stack.top().scope_name}")
+
     def analyze_function(self, func: FunctionDef):
         func_table = SymbolTable(f'function {func.name}', self.symbol_stack.top())
         self.symbol_stack.push(func_table)
+        self.frame_size = 0
         # Add parameters
         for param in func.params:
-            try:
-                func_table.add(Symbol(param.name, param.var_type, 'parameter'))
-            except Exception as e:
-                self.errors.append(str(e))
+            self.declare(Symbol(param.name, param.var_type, 'parameter'))
         # Analyze body
         self.current_function_return_type = func.return_type
         self.analyze_block(func.body)
@@ -63,11 +75,7 @@ class SemanticAnalyzer:
             self.errors.append(f"Unknown statement type: {type(stmt)}")
 
     def analyze_vardecl(self, decl: VariableDecl):
-        table = self.symbol_stack.top()
-        try:
-            table.add(Symbol(decl.name, decl.var_type, 'variable'))
-        except Exception as e:
-            self.errors.append(str(e))
+        self.declare(Symbol(decl.name, decl.var_type, 'variable'))
         if decl.initializer:
             init_type = self.analyze_expr(decl.initializer)
             if init_type and init_type != decl.var_type:
@@ -75,6 +83,7 @@ class SemanticAnalyzer:
 
     def analyze_assignment(self, assign: Assignment):
         sym = self.symbol_stack.lookup(assign.target.name)
+        assign.target.symbol = sym
         if not sym:
             self.errors.append(f"Undeclared variable: {assign.target.name}")
             return
@@ -108,8 +117,10 @@ class SemanticAnalyzer:
     def analyze_funccall(self, call: FunctionCall) -> Optional[str]:
         sym = self.symbol_stack.lookup(call.name)
         if not sym or sym.kind != 'function':
+            call.symbol = None
             self.errors.append(f"Undeclared function: {call.name}")
             return None
+        call.symbol = sym
         param_types = sym.info
         if len(param_types) != len(call.args):
             self.errors.append(f"Function {call.name} expects {len(param_types)} args, got {len(call.args)}")
@@ -124,6 +135,7 @@ class SemanticAnalyzer:
             return expr.typ
         elif isinstance(expr, Identifier):
             sym = self.symbol_stack.lookup(expr.name)
+            expr.symbol = sym
             if not sym:
                 self.errors.append(f"Undeclared identifier: {expr.name}")
                 return None
@@ -0,0 +1,350 @@
+from typing import Dict, List, Set, Tuple
+
+from cfg import (JUMP_OPS, PURE_OPS, BasicBlock, ControlFlowGraph, build_cfgs, defines, is_name, jump_target,
+                 uses)
+from tac import TACInstruction, fold_binary, fold_unary, format_constant, parse_constant
+
+def base_name(name: str) -> str:
+    return name.partition('#')[0]
+
+class SSAFunction:
+    """One function's CFG in SSA form: every name assigned once, versions spelled ``x#n``.
+
+    A phi is a TACInstruction('phi', [operand per predecessor], None, result),
+    with operands in the order of ``block.preds``. The unversioned name stands
+    for the value on entry (a parameter, or an uninitialised variable).
+    """
+    def __init__(self, cfg: ControlFlowGraph):
+        self.cfg = cfg
+        cfg.remove_unreachable()
+        self.idom = cfg.dominators()
+        self.insert_phis()
+        self.rename()
+
+    def insert_phis(self):
+        cfg = self.cfg
+        frontiers = cfg.dominance_frontiers(self.idom)
+        def_blocks: Dict[str, Set[int]] = {}
+        # Semi-pruned: only names read before being written in some block can need a phi
+        # (the generator's temps never do)
+        exposed: Set[str] = set()
+        for block in cfg.blocks:
+            written: Set[str] = set()
+            for instr in block.instructions:
+                exposed.update(name for name in uses(instr) if name not in written)
+                name = defines(instr)
+                if name is not None:
+                    written.add(name)
+                    def_blocks.setdefault(name, set()).add(block.index)
+        def_blocks = {name: blocks for name, blocks in def_blocks.items() if name in exposed}
+        phis: List[List[str]] = [[] for _ in cfg.blocks]
+        for name, blocks in def_blocks.items():
+            placed: Set[int] = set()
+            work = list(blocks)
+            while work:
+                index = work.pop()
+                for frontier in frontiers[index]:
+                    if frontier not in placed:
+                        placed.add(frontier)
+                        phis[frontier].append(name)
+                        if frontier not in blocks:
+                            work.append(frontier)
+        for block in cfg.blocks:
+            start = 1 if block.instructions and block.instructions[0].op == 'label' else 0
+            block.instructions[start:start] = [
+                TACInstruction('phi', [name] * len(block.preds), None, name) for name in phis[block.index]]
+
+    def rename(self):
+        cfg = self.cfg
+        children: List[List[BasicBlock]] = [[] for _ in cfg.blocks]
+        for block in cfg.blocks:
+            parent = self.idom[block.index]
+            if parent is not None:
+                children[parent.index].append(block)
+        counters: Dict[str, int] = {}
+        stacks: Dict[str, List[str]] = {}
+
+        def current(name: str) -> str:
+            versions = stacks.get(name)
+            return versions[-1] if versions else name
+
+        # Walk the dominator tree with an explicit stack; ('exit', names) pops what a block pushed
+        work: list = [('enter', cfg.entry)]
+        while work:
+            action, item = work.pop()
+            if action == 'exit':
+                for name in item:
+                    stacks[name].pop()
+                continue
+            block = item
+            pushed = []
+            for instr in block.instructions:
+                if instr.op not in ('phi', 'label', 'goto', 'call'):
+                    if is_name(instr.arg1):
+                        instr.arg1 = current(instr.arg1)
+                    if is_name(instr.arg2):
+                        instr.arg2 = current(instr.arg2)
+                name = defines(instr)
+                if name is not None:
+                    version = counters.get(name, 0) + 1
+                    counters[name] = version
+                    renamed = f"{name}#{version}"
+                    stacks.setdefault(name, []).append(renamed)
+                    pushed.append(name)
+                    instr.result = renamed
+            for succ in block.succs:
+                slot = succ.preds.index(block)
+                for instr in succ.instructions:
+                    if instr.op == 'phi':
+                        instr.arg1[slot] = current(instr.arg1[slot])
+                    elif instr.op != 'label':
+                        break
+            work.append(('exit', pushed))
+            for child in reversed(children[block.index]):
+                work.append(('enter', child))
+
+class _Top:
+    def __repr__(self):
+        return 'TOP'
+
+class _Bottom:
+    def __repr__(self):
+        return 'BOTTOM'
+
+TOP = _Top()
+BOTTOM = _Bottom()
+
+def same_constant(a, b) -> bool:
+    return type(a) is type(b) and repr(a) == repr(b)
+
+def meet(a, b):
+    if a is TOP:
+        return b
+    if b is TOP or a is b:
+        return a
+    if a is BOTTOM or b is BOTTOM or not same_constant(a, b):
+        return BOTTOM
+    return a
+
+class SCCP:
+    """Sparse conditional constant propagation (Wegman & Zadeck) over an SSAFunction.
+
+    values maps every SSA name to TOP, BOTTOM or a constant (int, float or
+    bool); executable holds the (pred index, block index) edges that can run.
+    """
+    def __init__(self, function: SSAFunction):
+        self.function = function
+        self.cfg = function.cfg
+        self.values: Dict[str, object] = {}
+        self.executable: Set[Tuple[int, int]] = set()
+        self.visited: Set[int] = set()
+        self.users: Dict[str, List[Tuple[BasicBlock, TACInstruction]]] = {}
+        for block in self.cfg.blocks:
+            for instr in block.instructions:
+                for name in uses(instr):
+                    self.users.setdefault(name, []).append((block, instr))
+        self.solve()
+
+    def value(self, operand):
+        if operand is None:
+            return TOP
+        constant = parse_constant(operand)
+        if constant is not None:
+            return constant
+        if '#' not in operand:
+            return BOTTOM
+        return self.values.get(operand, TOP)
+
+    def solve(self):
+        flow = [(-1, self.cfg.entry.index)]
+        names: List[str] = []
+        blocks = self.cfg.blocks
+        while flow or names:
+            while flow:
+                pred, index = flow.pop()
+                if (pred, index) in self.executable:
+                    continue
+                self.executable.add((pred, index))
+                block = blocks[index]
+                if index in self.visited:
+                    for instr in block.instructions:
+                        if instr.op == 'phi':
+                            self.evaluate(block, instr, flow, names)
+                    continue
+                self.visited.add(index)
+                for instr in block.instructions:
+                    self.evaluate(block, instr, flow, names)
+                if block.terminator is None and block.succs:
+                    flow.append((index, block.succs[0].index))
+            while names:
+                name = names.pop()
+                for block, instr in self.users.get(name, ()):
+                    if block.index in self.visited:
+                        self.evaluate(block, instr, flow, names)
+
+    def evaluate(self, block: BasicBlock, instr: TACInstruction, flow: list, names: list):
+        op = instr.op
+        if op == 'goto':
+            flow.append((block.index, self.cfg.label_blocks[instr.arg1].index))
+            return
+        if op in ('ifz', 'ifnz'):
+            cond = self.value(instr.arg1)
+            if cond is TOP:
+                return
+            target = self.cfg.label_blocks[instr.result].index
+            fallthrough = block.index + 1 if block.index + 1 < len(self.cfg.blocks) else None
+            if cond is BOTTOM:
+                flow.append((block.index, target))
+                if fallthrough is not None:
+                    flow.append((block.index, fallthrough))
+            elif (not cond) == (op == 'ifz'):
+                flow.append((block.index, target))
+            elif fallthrough is not None:
+                flow.append((block.index, fallthrough))
+            return
+        result = defines(instr)
+        if result is None:
+            return
+        if op == 'phi':
+            new = TOP
+            for pred, arg in zip(block.preds, instr.arg1):
+                if (pred.index, block.index) in self.executable:
+                    new = meet(new, self.value(arg))
+        elif op == '=':
+            new = self.value(instr.arg1)
+        elif op == 'call':
+            new = BOTTOM
+        elif instr.arg2 is None:
+            operand = self.value(instr.arg1)
+            if operand is TOP or operand is BOTTOM:
+                new = operand
+            else:
+                new = fold_unary(op, operand)
+                new = BOTTOM if new is None else new
+        else:
+            left = self.value(instr.arg1)
+            right = self.value(instr.arg2)
+            if left is BOTTOM or right is BOTTOM:
+                new = BOTTOM
+            elif left is TOP or right is TOP:
+                new = TOP
+            else:
+                new = fold_binary(op, left, right)
+                new = BOTTOM if new is None else new
+        old = self.values.get(result, TOP)
+        if old is not TOP:
+            # Values only move down the lattice; meet keeps old when nothing changed
+            new = meet(old, new)
+        if new is not old:
+            self.values[result] = new
+            names.append(result)
+
+    def apply(self):
+        # Substitute constants, settle constant branches, drop dead blocks and unused constant defs
+        cfg = self.cfg
+        constant = lambda operand: (is_name(operand) and operand in self.values
+                                    and self.values[operand] is not TOP and self.values[operand] is not BOTTOM)
+        for block in cfg.blocks:
+            if block.index not in self.visited:
+                continue
+            kept = []
+            for instr in block.instructions:
+                if instr.op != 'phi' and instr.op not in ('label', 'goto', 'call'):
+                    if constant(instr.arg1):
+                        instr.arg1 = format_constant(self.values[instr.arg1])
+                    if constant(instr.arg2):
+                        instr.arg2 = format_constant(self.values[instr.arg2])
+                if instr.op in ('ifz', 'ifnz'):
+                    cond = parse_constant(instr.arg1)
+                    if cond is not None:
+                        if (not cond) == (instr.op == 'ifz'):
+                            kept.append(TACInstruction('goto', instr.result))
+                        continue
+                kept.append(instr)
+            block.instructions = kept
+        cfg.blocks = [block for block in cfg.blocks if block.index in self.visited]
+        cfg.label_blocks = {label: block for label, block in cfg.label_blocks.items()
+                            if block.index in self.visited}
+        for index, block in enumerate(cfg.blocks):
+            block.index = index
+        cfg.link()
+        remove_dead_constants(cfg, self.values)
+
+def remove_dead_constants(cfg: ControlFlowGraph, values: Dict[str, object]):
+    # Drop unread phis, and pure definitions of constant-valued names nothing reads any more
+    count: Dict[str, int] = {}
+    defs: Dict[str, TACInstruction] = {}
+    for block in cfg.blocks:
+        for instr in block.instructions:
+            for name in uses(instr):
+                count[name] = count.get(name, 0) + 1
+            name = defines(instr)
+            if name is not None:
+                defs[name] = instr
+    dead: Set[int] = set()
+    removable = lambda name, instr: instr.op == 'phi' or (instr.op in PURE_OPS
+                                                          and values.get(name, TOP) not in (TOP, BOTTOM))
+    work = [name for name, instr in defs.items() if not count.get(name) and removable(name, instr)]
+    while work:
+        name = work.pop()
+        instr = defs[name]
+        if id(instr) in dead:
+            continue
+        dead.add(id(instr))
+        for used in uses(instr):
+            count[used] -= 1
+            used_def = defs.get(used)
+            if not count[used] and used_def is not None and removable(used, used_def):
+                work.append(used)
+    for block in cfg.blocks:
+        block.instructions = [instr for instr in block.instructions if id(instr) not in dead]
+
+def from_ssa(function: SSAFunction) -> List[TACInstruction]:
+    # Versions of one name never overlap (nothing was moved or copy-propagated), so
+    # dropping phis and version suffixes gives back ordinary TAC
+    instrs = []
+    for block in function.cfg.blocks:
+        for instr in block.instructions:
+            if instr.op == 'phi':
+                continue
+            if instr.op not in ('label', 'goto'):
+                if is_name(instr.arg1) and instr.op != 'call':
+                    instr.arg1 = base_name(instr.arg1)
+                if is_name(instr.arg2):
+                    instr.arg2 = base_name(instr.arg2)
+                if isinstance(instr.result, str) and instr.op not in ('ifz', 'ifnz'):
+                    instr.result = base_name(instr.result)
+            instrs.append(instr)
+    # A goto to the very next label is a no-op once constant branches are settled
+    instrs = [instr for k, instr in enumerate(instrs)
+              if not (instr.op == 'goto' and k + 1 < len(instrs) and instrs[k + 1].op == 'label'
+                      and instrs[k + 1].result == instr.arg1)]
+    # Labels nothing jumps to any more would read as function entries; keep only the real one
+    targets = {jump_target(instr) for instr in instrs if instr.op in JUMP_OPS}
+    return [instr for k, instr in enumerate(instrs)
+            if instr.op != 'label' or k == 0 or instr.result in targets]
+
+def propagate_constants(instructions: List[TACInstruction]) -> List[TACInstruction]:
+    """SSA + SCCP over each function of a TAC listing; returns new TAC.
+
+    Folds typed constants through variables and phis, turns constant
+    conditional jumps into gotos or fall-throughs, and removes unreachable
+    blocks and constant definitions nobody reads.
+    """
+    out = []
+    # Passes rewrite instructions in place, so work on copies
+    for cfg in build_cfgs(TACInstruction(i.op, i.arg1, i.arg2, i.result) for i in instructions):
+        function = SSAFunction(cfg)
+        SCCP(function).apply()
+        out.extend(from_ssa(function))
+    return out
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    tac = TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+    for instr in propagate_constants(tac):
+        print(instr)
@@ -1,11 +1,13 @@
 from typing import Dict, Optional, List
 
 class Symbol:
-    def __init__(self, name: str, sym_type: str, kind: str, info=None):
+    __slots__ = ('name', 'type', 'kind', 'info', 'slot')
+    def __init__(self, name: str, sym_type: str, kind: str, info=None, slot: Optional[int] = None):
         self.name = name
         self.type = sym_type  # int, float, bool, function
         self.kind = kind      # variable, function, parameter
         self.info = info      # Additional info (e.g., params for functions)
+        self.slot = slot      # Frame slot for params/variables, declaration index for functions
     def __str__(self):
         return f"Symbol(name={self.name}, type={self.type}, kind={self.kind}, info={self.info})"
 
@@ -32,19 +34,50 @@ class SymbolTable:
         return out
 
 class SymbolTableStack:
+    """Open scopes, innermost last, with a shadow stack of symbols per name.
+
+    bindings[name][-1] is the innermost visible declaration, so lookup is a
+    dict access whatever the nesting depth, and popping a scope only touches
+    the names it declared. Declare through the stack (not SymbolTable.add) while
+    a table is open so the bindings stay in step.
+    """
     def __init__(self):
         self.stack: List[SymbolTable] = []
+        self.bindings: Dict[str, List[Symbol]] = {}
     def push(self, table: SymbolTable):
         self.stack.append(table)
+        bindings = self.bindings
+        for name, sym in table.symbols.items():
+            shadows = bindings.get(name)
+            if shadows is None:
+                bindings[name] = [sym]
+            else:
+                shadows.append(sym)
     def pop(self):
-        return self.stack.pop()
+        table = self.stack.pop()
+        bindings = self.bindings
+        for name in table.symbols:
+            shadows = bindings[name]
+            shadows.pop()
+            if not shadows:
+                del bindings[name]
+        return table
     def top(self) -> SymbolTable:
         return self.stack[-1]
+    def declare(self, symbol: Symbol) -> bool:
+        # Adds symbol to the innermost scope; False if that scope already has the name
+        table = self.stack[-1]
+        if symbol.name in table.symbols:
+            return False
+        table.symbols[symbol.name] = symbol
+        shadows = self.bindings.get(symbol.name)
+        if shadows is None:
+            self.bindings[symbol.name] = [symbol]
+        else:
+            shadows.append(symbol)
+        return True
     def lookup(self, name: str) -> Optional[Symbol]:
-        for table in reversed(self.stack):
-            sym = table.lookup(name)
-            if sym:
-                return sym
-        return None
+        shadows = self.bindings.get(name)
+        return shadows[-1] if shadows else None
     def __str__(self):
         return '\n'.join(str(table) for table in self.stack) 
\ No newline at end of file
@@ -1,3 +1,5 @@
+import math
+
 from minilang_ast import *
 from typing import List, Tuple, Any, Optional
 
@@ -10,8 +12,10 @@ class TACInstruction:
     def __str__(self):
         if self.op == 'label':
             return f"{self.result}:"
-        elif self.op in ('goto', 'ifz', 'ifnz'):
-            return f"{self.op} {self.arg1}"
+        elif self.op == 'goto':
+            return f"goto {self.arg1}"
+        elif self.op in ('ifz', 'ifnz'):
+            return f"{self.op} {self.arg1} goto {self.result}"
         elif self.op == '=':
             return f"{self.result} = {self.arg1}"
         elif self.op == 'param':
@@ -23,6 +27,8 @@ class TACInstruction:
                 return "return"
         elif self.op == 'call':
             return f"{self.result} = {self.arg1} call {self.arg2}"
+        elif self.op == 'phi':
+            return f"{self.result} = phi {', '.join(self.arg1)}"
         elif self.arg2 is not None:
             return f"{self.result} = {self.arg1} {self.op} {self.arg2}"
         elif self.arg1 is not None:
@@ -30,11 +36,114 @@ class TACInstruction:
         else:
             return f"{self.op} {self.result}"
 
+def format_constant(value) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+def fold_unary(op: str, value):
+    # The folded value, or None when the operation can't be done at compile time
+    if op == '-' and type(value) in (int, float):
+        return -value
+    if op == '!' and type(value) is bool:
+        return not value
+    return None
+
+def fold_binary(op: str, left, right):
+    # Operands must have the same type; int division truncates toward zero and
+    # division by zero is left for run time
+    typ = type(left)
+    if typ is not type(right):
+        return None
+    if op in ('+', '-', '*', '/'):
+        if typ is bool:
+            return None
+        if op == '+':
+            result = left + right
+        elif op == '-':
+            result = left - right
+        elif op == '*':
+            result = left * right
+        elif right == 0:
+            return None
+        elif typ is int:
+            result = abs(left) // abs(right)
+            if (left < 0) != (right < 0):
+                result = -result
+        else:
+            result = left / right
+        if typ is float and not math.isfinite(result):
+            return None
+        return result
+    if op == '==':
+        return left == right
+    if op == '!=':
+        return left != right
+    if op == '<':
+        return left < right
+    if op == '<=':
+        return left <= right
+    if op == '>':
+        return left > right
+    if op == '>=':
+        return left >= right
+    if typ is bool and op == '&&':
+        return left and right
+    if typ is bool and op == '||':
+        return left or right
+    return None
+
+def parse_constant(operand: str):
+    # The value of a constant operand ('3', '2.5', 'true'), or None for names
+    if operand == 'true':
+        return True
+    if operand == 'false':
+        return False
+    if operand[:1].isdigit() or (operand[:1] == '-' and operand[1:2].isdigit()):
+        try:
+            return int(operand)
+        except ValueError:
+            return float(operand)
+    return None
+
+def is_tail_self_call(func: FunctionDef, stmt: ASTNode) -> bool:
+    # ``return f(...)`` inside f itself, with the right number of arguments
+    value = stmt.value if isinstance(stmt, Return) else None
+    return (isinstance(value, FunctionCall) and value.name == func.name
+            and len(value.args) == len(func.params))
+
+def has_tail_self_call(func: FunctionDef) -> bool:
+    stack: List[ASTNode] = [func.body]
+    while stack:
+        stmt = stack.pop()
+        if isinstance(stmt, Block):
+            stack.extend(stmt.statements)
+        elif isinstance(stmt, If):
+            stack.append(stmt.then_block)
+            if stmt.else_block:
+                stack.append(stmt.else_block)
+        elif isinstance(stmt, While):
+            stack.append(stmt.body)
+        elif is_tail_self_call(func, stmt):
+            return True
+    return False
+
 class TACGenerator:
-    def __init__(self):
+    def __init__(self, per_function: bool = False, tail_calls: bool = False):
+        # per_function: restart temp/label numbering in every function and qualify
+        # labels with the function name ('main.L1'), so a function's TAC doesn't
+        # depend on what was generated before it. tail_calls: lower ``return f(...)``
+        # inside f to parameter assignments and a jump back to f's start
         self.instructions: List[TACInstruction] = []
         self.temp_count = 0
         self.label_count = 0
+        self.per_function = per_function
+        self.label_prefix = ''
+        self.tail_calls = tail_calls
+        self.function: Optional[FunctionDef] = None
+        self.entry_label: Optional[str] = None
 
     def new_temp(self) -> str:
         self.temp_count += 1
@@ -42,7 +151,7 @@ class TACGenerator:
 
     def new_label(self) -> str:
         self.label_count += 1
-        return f"L{self.label_count}"
+        return f"{self.label_prefix}L{self.label_count}"
 
     def generate(self, program: Program) -> List[TACInstruction]:
         for func in program.functions:
@@ -50,10 +159,46 @@ class TACGenerator:
         return self.instructions
 
     def gen_function(self, func: FunctionDef):
+        if self.per_function:
+            self.temp_count = 0
+            self.label_count = 0
+            self.label_prefix = f"{func.name}."
         self.instructions.append(TACInstruction('label', result=func.name))
+        self.gen_entry(func)
         self.gen_block(func.body)
         # Optionally, add function end marker
 
+    def gen_entry(self, func: FunctionDef):
+        # Tail calls can't jump to the function's own label (nothing may target it),
+        # so a function that has them gets a second one
+        self.function = func
+        self.entry_label = None
+        if self.tail_calls and has_tail_self_call(func):
+            self.entry_label = self.new_label()
+            self.instructions.append(TACInstruction('label', result=self.entry_label))
+
+    def is_tail_call(self, ret: Return) -> bool:
+        return self.entry_label is not None and is_tail_self_call(self.function, ret)
+
+    def gen_tail_jump(self):
+        # Replace the params and call just emitted with parameter assignments and a jump.
+        # Arguments reading a parameter go through a temp, so every argument sees the old values
+        params = [param.name for param in self.function.params]
+        start = len(self.instructions) - len(params) - 1
+        args = [instr.arg1 for instr in self.instructions[start:-1]]
+        del self.instructions[start:]
+        values = []
+        for param, arg in zip(params, args):
+            if arg in params and arg != param:
+                temp = self.new_temp()
+                self.instructions.append(TACInstruction('=', arg, None, temp))
+                arg = temp
+            values.append(arg)
+        for param, value in zip(params, values):
+            if value != param:
+                self.instructions.append(TACInstruction('=', value, None, param))
+        self.instructions.append(TACInstruction('goto', self.entry_label))
+
     def gen_block(self, block: Block):
         for stmt in block.statements:
             self.gen_stmt(stmt)
@@ -73,7 +218,10 @@ class TACGenerator:
         elif isinstance(stmt, Return):
             if stmt.value:
                 temp = self.gen_expr(stmt.value)
-                self.instructions.append(TACInstruction('return', temp))
+                if self.is_tail_call(stmt):
+                    self.gen_tail_jump()
+                else:
+                    self.instructions.append(TACInstruction('return', temp))
             else:
                 self.instructions.append(TACInstruction('return'))
         elif isinstance(stmt, FunctionCall):
@@ -113,6 +261,19 @@ class TACGenerator:
         self.instructions.append(TACInstruction('call', call.name, len(arg_temps), result_temp))
         return result_temp
 
+    def gen_binary(self, op: str, left: str, right: str) -> str:
+        # Constant folding
+        left_value = parse_constant(left)
+        if left_value is not None:
+            right_value = parse_constant(right)
+            if right_value is not None:
+                folded = fold_binary(op, left_value, right_value)
+                if folded is not None:
+                    return format_constant(folded)
+        temp = self.new_temp()
+        self.instructions.append(TACInstruction(op, left, right, temp))
+        return temp
+
     def gen_expr(self, expr: Expression) -> str:
         # Constant folding for literals and simple binary ops
         if isinstance(expr, Literal):
@@ -122,13 +283,7 @@ class TACGenerator:
         elif isinstance(expr, BinaryOp):
             left = self.gen_expr(expr.left)
             right = self.gen_expr(expr.right)
-            # Constant folding
-            if left.isdigit() and right.isdigit():
-                folded = str(eval(f"{left}{expr.op}{right}"))
-                return folded
-            temp = self.new_temp()
-            self.instructions.append(TACInstruction(expr.op, left, right, temp))
-            return temp
+            return self.gen_binary(expr.op, left, right)
         elif isinstance(expr, UnaryOp):
             operand = self.gen_expr(expr.operand)
             temp = self.new_temp()
@@ -0,0 +1,226 @@
+import re
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tac import TACInstruction, parse_constant
+
+class Opcode(IntEnum):
+    LABEL = 0
+    GOTO = 1
+    IFZ = 2
+    IFNZ = 3
+    COPY = 4
+    PARAM = 5
+    CALL = 6
+    RETURN = 7
+    ADD = 8
+    SUB = 9
+    MUL = 10
+    DIV = 11
+    EQ = 12
+    NE = 13
+    LT = 14
+    LE = 15
+    GT = 16
+    GE = 17
+    AND = 18
+    OR = 19
+    NEG = 20
+    NOT = 21
+    SPILL = 22
+    RELOAD = 23
+
+# Operand kinds. Values are: temp number, index into names, index into consts,
+# index into names, or the integer itself
+NONE, TEMP, VAR, CONST, LABEL, INT = range(6)
+
+BINARY_OPCODES = {
+    '+': Opcode.ADD, '-': Opcode.SUB, '*': Opcode.MUL, '/': Opcode.DIV,
+    '==': Opcode.EQ, '!=': Opcode.NE, '<': Opcode.LT, '<=': Opcode.LE, '>': Opcode.GT, '>=': Opcode.GE,
+    '&&': Opcode.AND, '||': Opcode.OR,
+}
+UNARY_OPCODES = {'-': Opcode.NEG, '!': Opcode.NOT}
+SPELLINGS = {code: op for op, code in BINARY_OPCODES.items()}
+SPELLINGS.update({code: op for op, code in UNARY_OPCODES.items()})
+SPELLINGS.update({Opcode.LABEL: 'label', Opcode.GOTO: 'goto', Opcode.IFZ: 'ifz', Opcode.IFNZ: 'ifnz',
+                  Opcode.COPY: '=', Opcode.PARAM: 'param', Opcode.CALL: 'call', Opcode.RETURN: 'return',
+                  Opcode.SPILL: 'spill', Opcode.RELOAD: 'reload'})
+NAMED_OPCODES = {'label': Opcode.LABEL, 'goto': Opcode.GOTO, 'ifz': Opcode.IFZ, 'ifnz': Opcode.IFNZ,
+                 '=': Opcode.COPY, 'param': Opcode.PARAM, 'call': Opcode.CALL, 'return': Opcode.RETURN,
+                 'spill': Opcode.SPILL, 'reload': Opcode.RELOAD}
+
+TEMP_RE = re.compile(r't([1-9]\d*)')
+
+class TACBuffer:
+    """Column-oriented TAC: one opcode array plus a (kind, value) array pair per operand.
+
+    Names and constants are interned into pools, so passes and executors
+    compare and hash small ints instead of strings. Conversion to and from
+    TACInstruction lists and the printed TAC format is lossless: pools keep
+    the original spellings, and every constant also has its parsed value in
+    ``const_values``.
+    """
+    def __init__(self):
+        self.ops = array('B')
+        self.arg1_kinds = array('B')
+        self.arg1_values = array('i')
+        self.arg2_kinds = array('B')
+        self.arg2_values = array('i')
+        self.result_kinds = array('B')
+        self.result_values = array('i')
+        self.names: List[str] = []
+        self.name_index: Dict[str, int] = {}
+        self.consts: List[str] = []
+        self.const_values: list = []
+        self.const_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def intern_name(self, name: str) -> int:
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def intern_const(self, spelling: str) -> int:
+        index = self.const_index.get(spelling)
+        if index is None:
+            index = self.const_index[spelling] = len(self.consts)
+            self.consts.append(spelling)
+            self.const_values.append(parse_constant(spelling))
+        return index
+
+    def operand(self, value) -> Tuple[int, int]:
+        # Encode a TACInstruction operand that holds a temp, variable or constant
+        if value is None:
+            return NONE, 0
+        if isinstance(value, int):
+            return INT, value
+        mo = TEMP_RE.fullmatch(value)
+        if mo:
+            return TEMP, int(mo.group(1))
+        if parse_constant(value) is not None:
+            return CONST, self.intern_const(value)
+        return VAR, self.intern_name(value)
+
+    def label(self, name: Optional[str]) -> Tuple[int, int]:
+        if name is None:
+            return NONE, 0
+        return LABEL, self.intern_name(name)
+
+    def append(self, op: Opcode, arg1: Tuple[int, int] = (NONE, 0), arg2: Tuple[int, int] = (NONE, 0),
+               result: Tuple[int, int] = (NONE, 0)):
+        self.ops.append(op)
+        self.arg1_kinds.append(arg1[0])
+        self.arg1_values.append(arg1[1])
+        self.arg2_kinds.append(arg2[0])
+        self.arg2_values.append(arg2[1])
+        self.result_kinds.append(result[0])
+        self.result_values.append(result[1])
+
+    def add(self, instr: TACInstruction):
+        op = instr.op
+        if op == 'label':
+            self.append(Opcode.LABEL, result=self.label(instr.result))
+        elif op == 'goto':
+            self.append(Opcode.GOTO, self.label(instr.arg1))
+        elif op in ('ifz', 'ifnz'):
+            self.append(NAMED_OPCODES[op], self.operand(instr.arg1), result=self.label(instr.result))
+        elif op == 'call':
+            self.append(Opcode.CALL, self.label(instr.arg1), self.operand(instr.arg2), self.operand(instr.result))
+        elif op in NAMED_OPCODES:
+            self.append(NAMED_OPCODES[op], self.operand(instr.arg1), self.operand(instr.arg2),
+                        self.operand(instr.result))
+        elif instr.arg2 is None and op in UNARY_OPCODES:
+            self.append(UNARY_OPCODES[op], self.operand(instr.arg1), result=self.operand(instr.result))
+        elif op in BINARY_OPCODES:
+            self.append(BINARY_OPCODES[op], self.operand(instr.arg1), self.operand(instr.arg2),
+                        self.operand(instr.result))
+        else:
+            raise ValueError(f"Cannot encode TAC operation {op!r}")
+
+    @classmethod
+    def from_instructions(cls, instructions: Iterable[TACInstruction]) -> 'TACBuffer':
+        buffer = cls()
+        for instr in instructions:
+            buffer.add(instr)
+        return buffer
+
+    def decode(self, kind: int, value: int):
+        if kind == TEMP:
+            return f"t{value}"
+        if kind == VAR or kind == LABEL:
+            return self.names[value]
+        if kind == CONST:
+            return self.consts[value]
+        if kind == INT:
+            return value
+        return None
+
+    def instruction(self, i: int) -> TACInstruction:
+        decode = self.decode
+        return TACInstruction(SPELLINGS[self.ops[i]], decode(self.arg1_kinds[i], self.arg1_values[i]),
+                              decode(self.arg2_kinds[i], self.arg2_values[i]),
+                              decode(self.result_kinds[i], self.result_values[i]))
+
+    def to_instructions(self) -> List[TACInstruction]:
+        return [self.instruction(i) for i in range(len(self.ops))]
+
+    def __iter__(self) -> Iterator[TACInstruction]:
+        for i in range(len(self.ops)):
+            yield self.instruction(i)
+
+    def __str__(self):
+        return '\n'.join(str(instr) for instr in self)
+
+    @classmethod
+    def parse(cls, text: str) -> 'TACBuffer':
+        # Reads the format TACInstruction.__str__ prints, one instruction per line
+        buffer = cls()
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split(' ')
+            if len(parts) == 1 and line.endswith(':'):
+                buffer.append(Opcode.LABEL, result=buffer.label(line[:-1]))
+            elif parts[0] == 'goto' and len(parts) == 2:
+                buffer.append(Opcode.GOTO, buffer.label(parts[1]))
+            elif parts[0] in ('ifz', 'ifnz') and len(parts) == 4 and parts[2] == 'goto':
+                buffer.append(NAMED_OPCODES[parts[0]], buffer.operand(parts[1]), result=buffer.label(parts[3]))
+            elif parts[0] == 'param' and len(parts) == 2:
+                buffer.append(Opcode.PARAM, buffer.operand(parts[1]))
+            elif parts[0] == 'return' and len(parts) <= 2:
+                buffer.append(Opcode.RETURN, buffer.operand(parts[1] if len(parts) == 2 else None))
+            elif len(parts) >= 3 and parts[1] == '=':
+                result = buffer.operand(parts[0])
+                if len(parts) == 3:
+                    buffer.append(Opcode.COPY, buffer.operand(parts[2]), result=result)
+                elif len(parts) == 4 and parts[2] in UNARY_OPCODES:
+                    buffer.append(UNARY_OPCODES[parts[2]], buffer.operand(parts[3]), result=result)
+                elif len(parts) == 4 and parts[2] in ('spill', 'reload'):
+                    buffer.append(NAMED_OPCODES[parts[2]], buffer.operand(parts[3]), result=result)
+                elif len(parts) == 5 and parts[3] == 'call':
+                    buffer.append(Opcode.CALL, buffer.label(parts[2]), (INT, int(parts[4])), result)
+                elif len(parts) == 5 and parts[3] in BINARY_OPCODES:
+                    buffer.append(BINARY_OPCODES[parts[3]], buffer.operand(parts[2]),
+                                  buffer.operand(parts[4]), result)
+                else:
+                    raise ValueError(f"Cannot parse TAC line {line!r}")
+            else:
+                raise ValueError(f"Cannot parse TAC line {line!r}")
+        return buffer
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    ast = Parser(Lexer(code).tokenize()).parse()
+    buffer = TACBuffer.from_instructions(TACGenerator().generate(ast))
+    print(buffer)
+    print(f"\n{len(buffer)} instructions, {len(buffer.names)} names, {len(buffer.consts)} constants")
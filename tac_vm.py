@@ -0,0 +1,254 @@
+from typing import Callable, Dict, List, Optional, Sequence
+
+from cfg import jump_target, split_functions
+from minilang_ast import Program
+from tac import TACInstruction, parse_constant
+
+CALL = -1
+RETURN = -2
+
+class VMError(Exception):
+    pass
+
+def divide(a, b):
+    # Integer division truncates toward zero, like the constant folder
+    if type(a) is int:
+        q = a // b
+        if q < 0 and q * b != a:
+            q += 1
+        return q
+    return a / b
+
+BINARY = {
+    '+': lambda a, b: a + b, '-': lambda a, b: a - b, '*': lambda a, b: a * b, '/': divide,
+    '==': lambda a, b: a == b, '!=': lambda a, b: a != b, '<': lambda a, b: a < b, '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b, '>=': lambda a, b: a >= b,
+    '&&': lambda a, b: a and b, '||': lambda a, b: a or b,
+}
+
+def program_params(program: Program) -> Dict[str, List[str]]:
+    # TAC doesn't record parameter names; the VM takes them from the AST
+    return {func.name: [param.name for param in func.params] for func in program.functions}
+
+class Function:
+    __slots__ = ('name', 'entry', 'template', 'params', 'slots')
+
+    def __init__(self, name: str, entry: int, template: list, params: List[int], slots: Dict[str, int]):
+        self.name = name
+        self.entry = entry
+        self.template = template
+        self.params = params
+        self.slots = slots
+
+class TACVM:
+    """Runs TAC with every label resolved to an index and every name to a frame slot.
+
+    Each instruction is compiled once into a closure over its slot numbers
+    that updates the frame (a list) and returns the next program counter.
+    Constants live in the frame too: each function's template frame holds
+    them, and a call copies the template. Calls and returns don't recurse in
+    Python; the run loop keeps an explicit stack of (frame, result slot,
+    return address), so deep MiniLang++ recursion is only bounded by
+    ``max_depth``.
+    """
+    def __init__(self, instructions: Sequence[TACInstruction], params: Dict[str, List[str]],
+                 max_depth: int = 100000):
+        self.max_depth = max_depth
+        self.functions: Dict[str, Function] = {}
+        self.code: List[Callable] = []
+        self.args: list = []
+        self.pending = None
+        self.result = None
+        for body in split_functions(list(instructions)):
+            self.compile_function(body, params)
+
+    def compile_function(self, body: List[TACInstruction], params: Dict[str, List[str]]):
+        name = body[0].result
+        slots: Dict[str, int] = {}
+        template: list = []
+
+        def slot(operand) -> int:
+            index = slots.get(operand)
+            if index is None:
+                index = slots[operand] = len(template)
+                template.append(parse_constant(operand))
+            return index
+
+        param_slots = [slot(param) for param in params.get(name, [])]
+        # Labels resolve to the index of the next real instruction
+        labels: Dict[str, int] = {}
+        position = len(self.code)
+        for instr in body:
+            if instr.op == 'label':
+                labels[instr.result] = position
+            else:
+                position += 1
+        end = position
+        for instr in body:
+            if instr.op != 'label':
+                self.code.append(self.compile_instruction(instr, slot, labels, len(self.code) + 1))
+        # Falling off the end returns nothing
+        self.code.append(self.compile_instruction(TACInstruction('return'), slot, labels, end + 1))
+        self.functions[name] = Function(name, labels[name], template, param_slots, slots)
+
+    def compile_instruction(self, instr: TACInstruction, slot, labels: Dict[str, int], nxt: int) -> Callable:
+        op = instr.op
+        vm = self
+        if op == 'goto':
+            target = labels[jump_target(instr)]
+            return lambda f: target
+        if op in ('ifz', 'ifnz'):
+            target = labels[jump_target(instr)]
+            c = slot(instr.arg1)
+            if op == 'ifz':
+                return lambda f: nxt if f[c] else target
+            return lambda f: target if f[c] else nxt
+        if op in ('=', 'spill', 'reload'):
+            a, r = slot(instr.arg1), slot(instr.result)
+            def copy(f):
+                f[r] = f[a]
+                return nxt
+            return copy
+        if op == 'param':
+            a = slot(instr.arg1)
+            push = self.args.append
+            def param(f):
+                push(f[a])
+                return nxt
+            return param
+        if op == 'call':
+            pending = (instr.arg1, instr.arg2, slot(instr.result), nxt)
+            def call(f):
+                vm.pending = pending
+                return CALL
+            return call
+        if op == 'return':
+            if instr.arg1 is None:
+                def ret(f):
+                    vm.result = None
+                    return RETURN
+                return ret
+            a = slot(instr.arg1)
+            def ret_value(f):
+                vm.result = f[a]
+                return RETURN
+            return ret_value
+        if instr.arg2 is None and op in ('-', '!'):
+            a, r = slot(instr.arg1), slot(instr.result)
+            if op == '-':
+                def neg(f):
+                    f[r] = -f[a]
+                    return nxt
+                return neg
+            def not_(f):
+                f[r] = not f[a]
+                return nxt
+            return not_
+        if op not in BINARY:
+            raise VMError(f"Cannot execute TAC operation {op!r}")
+        a, b, r = slot(instr.arg1), slot(instr.arg2), slot(instr.result)
+        # The common operators get their own closure, saving a call per instruction
+        if op == '+':
+            def add(f):
+                f[r] = f[a] + f[b]
+                return nxt
+            return add
+        if op == '-':
+            def sub(f):
+                f[r] = f[a] - f[b]
+                return nxt
+            return sub
+        if op == '*':
+            def mul(f):
+                f[r] = f[a] * f[b]
+                return nxt
+            return mul
+        if op == '<':
+            def lt(f):
+                f[r] = f[a] < f[b]
+                return nxt
+            return lt
+        if op == '>':
+            def gt(f):
+                f[r] = f[a] > f[b]
+                return nxt
+            return gt
+        fn = BINARY[op]
+        def binary(f):
+            f[r] = fn(f[a], f[b])
+            return nxt
+        return binary
+
+    def run(self, name: str = 'main', args: Sequence = ()):
+        """Call function ``name`` with ``args`` and return its result."""
+        code = self.code
+        functions = self.functions
+        function = functions.get(name)
+        if function is None:
+            raise VMError(f"Undefined function: {name}")
+        frame = self.enter(function, list(args))
+        pc = function.entry
+        stack = []
+        pushed = self.args
+        pushed.clear()
+        try:
+            while True:
+                while pc >= 0:
+                    pc = code[pc](frame)
+                if pc == CALL:
+                    callee, count, result_slot, return_pc = self.pending
+                    function = functions.get(callee)
+                    if function is None:
+                        raise VMError(f"Undefined function: {callee}")
+                    if len(stack) >= self.max_depth:
+                        raise VMError(f"Call depth exceeds {self.max_depth}")
+                    args = pushed[len(pushed) - count:] if count else []
+                    del pushed[len(pushed) - count:]
+                    stack.append((frame, result_slot, return_pc))
+                    frame = self.enter(function, args)
+                    pc = function.entry
+                else:
+                    if not stack:
+                        return self.result
+                    frame, result_slot, pc = stack.pop()
+                    frame[result_slot] = self.result
+        except ZeroDivisionError:
+            raise VMError("Division by zero") from None
+        except TypeError as e:
+            raise VMError(f"Invalid operands: {e}") from None
+
+    def enter(self, function: Function, args: list) -> list:
+        if len(args) != len(function.params):
+            raise VMError(f"Function {function.name} expects {len(function.params)} args, got {len(args)}")
+        frame = function.template.copy()
+        for index, value in zip(function.params, args):
+            frame[index] = value
+        return frame
+
+    def count_steps(self, name: str = 'main', args: Sequence = (), limit: Optional[int] = None) -> int:
+        # Instructions executed by run(name, args); raises VMError past limit
+        counter = [0]
+        code = self.code
+        def counted(fn):
+            def step(f):
+                counter[0] += 1
+                if limit is not None and counter[0] > limit:
+                    raise VMError(f"Step limit of {limit} exceeded")
+                return fn(f)
+            return step
+        self.code = [counted(fn) for fn in code]
+        try:
+            self.run(name, args)
+        finally:
+            self.code = code
+        return counter[0]
+
+if __name__ == "__main__":
+    from lexer import Lexer
+    from parser import Parser
+    from tac import TACGenerator
+    with open("sample_input.minipp") as f:
+        code = f.read()
+    ast = Parser(Lexer(code).tokenize()).parse()
+    vm = TACVM(TACGenerator().generate(ast), program_params(ast))
+    print(f"main() returned {vm.run('main')!r} after {vm.count_steps('main')} instructions")
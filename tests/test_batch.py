@@ -0,0 +1,52 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from batch import collect_sources, output_paths, parse_args, run_batch
+
+GOOD = 'int main() { int x = 1; return x; }'
+BAD = 'int main() { return y; }'
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, 'src')
+        os.makedirs(os.path.join(self.src, 'sub'))
+        self.files = {'a.minipp': GOOD, 'sub/a.minipp': GOOD, 'sub/b.minipp': BAD, 'notes.txt': ''}
+        for name, code in self.files.items():
+            with open(os.path.join(self.src, name), 'w') as f:
+                f.write(code)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_collect_sources(self):
+        from_dir = collect_sources([self.src])
+        self.assertEqual([os.path.relpath(p, self.src) for p in from_dir],
+                         ['a.minipp', os.path.join('sub', 'a.minipp'), os.path.join('sub', 'b.minipp')])
+        from_glob = collect_sources([os.path.join(self.src, 'sub', '*.minipp'), from_dir[1]])
+        self.assertEqual(len(from_glob), 2)
+
+    def test_batch_writes_tac_per_file(self):
+        sources = collect_sources([self.src])
+        out_dir = os.path.join(self.tmp.name, 'out')
+        outputs = output_paths(sources, out_dir)
+        self.assertEqual(len(set(outputs)), 3)
+        reports = {r.path: r for r in run_batch(sources, out_dir, jobs=2)}
+        self.assertEqual(set(reports), set(sources))
+        self.assertTrue(reports[sources[0]].ok)
+        self.assertFalse(reports[sources[2]].ok)
+        for output in outputs:
+            self.assertTrue(os.path.exists(output))
+        with open(outputs[0]) as f:
+            self.assertEqual(f.read().splitlines()[0], 'main:')
+
+    def test_jobs_must_be_positive(self):
+        self.assertEqual(parse_args(['-j', '1', 'a.minipp']).jobs, 1)
+        for jobs in ('0', '-2'):
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                parse_args(['-j', jobs, 'a.minipp'])
+
+if __name__ == '__main__':
+    unittest.main()
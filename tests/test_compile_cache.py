@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from compile_cache import CompilationCache
+from pipeline import compile_source
+
+SOURCE = 'int add(int a, int b) { return a + b; } int main() { int x = add(1, 2); return x; }'
+
+class TestCompilationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CompilationCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_skips_front_end(self):
+        first = compile_source(SOURCE, cache=self.cache)
+        second = compile_source(SOURCE, cache=self.cache)
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual([str(i) for i in second.tac], [str(i) for i in first.tac])
+        self.assertEqual(second.symbols, first.symbols)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_source_and_options(self):
+        key = self.cache.key(SOURCE, {'scanner': 'regex'})
+        self.assertNotEqual(key, self.cache.key(SOURCE + ' ', {'scanner': 'regex'}))
+        self.assertNotEqual(key, self.cache.key(SOURCE, {'scanner': 'dfa'}))
+        self.assertEqual(key, self.cache.key(SOURCE, {'scanner': 'regex'}))
+
+    def test_diagnostics_are_cached(self):
+        compile_source('int main() { x = 1; }', cache=self.cache)
+        result = compile_source('int main() { x = 1; }', cache=self.cache)
+        self.assertTrue(result.cached)
+        self.assertEqual(result.semantic_errors, ['Undeclared variable: x'])
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = self.cache.key(SOURCE)
+        with open(self.cache.path(key), 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIsNone(self.cache.get(key))
+
+    def test_lru_eviction(self):
+        result = compile_source(SOURCE)
+        for n in range(4):
+            self.cache.put(f'k{n}', result)
+            os.utime(self.cache.path(f'k{n}'), (n, n))
+        self.cache.get('k0')
+        entry_size = os.path.getsize(self.cache.path('k0'))
+        self.cache.max_bytes = entry_size * 2
+        self.assertEqual(self.cache.evict(), 2)
+        self.assertTrue(os.path.exists(self.cache.path('k0')))
+        self.assertTrue(os.path.exists(self.cache.path('k3')))
+        self.assertFalse(os.path.exists(self.cache.path('k1')))
+
+if __name__ == '__main__':
+    unittest.main()
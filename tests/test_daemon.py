@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from daemon import CANCELLED, INVALID_PARAMS, METHOD_NOT_FOUND, TIMED_OUT, CompileServer
+from pipeline import compile_source
+
+CODE = 'int max(int a, int b) { if (a > b) { return a; } return b; } int main() { return max(1, 2); }'
+# Long enough to still be compiling when a cancel or timeout arrives
+SLOW = ''.join(f'int f{k}(int a) {{ int b = a * 2; while (b > 0) {{ b = b - 1; }} return b; }}\n'
+               for k in range(600))
+
+def request(msg_id, method, **params):
+    return {'jsonrpc': '2.0', 'id': msg_id, 'method': method, 'params': params}
+
+class TestDaemon(unittest.TestCase):
+    def test_compile_and_reuse(self):
+        async def run():
+            server = CompileServer(2, 'thread')
+            server.start()
+            try:
+                params = {'source': CODE, 'options': {'optimize': True}, 'emit': ['tac', 'symbols']}
+                replies = await asyncio.gather(*(server.dispatch(request(k, 'compile', **params), {})
+                                                 for k in range(3)))
+                again = await server.dispatch(request(3, 'compile', **params), {})
+                return replies + [again], server.stats()
+            finally:
+                server.close()
+        replies, stats = asyncio.run(run())
+        expected = compile_source(CODE, optimize=True)
+        for k, reply in enumerate(replies):
+            self.assertEqual(reply['id'], k)
+            self.assertEqual(reply['result']['tac'], [str(instr) for instr in expected.tac])
+            self.assertEqual(reply['result']['symbols'], expected.symbols)
+        # The first three share one compile, the fourth is answered from memory
+        self.assertEqual((stats['compiles'], stats['cache_hits']), (1, 1))
+
+    def test_bad_requests(self):
+        async def run():
+            server = CompileServer(1, 'thread')
+            server.start()
+            try:
+                return [await server.dispatch(message, {}) for message in (
+                    request(1, 'compile', source=CODE, options={'fast': True}),
+                    request(2, 'compile', source=CODE, emit=['bytecode']),
+                    request(3, 'compile'),
+                    request(4, 'compile', source=CODE, timeout='5'),
+                    request(5, 'compile', source=CODE, timeout=True),
+                    request(6, 'compile', source=CODE, options={'registers': 1}),
+                    request(7, 'link'))]
+            finally:
+                server.close()
+        codes = [reply['error']['code'] for reply in asyncio.run(run())]
+        self.assertEqual(codes, [INVALID_PARAMS] * 6 + [METHOD_NOT_FOUND])
+
+    def test_timeout(self):
+        async def run():
+            server = CompileServer(1, 'thread')
+            server.start()
+            try:
+                return await server.dispatch(request(1, 'compile', source=SLOW, timeout=0.01), {})
+            finally:
+                server.close()
+        self.assertEqual(asyncio.run(run())['error']['code'], TIMED_OUT)
+
+    def test_socket_cancel(self):
+        async def run(path):
+            server = CompileServer(1, 'thread')
+            serving = asyncio.create_task(server.serve_unix(path))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            reader, writer = await asyncio.open_unix_connection(path)
+            for message in (request(1, 'compile', source=SLOW), request(2, 'cancel', id=1),
+                            request(3, 'compile', source=CODE)):
+                writer.write(json.dumps(message).encode() + b'\n')
+            replies = {}
+            while len(replies) < 3:
+                reply = json.loads(await reader.readline())
+                replies[reply['id']] = reply
+            writer.write(json.dumps(request(4, 'shutdown')).encode() + b'\n')
+            await reader.readline()
+            writer.close()
+            await serving
+            server.close()
+            return replies
+        with tempfile.TemporaryDirectory() as tmp:
+            replies = asyncio.run(run(os.path.join(tmp, 'compiler.sock')))
+        self.assertIs(replies[2]['result'], True)
+        self.assertEqual(replies[1]['error']['code'], CANCELLED)
+        self.assertEqual(replies[3]['result']['errors'], [])
+
+    def test_stdio_shutdown(self):
+        # stdin stays open, so the server has to stop without waiting for EOF
+        daemon = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'daemon.py')
+        proc = subprocess.Popen([sys.executable, daemon, '--mode', 'thread', '-j', '1'],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        try:
+            for message in (request(1, 'compile', source=CODE), request(2, 'shutdown')):
+                proc.stdin.write(json.dumps(message).encode() + b'\n')
+            proc.stdin.flush()
+            replies = {reply['id']: reply for reply in (json.loads(proc.stdout.readline()) for _ in range(2))}
+            self.assertEqual(replies[1]['result']['errors'], [])
+            self.assertEqual(proc.wait(timeout=10), 0)
+        finally:
+            proc.kill()
+            proc.stdin.close()
+            proc.stdout.close()
+
+if __name__ == '__main__':
+    unittest.main()
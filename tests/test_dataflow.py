@@ -0,0 +1,57 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+from cfg import build_cfgs
+from dataflow import DataflowAnalysis, Liveness, ReachingDefinitions, Universe
+
+def function_cfg(code):
+    return build_cfgs(TACGenerator().generate(Parser(Lexer(code).tokenize()).parse()))[0]
+
+LOOP = 'int f(int n) { int x = 1; int y = 2; while (n > 0) { x = x + y; n = n - 1; } return x; }'
+
+class TestDataflow(unittest.TestCase):
+    def test_universe(self):
+        universe = Universe()
+        for name in ('a', 'b', 'c', 'a'):
+            universe.add(name)
+        self.assertEqual(len(universe), 3)
+        self.assertEqual(universe.members(universe.mask('a') | universe.mask('c')), ['a', 'c'])
+
+    def test_liveness_around_loop(self):
+        cfg = function_cfg(LOOP)
+        liveness = Liveness(cfg)
+        header = cfg.label_blocks['L1']
+        self.assertEqual(liveness.live_in(cfg.entry), {'n'})
+        self.assertEqual(liveness.live_in(header), {'n', 'x', 'y'})
+        self.assertEqual(liveness.live_in(cfg.label_blocks['L2']), {'x'})
+        after = liveness.live_after(cfg.entry)
+        self.assertEqual(set(liveness.universe.members(after[1])), {'n', 'x'})
+
+    def test_reaching_definitions(self):
+        cfg = function_cfg('int f(int n) { int x = 1; if (n > 0) { x = 2; } else { n = 3; } return x + n; }')
+        reaching = ReachingDefinitions(cfg)
+        join = cfg.blocks[-1]
+        self.assertEqual(sorted(instr.arg1 for instr in reaching.reaching(join, 'x')), ['1', '2'])
+        self.assertEqual([instr.arg1 for instr in reaching.reaching(join, 'n')], ['3'])
+        self.assertEqual(reaching.reaching(cfg.entry, 'x'), [])
+
+    def test_intersection_problem(self):
+        # Names assigned on every path: a must problem over the same solver
+        cfg = function_cfg('int f(int n) { int x = 1; if (n > 0) { x = 2; int y = 1; } return x; }')
+
+        class Assigned(DataflowAnalysis):
+            union = False
+            def __init__(self, cfg):
+                super().__init__(cfg, Universe())
+                for block in cfg.blocks:
+                    for instr in block.instructions:
+                        if instr.op == '=':
+                            self.gen[block.index] |= 1 << self.universe.add(instr.result)
+                self.solve()
+
+        assigned = Assigned(cfg)
+        self.assertEqual(assigned.universe.members(assigned.ins[cfg.blocks[-1].index]), ['x'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from lexer import Lexer
+from dfa_lexer import DFALexer
+
+class TestDFALexer(unittest.TestCase):
+    def assertSameAsRegex(self, code):
+        regex, dfa = Lexer(code), DFALexer(code)
+        self.assertEqual([repr(t) for t in dfa.tokenize()], [repr(t) for t in regex.tokenize()])
+        self.assertEqual(dfa.errors, regex.errors)
+
+    def test_matches_regex_lexer(self):
+        with open('sample_input.minipp') as f:
+            self.assertSameAsRegex(f.read())
+        self.assertSameAsRegex('bool ok = a <= 1.25 && !(b != c) || x >= 3;\n\tintx = if_1 - 12.;')
+
+    def test_keywords_and_identifiers(self):
+        tokens = DFALexer('int integer while whiles return_ true').tokenize()
+        self.assertEqual([t.type for t in tokens], ['INT', 'ID', 'WHILE', 'ID', 'ID', 'TRUE'])
+
+    def test_errors(self):
+        self.assertSameAsRegex('int $x = 5 & 3 | 2;\n é intè 12٣')
+
+    def test_feed(self):
+        code = 'x == 12.5 && y;\nreturn z;'
+        lexer = DFALexer()
+        tokens = []
+        for ch in code:
+            tokens.extend(lexer.feed(ch))
+        tokens.extend(lexer.finish())
+        self.assertEqual([repr(t) for t in tokens], [repr(t) for t in Lexer(code).tokenize()])
+
+if __name__ == '__main__':
+    unittest.main()
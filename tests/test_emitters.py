@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from lexer import Lexer
+from parser import Parser
+from minilang_ast import Literal, UnaryOp
+from emitters import Emitter, format_ast, format_tokens
+from main import main
+
+CODE = '''int max(int a, int b) { if (a > b) { return a; } else { return b; } }
+int main() { int i = 0; while (i < 3) { i = i + max(i, -1); } return i; }
+'''
+
+class TestEmitters(unittest.TestCase):
+    def test_ast_matches_pretty_print(self):
+        ast = Parser(Lexer(CODE).tokenize()).parse()
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            ast.pretty_print()
+        self.assertEqual(list(format_ast(ast)), printed.getvalue().splitlines())
+
+    def test_deep_tree(self):
+        node = Literal(1, 'int')
+        for _ in range(5000):
+            node = UnaryOp('-', node)
+        lines = list(format_ast(node))
+        self.assertEqual(len(lines), 5001)
+        self.assertEqual(lines[-1], ' ' * 10000 + 'Literal 1 (int)')
+
+    def test_tokens_and_single_write(self):
+        tokens = Lexer(CODE).tokenize()
+        expected = [repr(token) for token in tokens]
+        self.assertEqual(list(format_tokens(Lexer(CODE).tokenize_compact())), expected)
+        writes = []
+        stream = io.StringIO()
+        stream.write = lambda text: writes.append(text)
+        out = Emitter(stream)
+        out.tokens(tokens)
+        out.flush()
+        self.assertEqual(writes, ['\n'.join(expected) + '\n'])
+
+    def test_quiet_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'prog.minipp')
+            target = os.path.join(tmp, 'prog.tac')
+            with open(source, 'w') as f:
+                f.write(CODE)
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                self.assertEqual(main([source, '-o', target]), 0)
+            self.assertEqual(stdout.getvalue(), '')
+            with open(target) as f:
+                self.assertEqual(f.readline(), 'max:\n')
+            with open(source, 'w') as f:
+                f.write('int main() { return y; }')
+            stderr = io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                self.assertEqual(main([source, '-q', '--emit', 'symbols']), 1)
+            self.assertIn('Undeclared identifier: y', stderr.getvalue())
+            self.assertEqual(stdout.getvalue(), 'Symbol(name=main, type=int, kind=function, info=[])\n')
+
+if __name__ == '__main__':
+    unittest.main()
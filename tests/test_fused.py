@@ -0,0 +1,43 @@
+import unittest
+from fused import FusedCompiler
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from tac import TACGenerator
+
+SOURCE = '''int add(int a, int b) { return a + b; }
+int main() {
+    int x = add(1, true);
+    y = z + 1;
+    foo(w, x);
+    x = add(x, 2, q);
+    while (x) { float x = -1.5; x = !x; }
+    if (x > 2 && x < 9) { return add(x, x) * 2; } else { return 1.0; }
+}
+int add(int c) { return c; }
+'''
+
+class TestFusedCompiler(unittest.TestCase):
+    def compile_both(self, per_function):
+        ast = Parser(Lexer(SOURCE).tokenize()).parse()
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(ast)
+        tac = TACGenerator(per_function).generate(ast)
+        errors, fused_tac = FusedCompiler(per_function).compile(Parser(Lexer(SOURCE).tokenize()).parse())
+        return (analyzer.errors, [str(i) for i in tac]), (errors, [str(i) for i in fused_tac])
+
+    def test_matches_separate_passes(self):
+        for per_function in (False, True):
+            separate, fused = self.compile_both(per_function)
+            self.assertEqual(fused, separate)
+
+    def test_skipped_subtrees_report_nothing(self):
+        _, (errors, _) = self.compile_both(False)
+        self.assertIn('Undeclared variable: y', errors)
+        self.assertIn('Undeclared function: foo', errors)
+        self.assertNotIn('Undeclared identifier: z', errors)
+        self.assertNotIn('Undeclared identifier: w', errors)
+        self.assertNotIn('Undeclared identifier: q', errors)
+
+if __name__ == '__main__':
+    unittest.main()
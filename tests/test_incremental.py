@@ -0,0 +1,60 @@
+import unittest
+from incremental import CompilationSession
+from pipeline import compile_source
+
+SOURCE = '''int max(int a, int b) {
+    if (a > b) { return a; } else { return b; }
+}
+int twice(int a) { return a * 2; }
+int main() {
+    int x = 10;
+    int z = max(x, twice(x));
+    return z;
+}
+'''
+
+class TestCompilationSession(unittest.TestCase):
+    def assertMatchesFresh(self, session):
+        fresh = CompilationSession(session.source)
+        self.assertEqual(session.errors, fresh.errors)
+        self.assertEqual([str(i) for i in session.tac], [str(i) for i in fresh.tac])
+        result = compile_source(session.source)
+        self.assertEqual(session.lexical_errors, result.lexical_errors)
+        self.assertEqual(session.syntax_errors, result.syntax_errors)
+        self.assertEqual(session.semantic_errors, result.semantic_errors)
+
+    def test_body_edit_reparses_one_function(self):
+        session = CompilationSession(SOURCE)
+        start = SOURCE.index('a * 2')
+        reparsed, rechecked = session.apply_edit(start, start + 5, 'a + a')
+        self.assertEqual((reparsed, rechecked), (1, 1))
+        self.assertIn('a + a', session.source)
+        self.assertMatchesFresh(session)
+
+    def test_signature_change_rechecks_callers(self):
+        session = CompilationSession(SOURCE)
+        start = SOURCE.index('int twice(int a)')
+        session.apply_edit(start, start + len('int twice(int a)'), 'int twice(int a, int b)')
+        self.assertTrue(any('twice' in e for e in session.semantic_errors))
+        self.assertMatchesFresh(session)
+
+    def test_syntax_error_and_repair(self):
+        session = CompilationSession(SOURCE)
+        start = SOURCE.index('return a * 2;')
+        session.apply_edit(start + len('return a * 2'), start + len('return a * 2;'), '')
+        self.assertTrue(session.syntax_errors)
+        self.assertMatchesFresh(session)
+        session.apply_edit(start + len('return a * 2'), start + len('return a * 2'), ';\n\n')
+        self.assertEqual(session.errors, [])
+        self.assertMatchesFresh(session)
+
+    def test_deleting_function_reports_undeclared_call(self):
+        session = CompilationSession(SOURCE)
+        start = SOURCE.index('int twice')
+        end = SOURCE.index('int main')
+        session.apply_edit(start, end, '')
+        self.assertTrue(session.semantic_errors)
+        self.assertMatchesFresh(session)
+
+if __name__ == '__main__':
+    unittest.main()
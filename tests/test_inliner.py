@@ -0,0 +1,83 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+from callgraph import CallGraph
+from inliner import Inliner
+from tac_vm import TACVM, program_params
+from pipeline import compile_source
+
+def parse(code):
+    return Parser(Lexer(code).tokenize()).parse()
+
+PROGRAM = '''int max(int a, int b) { if (a > b) { return a; } return b; }
+int clamp(int x) { return max(0, x) - max(x - 10, 0); }
+int fact(int n) { if (n < 2) { return 1; } return n * fact(n - 1); }
+int even(int n) { if (n == 0) { return 1; } return odd(n - 1); }
+int odd(int n) { if (n == 0) { return 0; } return even(n - 1); }
+int main() { int i = 0; int total = 0;
+  while (i < 20) { total = total + clamp(i) + fact(3) + even(i); i = i + 1; }
+  return total; }
+'''
+
+class TestInliner(unittest.TestCase):
+    def test_call_graph(self):
+        graph = CallGraph(parse(PROGRAM))
+        self.assertEqual(graph.callees['clamp'], ['max'])
+        self.assertEqual(graph.call_counts['max'], 2)
+        self.assertTrue(graph.is_recursive('fact'))
+        self.assertTrue(graph.is_recursive('even'))
+        self.assertFalse(graph.is_recursive('clamp'))
+        order = graph.bottom_up()
+        self.assertLess(order.index('max'), order.index('clamp'))
+        self.assertLess(order.index('clamp'), order.index('main'))
+        self.assertEqual(graph.components[graph.component_of['even']], ['odd', 'even'])
+
+    def test_inlines_small_non_recursive_calls(self):
+        ast = parse(PROGRAM)
+        tac = TACGenerator().generate(ast)
+        inliner = Inliner()
+        inlined = inliner.run(tac, ast)
+        calls = [instr.arg1 for instr in inlined if instr.op == 'call']
+        self.assertNotIn('max', calls)
+        self.assertNotIn('clamp', calls)
+        self.assertIn('fact', calls)
+        self.assertIn('even', calls)
+        self.assertEqual(inliner.inlined, 3)
+        self.assertEqual(inliner.recursive, 4)
+        self.assertIn('3 of 7 call site(s) inlined', inliner.report())
+        params = program_params(ast)
+        self.assertEqual(TACVM(inlined, params).run('main'), TACVM(tac, params).run('main'))
+
+    def test_renames_callee_names(self):
+        ast = parse('int sq(int x) { int y = x * x; return y; } int main() { int x = 3; return sq(x + 1) + sq(x); }')
+        inlined = Inliner().run(TACGenerator().generate(ast), ast)
+        main = [str(instr) for instr in inlined[inlined.index(next(i for i in inlined if i.result == 'main')):]]
+        self.assertEqual(main[3:7], ['x.1 = t2', 't6 = x.1 * x.1', 'y.1 = t6', 't3 = y.1'])
+        self.assertIn('x.2 = x', main)
+        self.assertEqual(TACVM(inlined, program_params(ast)).run('main'), 25)
+
+    def test_thresholds(self):
+        ast = parse(PROGRAM)
+        tac = TACGenerator().generate(ast)
+        inliner = Inliner(max_callee_size=3)
+        self.assertEqual(inliner.run(tac, ast), tac)
+        self.assertEqual(inliner.inlined, 0)
+        self.assertEqual(inliner.too_large, 3)
+        inliner = Inliner(max_caller_size=0)
+        self.assertEqual(inliner.run(tac, ast), tac)
+        self.assertEqual(inliner.inlined, 0)
+
+    def test_unreachable_loop_label(self):
+        # The loop's back edge is unreachable, so its label must not be copied: it would start a new function
+        code = 'int g(int x) { while (x > 0) { return 1; } return 2; } int main() { int r = g(5); return r + 10; }'
+        ast = parse(code)
+        inlined = Inliner(max_callee_size=50).run(TACGenerator().generate(ast), ast)
+        self.assertEqual(inlined[-1].op, 'return')
+        self.assertEqual(TACVM(inlined, program_params(ast)).run('main'), 11)
+        for optimize in (False, True):
+            result = compile_source(code, optimize=optimize, inline_size=50)
+            self.assertEqual(TACVM(result.tac, program_params(result.ast)).run('main'), 11)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+import unittest
+from instrumentation import Metrics
+from pipeline import compile_source
+
+PROGRAM = '''int max(int a, int b) { if (a > b) { return a; } return b; }
+int main() { int x = max(1, 2); { int y = x * 2; } return x; }
+'''
+
+class TestInstrumentation(unittest.TestCase):
+    def test_spans_and_observers(self):
+        metrics = Metrics()
+        events = []
+        metrics.observe(lambda event, name, value: events.append((event, name)))
+        with metrics.span('outer'):
+            with metrics.span('inner'):
+                metrics.count('things', 2)
+            metrics.count('things')
+        self.assertEqual([(span.name, span.depth) for span in metrics.spans], [('outer', 0), ('inner', 1)])
+        self.assertGreaterEqual(metrics.spans[0].duration_ns, metrics.spans[1].duration_ns)
+        self.assertEqual(metrics.counters, {'things': 3})
+        self.assertEqual(events, [('start', 'outer'), ('start', 'inner'), ('count', 'things'),
+                                  ('end', 'inner'), ('count', 'things'), ('end', 'outer')])
+
+    def test_compile_counters(self):
+        metrics = Metrics()
+        result = compile_source(PROGRAM, optimize=True, metrics=metrics)
+        self.assertEqual([span.name for span in metrics.spans], ['lex', 'parse', 'semantic', 'tac', 'optimize'])
+        counters = metrics.counters
+        self.assertEqual(counters['tokens'], result.token_count)
+        self.assertEqual(counters['ast.FunctionDef'], 2)
+        # global, max, main, and the blocks of both bodies, the if and the nested block
+        self.assertEqual(counters['scopes'], 7)
+        # max, main, a, b, x, y
+        self.assertEqual(counters['symbols'], 6)
+        self.assertEqual(counters['tac.labels'], 3)
+        self.assertEqual(counters['optimized.instructions'], len(result.tac))
+        self.assertEqual(counters['errors.semantic'], 0)
+
+    def test_per_function_spans(self):
+        metrics = Metrics(per_function=True)
+        result = compile_source(PROGRAM, metrics=metrics)
+        names = [(span.name, span.depth) for span in metrics.spans]
+        self.assertIn(('semantic:max', 1), names)
+        self.assertIn(('tac:main', 1), names)
+        self.assertEqual([str(i) for i in result.tac], [str(i) for i in compile_source(PROGRAM).tac])
+        self.assertEqual(result.symbols, compile_source(PROGRAM).symbols)
+
+    def test_export(self):
+        metrics = Metrics()
+        compile_source(PROGRAM, metrics=metrics)
+        data = json.loads(metrics.to_json())
+        self.assertEqual(len(data['spans']), 4)
+        self.assertEqual(data['counters'], metrics.counters)
+        rows = list(csv.DictReader(io.StringIO(metrics.to_csv())))
+        self.assertEqual(sum(row['kind'] == 'span' for row in rows), 4)
+        self.assertEqual({row['name']: int(row['value']) for row in rows if row['kind'] == 'counter'},
+                         metrics.counters)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
+import io
 import unittest
-from lexer import Lexer
+from lexer import Lexer, TokenStream, TOKEN_NAMES
 
 class TestLexer(unittest.TestCase):
     def test_keywords_and_identifiers(self):
@@ -33,6 +34,53 @@ class TestLexer(unittest.TestCase):
         lexer = Lexer(code)
         lexer.tokenize()
         self.assertTrue(any('Invalid token' in err for err in lexer.errors))
+    def test_feed_matches_tokenize(self):
+        code = 'int f(float a) {\n  bool b = a <= 12.75 && a != 3.5;\n  x = 10 == y;\n}\n'
+        expected = [repr(t) for t in Lexer(code).tokenize()]
+        for size in (1, 2, 3, 7):
+            lexer = Lexer()
+            tokens = []
+            for i in range(0, len(code), size):
+                tokens.extend(lexer.feed(code[i:i + size]))
+            tokens.extend(lexer.finish())
+            self.assertEqual([repr(t) for t in tokens], expected)
+
+    def test_feed_split_operators_and_errors(self):
+        lexer = Lexer()
+        tokens = list(lexer.feed('a =')) + list(lexer.feed('= 1')) + list(lexer.feed('2.')) + list(lexer.feed('5 $'))
+        tokens += list(lexer.finish())
+        self.assertEqual([(t.type, t.value) for t in tokens],
+                         [('ID', 'a'), ('EQ', '=='), ('FLOAT_LIT', '12.5')])
+        self.assertEqual(lexer.errors, ["Invalid token '$' at line 1, column 11"])
+
+    def test_feed_read_partly(self):
+        # Each feed is complete on return; reading one chunk's tokens late can't disturb the next
+        lexer = Lexer()
+        first = iter(lexer.feed('int a = 1; int c = 3;'))
+        next(first)
+        tokens = ['int'] + [t.value for t in lexer.feed(' int b = 2;')]
+        tokens = tokens[:1] + [t.value for t in first] + tokens[1:] + [t.value for t in lexer.finish()]
+        self.assertEqual(tokens, [t.value for t in Lexer('int a = 1; int c = 3; int b = 2;').tokenize()])
+
+    def test_tokenize_stream(self):
+        code = 'int main() {\n  return 0;\n}'
+        tokens = list(Lexer().tokenize_stream(io.StringIO(code), chunk_size=4))
+        self.assertEqual([repr(t) for t in tokens], [repr(t) for t in Lexer(code).tokenize()])
+        self.assertEqual((tokens[-1].line, tokens[-1].column), (3, 1))
+    def test_tokenize_compact(self):
+        code = 'int main() {\n  float y = 2.5; y = y + total;\n}'
+        tokens = Lexer(code).tokenize()
+        stream = Lexer(code).tokenize_compact()
+        self.assertEqual(len(stream), len(tokens))
+        self.assertEqual([TOKEN_NAMES[k] for k in stream.kinds], [t.type for t in tokens])
+        self.assertEqual([repr(t) for t in stream], [repr(t) for t in tokens])
+        self.assertEqual(stream.text(8), '2.5')
+        self.assertIs(stream.identifier(6), stream.identifier(10))
+
+    def test_stream_from_tokens(self):
+        tokens = Lexer('x = y + 1;').tokenize()
+        stream = TokenStream.from_tokens(tokens)
+        self.assertEqual([repr(t) for t in stream], [repr(t) for t in tokens])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,85 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+from cfg import build_cfgs
+from loops import DominatorTree, LoopOptimizer, find_loops
+from tac_vm import TACVM, program_params
+
+def parse(code):
+    return Parser(Lexer(code).tokenize()).parse()
+
+NESTED = '''int f(int n, int a, int b) {
+  int i = 0; int total = 0;
+  while (i < n) {
+    int j = 0;
+    while (j < n) { total = total + a * b + j * 3; j = j + 1; }
+    i = i + 1;
+  }
+  return total;
+}'''
+
+class TestLoops(unittest.TestCase):
+    def test_natural_loops(self):
+        cfg = build_cfgs(TACGenerator().generate(parse(NESTED)))[0]
+        tree = DominatorTree(cfg, cfg.dominators())
+        inner, outer = find_loops(cfg, tree)
+        self.assertLess(inner.blocks, outer.blocks)
+        self.assertEqual(inner.header.label, 'L3')
+        self.assertEqual(outer.header.label, 'L1')
+        self.assertTrue(tree.dominates(outer.header, inner.header))
+        self.assertFalse(tree.dominates(inner.header, outer.header))
+
+    def test_hoists_invariants_out_of_nested_loops(self):
+        ast = parse(NESTED)
+        tac = TACGenerator().generate(ast)
+        optimizer = LoopOptimizer(strength_reduction=False)
+        lines = [str(instr) for instr in optimizer.run(tac)]
+        # a * b leaves both loops: it lands before the outer header
+        self.assertLess(lines.index('t3 = a * b'), lines.index('L1:'))
+        self.assertGreater(lines.index('t5 = j * 3'), lines.index('L3:'))
+        self.assertEqual(optimizer.loops, 2)
+        vm, original = TACVM(optimizer.run(tac), program_params(ast)), TACVM(tac, program_params(ast))
+        for args in ([0, 2, 3], [5, 2, 3], [4, -1, 7]):
+            self.assertEqual(vm.run('f', args), original.run('f', args))
+
+    def test_keeps_unsafe_code_in_the_loop(self):
+        ast = parse('''int f(int n, int d) {
+          int i = 0; int x = 0; int q = 0;
+          while (i < n) { if (i == 3) { x = d * 2; } q = q + n / d; i = i + 1; }
+          return x + q;
+        }''')
+        tac = TACGenerator().generate(ast)
+        optimizer = LoopOptimizer()
+        lines = [str(instr) for instr in optimizer.run(tac)]
+        # d * 2 can be computed early, but x is read after the loop and only set on
+        # some iterations; n / d may trap
+        self.assertLess(lines.index('t3 = d * 2'), lines.index('L1:'))
+        self.assertGreater(lines.index('x = t3'), lines.index('L1:'))
+        self.assertGreater(lines.index('t4 = n / d'), lines.index('L1:'))
+        self.assertEqual(optimizer.hoisted, 1)
+        self.assertEqual(TACVM(optimizer.run(tac), program_params(ast)).run('f', [0, 0]), 0)
+
+    def test_strength_reduction(self):
+        ast = parse('''int f(int n) {
+          int i = 1; int total = 0;
+          while (i < n) { total = total + i * 4 + 3 * i; i = i + 2; }
+          while (n > 0) { total = total + n * 5; n = n - 1; }
+          return total;
+        }''')
+        tac = TACGenerator().generate(ast)
+        optimizer = LoopOptimizer()
+        out = optimizer.run(tac)
+        lines = [str(instr) for instr in out]
+        self.assertIn('i.sr1 = i * 4', lines)
+        self.assertIn('i.sr1 = i.sr1 + 8', lines)
+        self.assertIn('i.sr2 = i.sr2 + 6', lines)
+        # n is a parameter, so never known to be assigned before the loop
+        self.assertIn('t8 = n * 5', lines)
+        self.assertEqual(optimizer.reduced, 2)
+        for n in (0, 1, 10, 11):
+            self.assertEqual(TACVM(out, program_params(ast)).run('f', [n]),
+                             TACVM(tac, program_params(ast)).run('f', [n]))
+
+if __name__ == '__main__':
+    unittest.main()
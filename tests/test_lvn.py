@@ -0,0 +1,39 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+from lvn import LocalValueNumbering
+
+def optimized(code):
+    lvn = LocalValueNumbering()
+    tac = lvn.run(TACGenerator().generate(Parser(Lexer(code).tokenize()).parse()))
+    return [str(instr) for instr in tac], lvn
+
+class TestLocalValueNumbering(unittest.TestCase):
+    def test_common_subexpressions(self):
+        tac, lvn = optimized('int f(int a, int b) { int x = a * b + 1; int y = a * b + 1; int z = b * a; '
+                             'return x + y + z; }')
+        self.assertEqual(tac, ['f:', 't1 = a * b', 'x = t1 + 1', 't6 = x + x', 't7 = t6 + t1', 'return t7'])
+        self.assertEqual(lvn.eliminated, 3)
+        self.assertEqual((lvn.before, lvn.after), (12, 6))
+
+    def test_redefinition_invalidates(self):
+        tac, _ = optimized('int f(int a, int b) { int x = a + b; a = 2; int y = a + b; return x * y; }')
+        self.assertEqual(tac, ['f:', 'x = a + b', 'y = 2 + b', 't3 = x * y', 'return t3'])
+
+    def test_copies_and_folding(self):
+        tac, lvn = optimized('int f(int a) { int x = 3; int y = x; int z = y * 2; return z + a; }')
+        self.assertEqual(tac, ['f:', 't2 = 6 + a', 'return t2'])
+        self.assertEqual(lvn.folded, 1)
+
+    def test_values_do_not_cross_blocks(self):
+        tac, _ = optimized('int f(int a, int n) { int x = a + 1; while (n > 0) { n = n - 1; x = a + 1; } '
+                           'return x; }')
+        self.assertEqual(tac.count('x = a + 1'), 2)
+
+    def test_division_is_kept(self):
+        tac, _ = optimized('int f(int a, int b) { int x = a / b; int y = a / 2; return 0; }')
+        self.assertEqual(tac, ['f:', 'x = a / b', 'return 0'])
+
+if __name__ == '__main__':
+    unittest.main()
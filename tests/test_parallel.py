@@ -0,0 +1,45 @@
+import unittest
+from lexer import Lexer
+from parallel import ParallelBackend, split_ranges
+from parser import Parser
+from pipeline import compile_source
+from semantic import SemanticAnalyzer
+from tac import TACGenerator
+
+FUNCTION = '''int f{n}(int a) {{
+    int s = 0;
+    while (a > 0) {{ s = s + f{m}(a - 1); a = a - 1; }}
+    if (s > {n}) {{ return s; }} else {{ return undefined{n}; }}
+}}
+'''
+SOURCE = ''.join(FUNCTION.format(n=n, m=(n + 1) % 40) for n in range(40)) + 'int f3() { return 0; }'
+
+class TestParallelBackend(unittest.TestCase):
+    def setUp(self):
+        self.ast = Parser(Lexer(SOURCE).tokenize_compact()).parse()
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(self.ast)
+        self.errors = analyzer.errors
+        self.tac = [str(i) for i in TACGenerator(per_function=True).generate(self.ast)]
+
+    def test_split_ranges_cover_all_functions(self):
+        ranges = split_ranges(41, 3)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 41)
+        self.assertTrue(all(a[1] == b[0] for a, b in zip(ranges, ranges[1:])))
+
+    def test_matches_sequential(self):
+        for mode in ('process', 'thread'):
+            for workers in (1, 3):
+                global_table, errors, tac = ParallelBackend(workers, mode).run(self.ast)
+                self.assertEqual(errors, self.errors)
+                self.assertEqual([str(i) for i in tac], self.tac)
+                self.assertEqual(len(global_table.symbols), 40)
+
+    def test_compile_source_workers(self):
+        result = compile_source(SOURCE, workers=2)
+        self.assertEqual(result.semantic_errors, self.errors)
+        self.assertEqual([str(i) for i in result.tac], self.tac)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,6 +32,57 @@ class TestParser(unittest.TestCase):
         ast = parser.parse()
         vardecl = ast.functions[0].body.statements[0]
         self.assertIsInstance(vardecl.initializer, BinaryOp)
+    def test_token_stream_input(self):
+        code = 'int f(int a) { if (a > 1) { return f(a - 1); } return a; } int g() { x = ; }'
+        from_list = Parser(Lexer(code).tokenize())
+        from_stream = Parser(Lexer(code).tokenize_compact())
+        list_ast = from_list.parse()
+        stream_ast = from_stream.parse()
+        self.assertEqual(from_list.errors, from_stream.errors)
+        call = stream_ast.functions[0].body.statements[0].then_block.statements[0].value
+        self.assertIsInstance(call, FunctionCall)
+        self.assertEqual(call.name, list_ast.functions[0].body.statements[0].then_block.statements[0].value.name)
+
+    def test_expected_token_error(self):
+        parser = Parser(Lexer('int f() { int x = 1 }').tokenize())
+        parser.parse()
+        self.assertEqual(parser.errors, ['Expected SEMI but found RBRACE at line 1'])
+    def test_precedence_and_associativity(self):
+        code = 'int f() { x = -a * b - c / 2 < d || !e && f(g, h + 1); }'
+        ast = Parser(Lexer(code).tokenize()).parse()
+        expr = ast.functions[0].body.statements[0].value
+        self.assertEqual(expr.op, '||')
+        self.assertEqual(expr.left.op, '<')
+        self.assertEqual(expr.left.left.op, '-')
+        self.assertEqual(expr.left.left.left.op, '*')
+        self.assertIsInstance(expr.left.left.left.left, UnaryOp)
+        self.assertEqual(expr.right.op, '&&')
+        self.assertIsInstance(expr.right.right, FunctionCall)
+        self.assertEqual(expr.right.right.args[1].op, '+')
+
+    def test_deeply_nested_expression(self):
+        depth = 5000
+        code = 'int f() { x = ' + '(' * depth + '1' + ')' * depth + ' + ' + '-' * depth + 'y; }'
+        parser = Parser(Lexer(code).tokenize())
+        ast = parser.parse()
+        self.assertEqual(parser.errors, [])
+        self.assertEqual(ast.functions[0].body.statements[0].value.op, '+')
+    def test_nodes_are_slotted(self):
+        code = 'int f(int a) { int x = a + 1; if (!true) { x = f(x); } while (x < 2) { return -x; } }'
+        ast = Parser(Lexer(code).tokenize()).parse()
+        stack = [ast]
+        seen = set()
+        while stack:
+            node = stack.pop()
+            seen.add(type(node).__name__)
+            self.assertFalse(hasattr(node, '__dict__'), type(node).__name__)
+            for name in node.__slots__:
+                value = getattr(node, name)
+                if isinstance(value, ASTNode):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(value)
+        self.assertGreaterEqual(len(seen), 12)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
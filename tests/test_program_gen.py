@@ -0,0 +1,43 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from tac import TACGenerator
+from tac_vm import TACVM, program_params
+from benchmarks.program_gen import ProgramGenerator, generate_program
+
+KNOBS = [
+    {},
+    {'depth': 3, 'statements': 4},
+    {'expression_size': 5, 'call_density': 0.5},
+    {'depth': 0, 'call_density': 0.0},
+]
+
+class TestProgramGenerator(unittest.TestCase):
+    def test_programs_are_well_typed(self):
+        for seed in range(4):
+            for knobs in KNOBS:
+                code = generate_program(8, seed, **knobs)
+                lexer = Lexer(code)
+                parser = Parser(lexer.tokenize())
+                ast = parser.parse()
+                analyzer = SemanticAnalyzer()
+                analyzer.analyze(ast)
+                self.assertEqual(lexer.errors + parser.errors + analyzer.errors, [], (seed, knobs))
+
+    def test_same_seed_same_source(self):
+        for knobs in KNOBS:
+            self.assertEqual(ProgramGenerator(7, 6, **knobs).generate(), ProgramGenerator(7, 6, **knobs).generate())
+        self.assertNotEqual(generate_program(6, 1), generate_program(6, 2))
+
+    def test_programs_terminate(self):
+        for seed in range(4):
+            for knobs in KNOBS:
+                ast = Parser(Lexer(generate_program(6, seed, **knobs)).tokenize()).parse()
+                vm = TACVM(TACGenerator().generate(ast), program_params(ast))
+                # A step limit turns a loop that never ends into a failure instead of a hang
+                self.assertLess(vm.count_steps('main', limit=10 ** 6), 10 ** 6)
+                self.assertIsInstance(vm.run('main'), int, (seed, knobs))
+
+if __name__ == '__main__':
+    unittest.main()
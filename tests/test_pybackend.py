@@ -0,0 +1,85 @@
+import contextlib
+import io
+import unittest
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+from tac import TACGenerator
+from tac_vm import TACVM, program_params
+from pybackend import PythonBackend, python_source
+from pipeline import compile_source
+from main import run_program
+
+PROGRAM = '''int idiv(int a, int b) { return a / b; }
+float scale(float x, int n) { while (n > 0) { x = x * 1.5 / 2.0; n = n - 1; } return x; }
+bool check(int x, bool flag) { return !flag || x > 3 && x != 7; }
+int fib(int n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+int collatz(int n) {
+    int steps = 0;
+    while (n != 1) {
+        if (n - n / 2 * 2 == 0) { n = n / 2; } else { n = 3 * n + 1; }
+        steps = steps + 1;
+    }
+    return steps;
+}
+int noreturn(int a) { a = a + 1; }
+int unset() { int y; return y; }
+int carried(int n) { int s = 0; while (n > 0) { int y; if (n == 2) { y = 5; } s = y; n = n - 1; } return s; }
+'''
+
+CASES = [('idiv', [7, 2]), ('idiv', [-7, 2]), ('idiv', [7, -2]), ('idiv', [-8, -3]),
+         ('scale', [10.0, 3]), ('scale', [-1.25, 0]), ('check', [5, True]), ('check', [7, True]),
+         ('check', [0, False]), ('fib', [12]), ('collatz', [27]), ('noreturn', [1]),
+         ('unset', []), ('carried', [2])]
+
+def parse(code):
+    program = Parser(Lexer(code).tokenize()).parse()
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(program)
+    return program, analyzer.errors
+
+class TestPythonBackend(unittest.TestCase):
+    def test_matches_tac_vm(self):
+        program, errors = parse(PROGRAM)
+        self.assertEqual(errors, [])
+        vm = TACVM(TACGenerator().generate(program), program_params(program))
+        functions = PythonBackend().compile(program)
+        for name, args in CASES:
+            expected = vm.run(name, args)
+            actual = functions[name](*args)
+            self.assertEqual((actual, type(actual)), (expected, type(expected)), f"{name}{tuple(args)}")
+
+    def test_scoping_and_names(self):
+        program, errors = parse('int f(int def) { int x = 1; { int x = 2; def = def + x; } return def + x; }')
+        self.assertEqual(errors, [])
+        self.assertEqual(PythonBackend().compile(program)['f'](10), 13)
+        source = python_source(program)
+        self.assertIn('v1_x = 2', source)
+        self.assertIn('def f_f(v_def):', source)
+        # The shadowing x must not take the name of x_1
+        program, errors = parse('int f() { int x_1 = 5; int x = 1; { int x = 2; return x_1; } }')
+        self.assertEqual(errors, [])
+        self.assertEqual(PythonBackend().compile(program)['f'](), 5)
+
+    def test_resolves_by_symbol(self):
+        # Each branch's x is its own frame slot; then is numbered before else
+        code = 'int f(bool c) { if (c) { int x = 1; return x; } else { int x = 2; x = x + 1; return x; } }'
+        program, errors = parse(code)
+        self.assertEqual(errors, [])
+        functions = PythonBackend().compile(program)
+        self.assertEqual((functions['f'](True), functions['f'](False)), (1, 3))
+        # A tree without annotations is analysed first
+        program = Parser(Lexer(code).tokenize()).parse()
+        self.assertEqual(PythonBackend().compile(program)['f'](False), 3)
+
+    def test_runtime_errors(self):
+        program, _ = parse('int f(int a) { return 1 / a; }')
+        self.assertRaises(ZeroDivisionError, PythonBackend().compile(program)['f'], 0)
+        # main.py --run reports errors from generated code instead of crashing
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            run_program(compile_source('int main() { int y; return y + 1; }'), 'python')
+        self.assertIn('[Run] Runtime error:', out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+from tac_buffer import TACBuffer
+from regalloc import LinearScan
+
+LOOP = '''f:
+t1 = a + 1
+L1:
+t2 = n > 0
+ifz t2 goto L2
+t3 = n - 1
+n = t3
+goto L1
+L2:
+t4 = t1 * 2
+return t4'''
+
+def generate(code):
+    return TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+
+def lines(tac):
+    return [str(instr) for instr in tac]
+
+class TestLinearScan(unittest.TestCase):
+    def test_temps_are_reused(self):
+        tac = generate('int f(int a) { int x = a + 1; int y = a * 2; int z = x - y; return z; }'
+                       'int g(int b) { return b * b + b; }')
+        allocator = LinearScan()
+        out = lines(allocator.run(tac))
+        self.assertEqual(out, ['f:', 't1 = a + 1', 'x = t1', 't1 = a * 2', 'y = t1', 't1 = x - y', 'z = t1',
+                               'return z', 'g:', 't1 = b * b', 't1 = t1 + b', 'return t1'])
+        self.assertEqual((allocator.temps, allocator.used, allocator.spilled), (5, 1, 0))
+
+    def test_interval_spans_loop(self):
+        out = lines(LinearScan().run(TACBuffer.parse(LOOP).to_instructions()))
+        self.assertEqual(out[1], 't1 = a + 1')
+        self.assertNotIn('t1', ' '.join(out[2:8]))
+        self.assertEqual(out[-2:], ['t1 = t1 * 2', 'return t1'])
+
+    def test_spills_under_budget(self):
+        tac = generate('int f(int a, int b) { return (a + b) * (a - b) + (a * b) * (b - a); }')
+        allocator = LinearScan(2)
+        out = lines(allocator.run(tac))
+        self.assertTrue(all(name in ('t1', 't2') for line in out for name in line.split() if name[:1] == 't'))
+        self.assertIn('%s1 = spill t1', out)
+        self.assertIn('t1 = reload %s1', out)
+        self.assertGreater(allocator.spilled, 0)
+        self.assertEqual(lines(TACBuffer.parse('\n'.join(out)).to_instructions()), out)
+        self.assertRaises(ValueError, LinearScan, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -45,5 +45,34 @@ class TestSemanticAnalyzer(unittest.TestCase):
         # Should have at least global and function scopes
         self.assertGreaterEqual(len(analyzer.symbol_stack.stack), 1)
 
+    def test_redeclaration_in_same_scope(self):
+        code = 'int main(int a) { int a = 1; { int b = 2; int b = 3; } }'
+        lexer = Lexer(code)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(ast)
+        self.assertEqual(analyzer.errors, ['Redeclaration of b in scope block'])
+        self.assertEqual(analyzer.symbol_stack.bindings, {})
+
+    def test_identifiers_resolved_to_innermost_symbol(self):
+        code = 'int f(int x) { int y = x; { float x = 1.5; y = 2; } return f(y); }'
+        lexer = Lexer(code)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(ast)
+        self.assertEqual(analyzer.errors, [])
+        body = ast.functions[0].body.statements
+        param = body[0].initializer.symbol
+        self.assertEqual((param.kind, param.type, param.slot), ('parameter', 'int', 0))
+        inner = body[1].statements
+        self.assertEqual(inner[1].target.symbol.slot, 1)
+        call = body[2].value
+        self.assertEqual((call.symbol.kind, call.symbol.slot), ('function', 0))
+        self.assertEqual(call.args[0].symbol.name, 'y')
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,52 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator, fold_binary
+from cfg import build_cfgs
+from ssa import SSAFunction, propagate_constants
+
+def generate(code):
+    return TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+
+def optimized(code):
+    return [str(instr) for instr in propagate_constants(generate(code))]
+
+class TestSSA(unittest.TestCase):
+    def test_cfg_and_dominators(self):
+        tac = generate('int f(int n) { int x = 1; if (n > 0) { x = 2; } return x; }')
+        cfg = build_cfgs(tac)[0]
+        self.assertEqual(len(cfg.blocks), 3)
+        self.assertEqual([succ.index for succ in cfg.entry.succs], [1, 2])
+        idom = cfg.dominators()
+        self.assertIsNone(idom[0])
+        self.assertIs(idom[2], cfg.entry)
+        self.assertEqual(cfg.dominance_frontiers(idom)[1], {2})
+
+    def test_single_assignment(self):
+        tac = generate('int f(int n) { int x = 1; while (n > 0) { x = x + 1; n = n - 1; } return x; }')
+        function = SSAFunction(build_cfgs(tac)[0])
+        defined = [instr.result for block in function.cfg.blocks for instr in block.instructions
+                   if instr.op not in ('label', 'ifz', 'ifnz', 'goto', 'return')]
+        self.assertEqual(len(defined), len(set(defined)))
+        phis = [instr for instr in function.cfg.blocks[1].instructions if instr.op == 'phi']
+        self.assertEqual(sorted(str(phi) for phi in phis), ['n#1 = phi n, n#2', 'x#2 = phi x#1, x#3'])
+
+    def test_constant_branch_and_dead_loop(self):
+        code = 'int main() { int x = 10; int y = x * 2 + 1; while (x > 100) { x = x - 1; } return y; }'
+        self.assertEqual(optimized(code), ['main:', 'return 21'])
+
+    def test_merge_of_different_constants_is_kept(self):
+        code = 'int f(int n) { int x = 1; if (n > 0) { x = 2; } return x; }'
+        self.assertEqual(optimized(code), [str(instr) for instr in generate(code)])
+
+    def test_typed_folding(self):
+        code = '''float g() { float a = 1.5; bool b = !false && true; int z = 1 / 0;
+            if (b) { return a * 2.0; } return a; }'''
+        self.assertEqual(optimized(code), ['g:', 't3 = 1 / 0', 'z = t3', 'return 3.0'])
+        self.assertEqual(fold_binary('/', -7, 2), -3)
+        self.assertIsNone(fold_binary('/', 1.0, 0.0))
+        self.assertIsNone(fold_binary('+', 1, 1.0))
+        self.assertIs(fold_binary('<', 1.5, 2.5), True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,8 @@ import unittest
 from lexer import Lexer
 from parser import Parser
 from tac import TACGenerator, TACInstruction
+from fused import FusedCompiler
+from tac_vm import TACVM, program_params
 
 class TestTACGenerator(unittest.TestCase):
     def test_assignment_and_arithmetic(self):
@@ -47,5 +49,21 @@ class TestTACGenerator(unittest.TestCase):
         tac = tacgen.generate(ast)
         self.assertTrue(any(instr.op == 'call' for instr in tac))
 
+    def test_tail_calls(self):
+        code = ('int gcd(int a, int b) { if (b == 0) { return a; } return gcd(b, a - a / b * b); }'
+                'int count(int n) { if (n < 1) { return 0; } return 1 + count(n - 1); }')
+        ast = Parser(Lexer(code).tokenize()).parse()
+        tac = [str(instr) for instr in TACGenerator(tail_calls=True).generate(ast)]
+        self.assertEqual(tac[:2], ['gcd:', 'L1:'])
+        # a is assigned first, so its new value b goes through a temp
+        self.assertEqual(tac[9:13], ['t6 = b', 'a = t6', 'b = t4', 'goto L1'])
+        self.assertFalse(any('gcd call' in line for line in tac))
+        # Not a tail call: the addition happens after the call returns
+        self.assertIn('t9 = count call 1', tac)
+        self.assertEqual(tac[13], 'count:')
+        self.assertEqual([str(instr) for instr in FusedCompiler(tail_calls=True).compile(ast)[1]], tac)
+        vm = TACVM(TACGenerator(tail_calls=True).generate(ast), program_params(ast), max_depth=10)
+        self.assertEqual(vm.run('gcd', [1071, 462]), 21)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,48 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator, parse_constant
+from tac_buffer import CONST, LABEL, TEMP, VAR, Opcode, TACBuffer
+
+SOURCE = '''int f(int n) { return n; }
+int main() {
+    int x = 10; float y = 2.5; bool b = !true;
+    while (x > 0) { x = x - f(1); }
+    if (b || x == 0) { y = -y; } else { return 1; }
+    return x;
+}
+'''
+
+def generate(code):
+    return TACGenerator().generate(Parser(Lexer(code).tokenize()).parse())
+
+class TestTACBuffer(unittest.TestCase):
+    def test_round_trip(self):
+        tac = generate(SOURCE)
+        buffer = TACBuffer.from_instructions(tac)
+        self.assertEqual(len(buffer), len(tac))
+        as_tuples = lambda instrs: [(i.op, i.arg1, i.arg2, i.result) for i in instrs]
+        self.assertEqual(as_tuples(buffer.to_instructions()), as_tuples(tac))
+        text = '\n'.join(str(i) for i in tac)
+        self.assertEqual(str(buffer), text)
+        self.assertEqual(as_tuples(TACBuffer.parse(text).to_instructions()), as_tuples(tac))
+
+    def test_operand_encoding(self):
+        buffer = TACBuffer.parse('x = t3 + 2.5\nifz t3 goto L1\nL1:\nt4 = - x')
+        self.assertEqual(list(buffer.ops), [Opcode.ADD, Opcode.IFZ, Opcode.LABEL, Opcode.NEG])
+        self.assertEqual((buffer.arg1_kinds[0], buffer.arg1_values[0]), (TEMP, 3))
+        self.assertEqual(buffer.arg2_kinds[0], CONST)
+        self.assertEqual(buffer.const_values[buffer.arg2_values[0]], 2.5)
+        self.assertEqual(buffer.result_kinds[0], VAR)
+        self.assertEqual(buffer.result_kinds[1], LABEL)
+        self.assertEqual(buffer.result_values[1], buffer.result_values[2])
+
+    def test_parse_constant(self):
+        self.assertEqual(parse_constant('42'), 42)
+        self.assertEqual(parse_constant('-3'), -3)
+        self.assertEqual(parse_constant('0.5'), 0.5)
+        self.assertIs(parse_constant('false'), False)
+        self.assertIsNone(parse_constant('t1'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from lexer import Lexer
+from parser import Parser
+from tac import TACGenerator
+from pipeline import optimize_tac
+from tac_vm import TACVM, VMError, program_params
+
+def load(code, optimize=False):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    tac = TACGenerator().generate(ast)
+    return TACVM(optimize_tac(tac) if optimize else tac, program_params(ast))
+
+ARITHMETIC = '''int idiv(int a, int b) { return a / b; }
+float half(float x) { return x / 2.0; }
+bool between(int x, int lo, int hi) { return lo <= x && x <= hi || !(x != x); }
+int sum(int n) { int total = 0; while (n > 0) { total = total + n; n = n - 1; } return total; }
+'''
+
+class TestTACVM(unittest.TestCase):
+    def test_arithmetic(self):
+        for optimize in (False, True):
+            vm = load(ARITHMETIC, optimize)
+            self.assertEqual(vm.run('idiv', [-7, 2]), -3)
+            self.assertEqual(vm.run('idiv', [7, -2]), -3)
+            self.assertEqual(vm.run('half', [5.0]), 2.5)
+            self.assertIs(vm.run('between', [3, 1, 5]), True)
+            self.assertEqual(vm.run('sum', [100]), 5050)
+
+    def test_calls_use_explicit_stack(self):
+        vm = load('int depth(int n) { if (n == 0) { return 0; } return depth(n - 1) + 1; }'
+                  'int fib(int n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }'
+                  'int nothing(int a) { a = 1; } int main() { nothing(2); return fib(15); }')
+        self.assertEqual(vm.run('depth', [20000]), 20000)
+        self.assertEqual(vm.run('main'), 610)
+        self.assertIsNone(vm.run('nothing', [0]))
+
+    def test_errors(self):
+        vm = load('int f(int a) { return 1 / a; } int g() { return g(); }'
+                  'int h() { int i = 0; while (true) { i = i + 1; } return i; }')
+        self.assertRaisesRegex(VMError, 'Division by zero', vm.run, 'f', [0])
+        self.assertRaisesRegex(VMError, 'expects 1 args', vm.run, 'f', [])
+        self.assertRaisesRegex(VMError, 'Undefined function', vm.run, 'missing')
+        vm.max_depth = 500
+        self.assertRaisesRegex(VMError, 'Call depth', vm.run, 'g')
+        self.assertRaisesRegex(VMError, 'Step limit', vm.count_steps, 'h', (), 1000)
+        self.assertEqual(vm.count_steps('f', [1]), 2)
+
+if __name__ == '__main__':
+    unittest.main()